@@ -3,13 +3,44 @@ FastAPI application entry point that configures and starts the backend service.
 
 This module sets up the FastAPI app with CORS middleware and includes all API routes.
 It serves API endpoints only, while the frontend is served by a separate service.
+The application lifespan loads the author and category snapshots and the
+autocomplete index, and runs the background book statistics worker.
+Successful writes pin the client's reads to the primary database for a short
+time (see app.core.db_config.get_read_db).
 """
 
+from contextlib import asynccontextmanager
+
 from app.api.routes import api_router  # Import your API routes
-from fastapi import FastAPI
+from app.core.autocomplete import load_autocomplete
+from app.core.db_config import async_engine, replica_engines, set_read_primary_cookie
+from app.core.snapshots import load_snapshots
+from app.core.stats_worker import stats_worker
+from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Start background services on startup and stop them on shutdown.
+
+    Args:
+        app (FastAPI): The application instance
+    """
+    # Both load with the synchronous session; keep the event loop free
+    await run_in_threadpool(load_snapshots)
+    await run_in_threadpool(load_autocomplete)
+    stats_worker.start()
+    yield
+    stats_worker.stop()
+    await async_engine.dispose()
+    for replica in replica_engines:
+        await replica.dispose()
+
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -32,5 +63,29 @@ app.add_middleware(
     allow_headers=["*"],  # Allow all headers
 )
 
+# Methods that never write to the database
+READ_ONLY_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+@app.middleware("http")
+async def read_your_writes(request: Request, call_next):
+    """
+    Pin the client's reads to the primary after a successful write.
+
+    Args:
+        request (Request): The incoming request
+        call_next: Handler producing the response
+    """
+    response = await call_next(request)
+    endpoint = request.scope.get("endpoint")
+    if (
+        request.method not in READ_ONLY_METHODS
+        and response.status_code < 400
+        and not getattr(endpoint, "read_only", False)
+    ):
+        set_read_primary_cookie(response)
+    return response
+
+
 # Include all API routes from the router
 app.include_router(api_router)
@@ -11,6 +11,7 @@ from fastapi import APIRouter
 from .author import router as author_router
 from .book import router as book_router
 from .category import router as category_router
+from .metrics import router as metrics_router
 from .order import router as order_router
 from .review import router as review_router
 from .user import router as user_router
@@ -25,3 +26,4 @@ api_router.include_router(review_router)
 api_router.include_router(category_router)
 api_router.include_router(author_router)
 api_router.include_router(order_router)
+api_router.include_router(metrics_router)
@@ -5,11 +5,10 @@ This module provides API routes for retrieving author information,
 which is used in book listings and author-specific views.
 """
 
-from app.core.db_config import get_db
-from app.db.author import Author as AuthorModel
+from app.core.cache import CATALOG_HTTP_MAX_AGE, cached_json
+from app.core.snapshots import author_snapshot
 from app.schemas.author import AuthorRead
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, HTTPException, Request, status
 
 router = APIRouter(
     prefix="/author",
@@ -22,12 +21,14 @@ router = APIRouter(
     status_code=status.HTTP_200_OK,
     response_model=list[AuthorRead],
 )
-async def get_authors(db: Session = Depends(get_db)):
+async def get_authors(request: Request):
     """
     Retrieve all authors sorted alphabetically by name.
 
+    Served from the in-memory author snapshot without database access.
+
     Args:
-        db (Session): Database session dependency
+        request (Request): Incoming request, for conditional (ETag) requests
 
     Returns:
         list[AuthorRead]: List of author objects containing id, author_name, and author_bio
@@ -36,8 +37,11 @@ async def get_authors(db: Session = Depends(get_db)):
         HTTPException: If there's an error while fetching authors (500)
     """
     try:
-        authors = db.query(AuthorModel).order_by(AuthorModel.author_name).all()
-        return authors
+        return cached_json(
+            await author_snapshot.get(),
+            request,
+            max_age=CATALOG_HTTP_MAX_AGE,
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1,15 +1,29 @@
 """Book-related API endpoints and operations."""
 
 from datetime import datetime
-
-from app.core.book_stat import update_book_stats
-from app.core.db_config import get_db
+from typing import Optional
+
+from app.core.autocomplete import SUGGESTION_LIMIT, autocomplete_index
+from app.core.cache import book_cache, cached_json, featured_cache
+from app.core.db_config import get_async_db, get_read_db, read_only_endpoint
+from app.core.pagination import (
+    SortKey,
+    decode_cursor,
+    encode_cursor,
+    keyset_condition,
+    order_by_keys,
+)
+from app.core.search import book_search_expressions
 from app.db.author import Author
 from app.db.book import Book
 from app.db.bookstats import BookStats
 from app.db.category import Category
 from app.db.discount import Discount
 from app.schemas.book import (
+    AutocompleteResponse,
+    AutocompleteSuggestion,
+    BookBatchRequest,
+    BookBatchResponse,
     BookDetail,
     BookDetailResponse,
     BookFilterRequest,
@@ -21,9 +35,15 @@ from app.schemas.book import (
     RatedBook,
     RecommendedBooksResponse,
 )
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from sqlalchemy import Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Upper bound on the number of books returned by one batch lookup
+MAX_BATCH_BOOKS = 100
+
+# Matches ix_book_stats_on_sale (discount_amount DESC, id DESC)
+ON_SALE_KEYS: list[SortKey] = [(BookStats.discount_amount, True), (BookStats.id, True)]
 
 router = APIRouter(
     prefix="/book",
@@ -31,147 +51,362 @@ router = APIRouter(
 )
 
 
+def _book_sort_keys(sort_by: str) -> list[SortKey]:
+    """
+    Return the ORDER BY keys for a book listing sort mode.
+
+    Every mode ends with Book.id so the order is total, which keyset
+    pagination requires and which keeps offset pages stable.
+
+    Args:
+        sort_by: Sort mode (title, onsale, popularity, price_asc, price_desc)
+
+    Returns:
+        list[SortKey]: Sort expressions and whether each one is descending
+    """
+    if sort_by == "onsale":
+        keys = [
+            (func.coalesce(Book.book_price - Discount.discount_price, 0), True),
+            (Book.book_title, False),
+        ]
+    elif sort_by == "popularity":
+        keys = [
+            (func.coalesce(BookStats.review_count, 0), True),
+            (func.coalesce(BookStats.lowest_price, Book.book_price), False),
+        ]
+    elif sort_by == "price_asc":
+        keys = [
+            (func.coalesce(BookStats.lowest_price, Book.book_price), False),
+            (Book.book_title, False),
+        ]
+    elif sort_by == "price_desc":
+        keys = [
+            (func.coalesce(BookStats.lowest_price, Book.book_price), True),
+            (Book.book_title, False),
+        ]
+    else:
+        keys = [(Book.book_title, False)]
+    return keys + [(Book.id, False)]
+
+
+def _book_listing_query() -> Select:
+    """
+    Return the base query of book listings.
+
+    Selects each book with its author, category, active discount and
+    statistics; _paginate_books() relies on this column order.
+
+    Returns:
+        Select: Query to add filters and ordering to
+    """
+    return (
+        select(
+            Book,
+            Author,
+            Category,
+            Discount,
+            BookStats,
+        )
+        .join(Author, Book.author_id == Author.id)
+        .join(Category, Book.category_id == Category.id)
+        .outerjoin(
+            Discount,
+            (Book.id == Discount.book_id)
+            & (Discount.discount_start_date <= func.current_date())
+            & (Discount.discount_end_date >= func.current_date()),
+        )
+        .outerjoin(BookStats, Book.id == BookStats.id)
+    )
+
+
+def _apply_book_filters(query: Select, filters: BookFilterRequest) -> Select:
+    """
+    Apply the category, author and rating filters of a listing request.
+
+    Args:
+        query: Query built by _book_listing_query()
+        filters: Listing parameters
+
+    Returns:
+        Select: The filtered query
+    """
+    # Always prioritize CSV string parameters over direct parameters
+    parsed_category_ids = []
+    if filters.category_ids_csv:
+        try:
+            parsed_category_ids = [
+                int(id.strip())
+                for id in filters.category_ids_csv.split(",")
+                if id.strip()
+            ]
+            # Apply category filter from CSV
+            query = query.filter(Book.category_id.in_(parsed_category_ids))
+        except ValueError:
+            pass
+    elif filters.category_ids:  # Handles empty list, single ID, or multiple IDs
+        query = query.filter(Book.category_id.in_(filters.category_ids))
+
+    parsed_author_ids = []
+    if filters.author_ids_csv:
+        try:
+            parsed_author_ids = [
+                int(id.strip())
+                for id in filters.author_ids_csv.split(",")
+                if id.strip()
+            ]
+            # Apply author filter from CSV
+            query = query.filter(Book.author_id.in_(parsed_author_ids))
+        except ValueError:
+            pass
+    elif filters.author_ids:  # Handles empty list, single ID, or multiple IDs
+        query = query.filter(Book.author_id.in_(filters.author_ids))
+
+    if filters.rating_min is not None:
+        query = query.filter(BookStats.avg_rating >= filters.rating_min)
+    return query
+
+
+def _book_count_query(query: Select) -> Select:
+    """
+    Return the query counting the books of a listing.
+
+    Args:
+        query: Filtered query built by _book_listing_query()
+
+    Returns:
+        Select: Query returning the number of matching books
+    """
+    return select(func.count()).select_from(
+        query.with_only_columns(Book.id).subquery(),
+    )
+
+
+def _book_page_query(
+    query: Select,
+    filters: BookFilterRequest,
+    sort_mode: str,
+    sort_keys: list[SortKey],
+) -> Select:
+    """
+    Order and paginate a book listing query.
+
+    The sort key values are selected after the five listing columns, so the
+    cursor can be built from the last row. In cursor mode one extra row is
+    fetched to find out whether there is a next page.
+
+    Args:
+        query: Filtered query built by _book_listing_query()
+        filters: Listing parameters (page, per_page and cursor options)
+        sort_mode: Name of the sort mode, stored in cursors
+        sort_keys: ORDER BY keys, ending with a unique key
+
+    Returns:
+        Select: Query returning the rows of the page
+
+    Raises:
+        HTTPException: If the cursor is invalid (400)
+    """
+    query = query.add_columns(
+        *[
+            expression.label(f"sort_key_{i}")
+            for i, (expression, _) in enumerate(sort_keys)
+        ],
+    ).order_by(*order_by_keys(sort_keys))
+
+    if filters.cursor_mode or filters.cursor is not None:
+        if filters.cursor:
+            cursor_values = decode_cursor(filters.cursor, sort_mode, len(sort_keys))
+            query = query.filter(keyset_condition(sort_keys, cursor_values))
+        return query.limit(filters.per_page + 1)
+    return query.offset((filters.page - 1) * filters.per_page).limit(filters.per_page)
+
+
+async def _paginate_books(
+    db: AsyncSession,
+    query: Select,
+    filters: BookFilterRequest,
+    sort_mode: str,
+    sort_keys: list[SortKey],
+) -> PaginatedBooksResponse:
+    """
+    Order, paginate and execute a book listing query.
+
+    Args:
+        db: Async database session
+        query: Filtered query built by _book_listing_query()
+        filters: Listing parameters (page, per_page and cursor options)
+        sort_mode: Name of the sort mode, stored in cursors
+        sort_keys: ORDER BY keys, ending with a unique key
+
+    Returns:
+        PaginatedBooksResponse: The requested page of books
+
+    Raises:
+        HTTPException: If the cursor is invalid (400)
+    """
+    cursor_mode = filters.cursor_mode or filters.cursor is not None
+
+    total_items = None
+    total_pages = None
+    if filters.include_total and not (cursor_mode and filters.cursor):
+        total_items = await db.scalar(_book_count_query(query))
+        total_pages = (total_items + filters.per_page - 1) // filters.per_page
+
+    page_query = _book_page_query(query, filters, sort_mode, sort_keys)
+    result = (await db.execute(page_query)).all()
+
+    next_cursor = None
+    if cursor_mode and len(result) > filters.per_page:
+        result = result[: filters.per_page]
+        next_cursor = encode_cursor(sort_mode, result[-1][5:])
+
+    books_data = []
+    for book, author, _category, discount, _stats, *_sort_values in result:
+        books_data.append(
+            DiscountedBook(
+                id=book.id,
+                book_title=book.book_title,
+                author=author.author_name,
+                book_price=book.book_price,
+                discount_price=discount.discount_price if discount else None,
+                book_cover_photo=book.book_cover_photo,
+                discount_amount=(book.book_price - discount.discount_price)
+                if discount and discount.discount_price is not None
+                else 0,
+            ),
+        )
+
+    return PaginatedBooksResponse(
+        items=books_data,
+        total=total_items,
+        page=filters.page,
+        per_page=filters.per_page,
+        pages=total_pages,
+        next_cursor=next_cursor,
+    )
+
+
 @router.get("/", response_model=PaginatedBooksResponse)
 async def list_books(
     filters: BookFilterRequest = Depends(),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     Get a paginated list of books with filtering and sorting options.
 
+    Supports two pagination modes. Page mode uses page/per_page offsets.
+    Cursor mode (cursor_mode=true, or any cursor) seeks past the sort key of
+    the previous page's last row and returns next_cursor, so every page costs
+    the same regardless of depth; the total is only counted on the first page
+    when include_total is set.
+
     Args:
         filters (BookFilterRequest): Filtering and pagination parameters including:
             - category_ids_csv: Comma-separated list of category IDs
             - author_ids_csv: Comma-separated list of author IDs
-        db (Session): Database session dependency
+            - cursor_mode / cursor / include_total: Keyset pagination options
+        db (AsyncSession): Async database session dependency
 
     Returns:
         PaginatedBooksResponse: Paginated list of books with metadata
 
     Raises:
-        HTTPException: If there's an error retrieving books (500)
+        HTTPException: If the cursor is invalid (400) or there's an error
+                      retrieving books (500)
     """
     try:
-        query = (
-            db.query(
-                Book,
-                Author,
-                Category,
-                Discount,
-                BookStats,
-            )
-            .join(Author, Book.author_id == Author.id)
-            .join(Category, Book.category_id == Category.id)
-            .outerjoin(
-                Discount,
-                (Book.id == Discount.book_id)
-                & (Discount.discount_start_date <= func.current_date())
-                & (Discount.discount_end_date >= func.current_date()),
-            )
-            .outerjoin(BookStats, Book.id == BookStats.id)
+        query = _apply_book_filters(_book_listing_query(), filters)
+        sort_mode = filters.sort_by or "title"
+        return await _paginate_books(
+            db,
+            query,
+            filters,
+            sort_mode,
+            _book_sort_keys(sort_mode),
         )
 
-        # Always prioritize CSV string parameters over direct parameters
-        parsed_category_ids = []
-        if filters.category_ids_csv:
-            try:
-                parsed_category_ids = [
-                    int(id.strip())
-                    for id in filters.category_ids_csv.split(",")
-                    if id.strip()
-                ]
-                # Apply category filter from CSV
-                query = query.filter(Book.category_id.in_(parsed_category_ids))
-            except ValueError:
-                pass
-        elif filters.category_ids:  # Handles empty list, single ID, or multiple IDs
-            query = query.filter(Book.category_id.in_(filters.category_ids))
-
-        parsed_author_ids = []
-        if filters.author_ids_csv:
-            try:
-                parsed_author_ids = [
-                    int(id.strip())
-                    for id in filters.author_ids_csv.split(",")
-                    if id.strip()
-                ]
-                # Apply author filter from CSV
-                query = query.filter(Book.author_id.in_(parsed_author_ids))
-            except ValueError:
-                pass
-        elif filters.author_ids:  # Handles empty list, single ID, or multiple IDs
-            query = query.filter(Book.author_id.in_(filters.author_ids))
-
-        if filters.rating_min is not None:
-            query = query.filter(BookStats.avg_rating >= filters.rating_min)
-
-        if filters.sort_by == "onsale":
-            query = query.order_by(
-                func.coalesce(Book.book_price - Discount.discount_price, 0).desc(),
-                Book.book_title.asc(),
-            )
-        elif filters.sort_by == "popularity":
-            query = query.order_by(
-                func.coalesce(BookStats.review_count, 0).desc(),
-                BookStats.lowest_price.asc(),
-            )
-        elif filters.sort_by == "price_asc":
-            query = query.order_by(
-                func.coalesce(BookStats.lowest_price, Book.book_price).asc(),
-                Book.book_title.asc(),
-            )
-        elif filters.sort_by == "price_desc":
-            query = query.order_by(
-                func.coalesce(BookStats.lowest_price, Book.book_price).desc(),
-                Book.book_title.asc(),
-            )
-        else:
-            query = query.order_by(Book.book_title.asc())
+    except HTTPException:
+        raise
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error retrieving books: {str(e)}",
+        )
 
-        total_items = query.count()
-        total_pages = (total_items + filters.per_page - 1) // filters.per_page
 
-        query = query.offset((filters.page - 1) * filters.per_page).limit(
-            filters.per_page,
-        )
+@router.get("/autocomplete", response_model=AutocompleteResponse)
+async def autocomplete(
+    q: str = Query(..., min_length=1, max_length=100, description="Text typed so far"),
+    limit: int = Query(SUGGESTION_LIMIT, ge=1, le=20),
+):
+    """
+    Suggest book titles and author names for the text typed so far.
 
-        result = query.all()
-
-        books_data = []
-        book_ids = []
-        for book, author, _category, discount, _stats in result:
-            books_data.append(
-                DiscountedBook(
-                    id=book.id,
-                    book_title=book.book_title,
-                    author=author.author_name,
-                    book_price=book.book_price,
-                    discount_price=discount.discount_price if discount else None,
-                    book_cover_photo=book.book_cover_photo,
-                    discount_amount=(book.book_price - discount.discount_price)
-                    if discount and discount.discount_price is not None
-                    else 0,
-                ),
-            )
-            book_ids.append(book.id)
-
-        response = PaginatedBooksResponse(
-            items=books_data,
-            total=total_items,
-            page=filters.page,
-            per_page=filters.per_page,
-            pages=total_pages,
-        )
+    Answered from the in-memory autocomplete index without database access,
+    so it can be called on every keystroke. Any word of a title or name can
+    be typed, and the last word may be incomplete.
+
+    Args:
+        q (str): Text typed so far
+        limit (int): Maximum number of suggestions
+
+    Returns:
+        AutocompleteResponse: Matching books and authors, most popular first
+    """
+    return AutocompleteResponse(
+        items=[
+            AutocompleteSuggestion.model_validate(entry)
+            for entry in autocomplete_index.suggest(q, limit)
+        ],
+    )
+
+
+@router.get("/search", response_model=PaginatedBooksResponse)
+async def search_books(
+    q: str = Query(..., min_length=1, max_length=200, description="Search text"),
+    filters: BookFilterRequest = Depends(),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Search books by title, summary and author name.
 
-        await update_book_stats(db, book_ids)
+    Every word of q must match, and the last words may be partially typed,
+    so the endpoint also serves typeahead. Results are ordered by relevance
+    (title matches rank above author and summary matches) unless sort_by is
+    given. Accepts the same filters and pagination options as the listing.
 
-        return response
+    Args:
+        q (str): Search text
+        filters (BookFilterRequest): Filtering and pagination parameters, as
+            for the book listing
+        db (AsyncSession): Async database session dependency
 
+    Returns:
+        PaginatedBooksResponse: Paginated list of matching books
+
+    Raises:
+        HTTPException: If the cursor is invalid (400) or there's an error
+                      searching books (500)
+    """
+    try:
+        condition, rank = await book_search_expressions(db, q)
+        query = _apply_book_filters(_book_listing_query(), filters).filter(condition)
+        if filters.sort_by:
+            sort_mode = filters.sort_by
+            sort_keys = _book_sort_keys(sort_mode)
+        else:
+            sort_mode = "relevance"
+            sort_keys = [(rank, True), (Book.id, False)]
+        return await _paginate_books(db, query, filters, sort_mode, sort_keys)
+
+    except HTTPException:
+        raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error retrieving books: {str(e)}",
+            detail=f"Error searching books: {str(e)}",
         )
 
 
@@ -180,68 +415,122 @@ async def list_books(
     status_code=status.HTTP_200_OK,
     response_model=BooksOnSaleResponse,
 )
-async def get_books_on_sale(db: Session = Depends(get_db)):
+async def get_books_on_sale(
+    request: Request,
+    limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor from next_cursor"),
+    db: AsyncSession = Depends(get_async_db),
+):
     """
-    Return top 10 books with the highest discount amount.
+    Return the books with the highest discount amount.
+
+    The first page is served from the featured cache; pages requested with
+    a cursor always go to the database.
 
     Args:
-        db (Session): Database session dependency
+        request (Request): Incoming request, for conditional (ETag) requests
+        limit: Maximum number of books to return (default 10)
+        cursor: Cursor returned as next_cursor by the previous page
+        db (AsyncSession): Async database session dependency
 
     Returns:
         BooksOnSaleResponse: List of discounted books sorted by discount amount
 
     Raises:
+        HTTPException: If the cursor is invalid (400)
         HTTPException: If there's an error retrieving books (500)
     """
-    try:
-        current_date = datetime.now().date()
-
-        books = (
-            db.query(Book, Author, Discount)
-            .join(Author, Book.author_id == Author.id)
-            .join(Discount, Book.id == Discount.book_id)
-            .filter(Discount.discount_start_date <= current_date)
-            .filter(Discount.discount_end_date >= current_date)
-            .filter(
-                Discount.discount_price < Book.book_price,
-            )
-        )
+    if cursor:
+        return await _books_on_sale(db, limit, cursor)
 
-        books_with_discount = []
-        for book, author, discount in books.all():
-            discount_amount = book.book_price - discount.discount_price
-            books_with_discount.append(
-                {
-                    "book": book,
-                    "author": author,
-                    "discount": discount,
-                    "discount_amount": discount_amount,
-                },
-            )
+    body = await featured_cache.get_or_load(
+        f"on_sale:{limit}",
+        lambda: _books_on_sale(db, limit, None),
+    )
+    return cached_json(body, request)
+
+
+def _books_on_sale_query(limit: int, cursor: Optional[str]) -> Select:
+    """
+    Return the query of one page of books on sale, plus one extra row.
+
+    Args:
+        limit: Maximum number of books to return
+        cursor: Cursor returned as next_cursor by the previous page, or None
+
+    Returns:
+        Select: Query returning (Book, Author, BookStats) rows
+
+    Raises:
+        HTTPException: If the cursor is invalid (400)
+    """
+    books = (
+        select(Book, Author, BookStats)
+        .join(BookStats, Book.id == BookStats.id)
+        .join(Author, Book.author_id == Author.id)
+        .filter(BookStats.discount_amount > 0)
+    )
+    if cursor:
+        values = decode_cursor(cursor, "on_sale", len(ON_SALE_KEYS))
+        books = books.filter(keyset_condition(ON_SALE_KEYS, values))
+    return books.order_by(*order_by_keys(ON_SALE_KEYS)).limit(limit + 1)
+
+
+async def _books_on_sale(
+    db: AsyncSession,
+    limit: int,
+    cursor: Optional[str],
+) -> BooksOnSaleResponse:
+    """
+    Query one page of books on sale, largest discount first.
+
+    The ranking is read from book_stats.discount_amount, which is kept up
+    to date with the active discounts, so the database returns only the
+    requested page in discount order instead of every active discount.
+
+    Args:
+        db: Async database session
+        limit: Maximum number of books to return
+        cursor: Cursor returned as next_cursor by the previous page, or None
 
-        sorted_books = sorted(
-            books_with_discount,
-            key=lambda x: x["discount_amount"],
-            reverse=True,
-        )[:10]
+    Returns:
+        BooksOnSaleResponse: List of discounted books sorted by discount amount
+
+    Raises:
+        HTTPException: If the cursor is invalid (400)
+        HTTPException: If there's an error retrieving books (500)
+    """
+    try:
+        result = (await db.execute(_books_on_sale_query(limit, cursor))).all()
+
+        next_cursor = None
+        if len(result) > limit:
+            result = result[:limit]
+            last_stats = result[-1][2]
+            next_cursor = encode_cursor(
+                "on_sale",
+                [last_stats.discount_amount, last_stats.id],
+            )
 
         on_sale_books = [
             DiscountedBook(
-                id=item["book"].id,
-                book_title=item["book"].book_title,
-                author=item["author"].author_name,
-                book_price=item["book"].book_price,
-                discount_price=item["discount"].discount_price,
-                book_cover_photo=item["book"].book_cover_photo,
-                discount_amount=item["discount_amount"],
+                id=book.id,
+                book_title=book.book_title,
+                author=author.author_name,
+                book_price=book.book_price,
+                discount_price=stats.lowest_price,
+                book_cover_photo=book.book_cover_photo,
+                discount_amount=stats.discount_amount,
             )
-            for item in sorted_books
+            for book, author, stats in result
         ]
 
-        return BooksOnSaleResponse(items=on_sale_books)
+        return BooksOnSaleResponse(items=on_sale_books, next_cursor=next_cursor)
 
+    except HTTPException:
+        raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error retrieving books on sale: {str(e)}",
@@ -253,12 +542,18 @@ async def get_books_on_sale(db: Session = Depends(get_db)):
     status_code=status.HTTP_200_OK,
     response_model=RecommendedBooksResponse,
 )
-async def get_recommended_books(db: Session = Depends(get_db)):
+async def get_recommended_books(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+):
     """
     Get top 8 recommended books based on highest average rating and lowest price.
 
+    Served from the featured cache; the database is queried on a miss only.
+
     Args:
-        db (Session): Database session dependency
+        request (Request): Incoming request, for conditional (ETag) requests
+        db (AsyncSession): Async database session dependency
 
     Returns:
         RecommendedBooksResponse: List of recommended books with rating information
@@ -266,23 +561,52 @@ async def get_recommended_books(db: Session = Depends(get_db)):
     Raises:
         HTTPException: If there's an error retrieving books (500)
     """
-    try:
-        current_date = datetime.now().date()
-        books = (
-            db.query(Book, Author, BookStats, Discount)
-            .join(BookStats, Book.id == BookStats.id)
-            .join(Author, Book.author_id == Author.id)
-            .outerjoin(
-                Discount,
-                (Book.id == Discount.book_id)
-                & (Discount.discount_start_date <= current_date)
-                & (Discount.discount_end_date >= current_date),
-            )
-            .filter(BookStats.review_count > 0)
-            .order_by(BookStats.avg_rating.desc(), BookStats.lowest_price.asc())
-            .limit(8)
-            .all()
+    body = await featured_cache.get_or_load(
+        "recommended",
+        lambda: _recommended_books(db),
+    )
+    return cached_json(body, request)
+
+
+def _recommended_books_query() -> Select:
+    """
+    Return the query of the top 8 reviewed books by average rating.
+
+    Returns:
+        Select: Query returning (Book, Author, BookStats, Discount) rows
+    """
+    current_date = datetime.now().date()
+    return (
+        select(Book, Author, BookStats, Discount)
+        .join(BookStats, Book.id == BookStats.id)
+        .join(Author, Book.author_id == Author.id)
+        .outerjoin(
+            Discount,
+            (Book.id == Discount.book_id)
+            & (Discount.discount_start_date <= current_date)
+            & (Discount.discount_end_date >= current_date),
         )
+        .filter(BookStats.review_count > 0)
+        .order_by(BookStats.avg_rating.desc(), BookStats.lowest_price.asc())
+        .limit(8)
+    )
+
+
+async def _recommended_books(db: AsyncSession) -> RecommendedBooksResponse:
+    """
+    Query the top 8 reviewed books by average rating, cheapest first on ties.
+
+    Args:
+        db: Async database session
+
+    Returns:
+        RecommendedBooksResponse: List of recommended books with rating information
+
+    Raises:
+        HTTPException: If there's an error retrieving books (500)
+    """
+    try:
+        books = await db.execute(_recommended_books_query())
 
         recommended_books = [
             RatedBook(
@@ -295,16 +619,13 @@ async def get_recommended_books(db: Session = Depends(get_db)):
                 avg_rating=stats.avg_rating,
                 review_count=stats.review_count,
             )
-            for book, author, stats, discount in books
+            for book, author, stats, discount in books.all()
         ]
 
-        book_ids = [book.id for book, _, _, _ in books]
-        await update_book_stats(db, book_ids)
-
         return RecommendedBooksResponse(items=recommended_books)
 
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error retrieving recommended books: {str(e)}",
@@ -316,12 +637,15 @@ async def get_recommended_books(db: Session = Depends(get_db)):
     status_code=status.HTTP_200_OK,
     response_model=PopularBooksResponse,
 )
-async def get_popular_books(db: Session = Depends(get_db)):
+async def get_popular_books(request: Request, db: AsyncSession = Depends(get_async_db)):
     """
     Get top 8 popular books based on highest number of reviews and lowest price.
 
+    Served from the featured cache; the database is queried on a miss only.
+
     Args:
-        db (Session): Database session dependency
+        request (Request): Incoming request, for conditional (ETag) requests
+        db (AsyncSession): Async database session dependency
 
     Returns:
         PopularBooksResponse: List of popular books with review count information
@@ -329,25 +653,60 @@ async def get_popular_books(db: Session = Depends(get_db)):
     Raises:
         HTTPException: If there's an error retrieving books (500)
     """
-    try:
-        current_date = datetime.now().date()
-        books = (
-            db.query(Book, Author, BookStats, Discount)
-            .join(BookStats, Book.id == BookStats.id)
-            .join(Author, Book.author_id == Author.id)
-            .outerjoin(
-                Discount,
-                (Book.id == Discount.book_id)
-                & (Discount.discount_start_date <= current_date)
-                & (Discount.discount_end_date >= current_date),
-            )
-            .order_by(
-                func.coalesce(BookStats.review_count, 0).desc(),
-                BookStats.lowest_price.asc(),
-            )
-            .limit(8)
-            .all()
+    body = await featured_cache.get_or_load(
+        "popular",
+        lambda: _popular_books(db),
+    )
+    return cached_json(body, request)
+
+
+def _popular_books_query() -> Select:
+    """
+    Return the query of the top 8 most reviewed books.
+
+    Returns:
+        Select: Query returning (Book, Author, BookStats, Discount) rows
+    """
+    current_date = datetime.now().date()
+    return (
+        select(Book, Author, BookStats, Discount)
+        .join(BookStats, Book.id == BookStats.id)
+        .join(Author, Book.author_id == Author.id)
+        .outerjoin(
+            Discount,
+            (Book.id == Discount.book_id)
+            & (Discount.discount_start_date <= current_date)
+            & (Discount.discount_end_date >= current_date),
         )
+        # Matches ix_book_stats_popularity, so the top 8 are read straight
+        # from the index that review writes keep ordered
+        .order_by(
+            BookStats.review_count.desc(),
+            BookStats.lowest_price.asc(),
+            BookStats.id.asc(),
+        )
+        .limit(8)
+    )
+
+
+async def _popular_books(db: AsyncSession) -> PopularBooksResponse:
+    """
+    Query the top 8 most reviewed books, cheapest first on ties.
+
+    The ranking comes from book_stats, whose review counters are incremented
+    on every review write, and is served by one indexed query.
+
+    Args:
+        db: Async database session
+
+    Returns:
+        PopularBooksResponse: List of popular books with review count information
+
+    Raises:
+        HTTPException: If there's an error retrieving books (500)
+    """
+    try:
+        books = await db.execute(_popular_books_query())
 
         popular_books = [
             PopularBook(
@@ -357,38 +716,131 @@ async def get_popular_books(db: Session = Depends(get_db)):
                 book_price=book.book_price,
                 discount_price=discount.discount_price if discount else None,
                 book_cover_photo=book.book_cover_photo,
-                review_count=db.query(BookStats.review_count)
-                .filter(BookStats.id == book.id)
-                .scalar(),
+                review_count=stats.review_count,
             )
-            for book, author, stats, discount in books
+            for book, author, stats, discount in books.all()
         ]
 
-        book_ids = [book.id for book, _, _, _ in books]
-        await update_book_stats(db, book_ids)
-
         return PopularBooksResponse(items=popular_books)
 
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error retrieving popular books: {str(e)}",
         )
 
 
+async def _batch_book_details(db: AsyncSession, ids: list[int]) -> BookBatchResponse:
+    """
+    Look up many books with one query on the primary key.
+
+    Args:
+        db: Async database session
+        ids: Requested book IDs (duplicates are ignored)
+
+    Returns:
+        BookBatchResponse: Found books in request order and the missing IDs
+
+    Raises:
+        HTTPException: If too many IDs are requested (400) or other errors (500)
+    """
+    ids = list(dict.fromkeys(ids))
+    if len(ids) > MAX_BATCH_BOOKS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_BATCH_BOOKS} books can be requested at once",
+        )
+
+    try:
+        result = await db.execute(_book_detail_query().filter(Book.id.in_(ids)))
+        books = {row[0].id: _to_book_detail(row) for row in result}
+        return BookBatchResponse(
+            items=[books[book_id] for book_id in ids if book_id in books],
+            missing_ids=[book_id for book_id in ids if book_id not in books],
+        )
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error retrieving book details: {str(e)}",
+        )
+
+
+@router.get("/batch", response_model=BookBatchResponse)
+async def get_books_batch(
+    ids: str = Query(..., description="Comma-separated list of book IDs"),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Get the details of many books at once, e.g. to display the cart.
+
+    Args:
+        ids (str): Comma-separated list of book IDs
+        db (AsyncSession): Async database session dependency
+
+    Returns:
+        BookBatchResponse: Found books in request order and the missing IDs
+
+    Raises:
+        HTTPException: If the IDs are invalid or too many (400) or other errors (500)
+    """
+    try:
+        book_ids = [int(id.strip()) for id in ids.split(",") if id.strip()]
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="ids must be a comma-separated list of integers",
+        )
+    return await _batch_book_details(db, book_ids)
+
+
+@router.post("/batch", response_model=BookBatchResponse)
+@read_only_endpoint
+async def post_books_batch(
+    request: BookBatchRequest,
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Get the details of many books at once, with the IDs in the request body.
+
+    Same as GET /book/batch, for ID lists too long for a query string.
+
+    Args:
+        request (BookBatchRequest): IDs of the books to return
+        db (AsyncSession): Async database session dependency
+
+    Returns:
+        BookBatchResponse: Found books in request order and the missing IDs
+
+    Raises:
+        HTTPException: If too many IDs are requested (400) or other errors (500)
+    """
+    return await _batch_book_details(db, request.ids)
+
+
 @router.get(
     "/{book_id}",
     status_code=status.HTTP_200_OK,
     response_model=BookDetailResponse,
 )
-async def get_book_by_id(book_id: int, db: Session = Depends(get_db)):
+async def get_book_by_id(
+    book_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+):
     """
     Get detailed information about a specific book by its ID.
 
+    Served from the book cache namespace, which review writes and the
+    stats worker invalidate. Clients revalidate with If-None-Match. Cache
+    misses read the primary rather than a replica, so an entry reloaded
+    right after an invalidation never captures replication lag.
+
     Args:
         book_id (int): The ID of the book to retrieve
-        db (Session): Database session dependency
+        request (Request): Incoming request, for conditional (ETag) requests
+        db (AsyncSession): Async database session dependency
 
     Returns:
         BookDetailResponse: Detailed book information including category, author,
@@ -397,22 +849,69 @@ async def get_book_by_id(book_id: int, db: Session = Depends(get_db)):
     Raises:
         HTTPException: If book not found (404) or other errors (500)
     """
-    try:
-        current_date = datetime.now().date()
-        book_data = (
-            db.query(Book, Author, Category, BookStats, Discount)
-            .join(Author, Book.author_id == Author.id)
-            .join(Category, Book.category_id == Category.id)
-            .outerjoin(BookStats, Book.id == BookStats.id)
-            .outerjoin(
-                Discount,
-                (Book.id == Discount.book_id)
-                & (Discount.discount_start_date <= current_date)
-                & (Discount.discount_end_date >= current_date),
-            )
-            .filter(Book.id == book_id)
-            .first()
+    body = await book_cache.get_or_load(
+        str(book_id),
+        lambda: _book_detail(db, book_id),
+    )
+    return cached_json(body, request)
+
+
+def _book_detail_query() -> Select:
+    """
+    Return the query of books with their author, category, stats and discount.
+
+    Returns:
+        Select: Query to filter by book ID
+    """
+    current_date = datetime.now().date()
+    return (
+        select(Book, Author, Category, BookStats, Discount)
+        .join(Author, Book.author_id == Author.id)
+        .join(Category, Book.category_id == Category.id)
+        .outerjoin(BookStats, Book.id == BookStats.id)
+        .outerjoin(
+            Discount,
+            (Book.id == Discount.book_id)
+            & (Discount.discount_start_date <= current_date)
+            & (Discount.discount_end_date >= current_date),
         )
+    )
+
+
+def _to_book_detail(row) -> BookDetail:
+    """Build a BookDetail from a row of _book_detail_query()."""
+    book, author, category, stats, discount = row
+    return BookDetail(
+        id=book.id,
+        book_title=book.book_title,
+        author=author.author_name,
+        category=category.category_name,
+        book_price=book.book_price,
+        book_summary=book.book_summary,
+        book_cover_photo=book.book_cover_photo,
+        discount_price=discount.discount_price if discount else None,
+        avg_rating=stats.avg_rating if stats else 0.0,
+        review_count=stats.review_count if stats else 0,
+    )
+
+
+async def _book_detail(db: AsyncSession, book_id: int) -> BookDetailResponse:
+    """
+    Query a book with its author, category, statistics and active discount.
+
+    Args:
+        db: Async database session
+        book_id: The ID of the book to retrieve
+
+    Returns:
+        BookDetailResponse: Detailed book information
+
+    Raises:
+        HTTPException: If book not found (404) or other errors (500)
+    """
+    try:
+        result = await db.execute(_book_detail_query().filter(Book.id == book_id))
+        book_data = result.first()
 
         if not book_data:
             raise HTTPException(
@@ -420,31 +919,11 @@ async def get_book_by_id(book_id: int, db: Session = Depends(get_db)):
                 detail=f"Book with id {book_id} not found",
             )
 
-        book, author, category, stats, discount = book_data
-
-        book_detail_data = {
-            "id": book.id,
-            "book_title": book.book_title,
-            "author": author.author_name,
-            "category": category.category_name,
-            "book_price": book.book_price,
-            "book_summary": book.book_summary,
-            "book_cover_photo": book.book_cover_photo,
-            "discount_price": discount.discount_price if discount else None,
-            "avg_rating": stats.avg_rating if stats else 0.0,
-            "review_count": stats.review_count if stats else 0,
-        }
-
-        book_detail = BookDetail(**book_detail_data)
-        response = BookDetailResponse(book=book_detail)
-
-        await update_book_stats(db, [book_id])
-
-        return response
+        return BookDetailResponse(book=_to_book_detail(book_data))
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error retrieving book details: {str(e)}",
@@ -5,11 +5,10 @@ This module provides API routes for retrieving book categories,
 which are used for filtering and organizing books in the bookstore.
 """
 
-from app.core.db_config import get_db
-from app.db.category import Category as CategoryModel
+from app.core.cache import CATALOG_HTTP_MAX_AGE, cached_json
+from app.core.snapshots import category_snapshot
 from app.schemas.category import CategoryRead
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, HTTPException, Request, status
 
 router = APIRouter(
     prefix="/category",
@@ -22,15 +21,16 @@ router = APIRouter(
     status_code=status.HTTP_200_OK,
     response_model=list[CategoryRead],
 )
-async def get_categories(db: Session = Depends(get_db)):
+async def get_categories(request: Request):
     """
     Retrieve all book categories sorted alphabetically by name.
 
     Categories are used to classify books and allow users to browse
-    the bookstore by subject or genre.
+    the bookstore by subject or genre. The list is served from the in-memory
+    category snapshot without database access.
 
     Args:
-        db (Session): Database session dependency
+        request (Request): Incoming request, for conditional (ETag) requests
 
     Returns:
         list[CategoryRead]: List of category objects containing id, category_name, and category_desc
@@ -39,8 +39,11 @@ async def get_categories(db: Session = Depends(get_db)):
         HTTPException: If there's an error while fetching categories (500)
     """
     try:
-        categories = db.query(CategoryModel).order_by(CategoryModel.category_name).all()
-        return categories
+        return cached_json(
+            await category_snapshot.get(),
+            request,
+            max_age=CATALOG_HTTP_MAX_AGE,
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
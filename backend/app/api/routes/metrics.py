@@ -0,0 +1,64 @@
+"""
+Operational metrics API endpoints.
+
+This module exposes runtime counters of the current worker process, such as
+cache hit and miss rates and connection pool usage, for monitoring and
+capacity planning.
+"""
+
+from urllib.parse import urlparse
+
+from app.core.cache import CACHE_URL, cache_metrics
+from app.core.db_config import get_pool_metrics
+from app.core.settings import database_settings
+from fastapi import APIRouter, status
+
+router = APIRouter(
+    prefix="/metrics",
+    tags=["metrics"],
+)
+
+
+@router.get(
+    "/cache",
+    status_code=status.HTTP_200_OK,
+)
+async def get_cache_metrics():
+    """
+    Return cache hit, miss and error counters per namespace.
+
+    Counters are kept per worker process and reset on restart.
+
+    Returns:
+        dict: Cache backend type and counters keyed by namespace
+    """
+    return {
+        "backend": urlparse(CACHE_URL).scheme or "local",
+        "namespaces": cache_metrics.snapshot(),
+    }
+
+
+@router.get(
+    "/db",
+    status_code=status.HTTP_200_OK,
+)
+async def get_db_metrics():
+    """
+    Return connection pool settings and checkout metrics per engine.
+
+    Counters are kept per worker process and reset on restart. Multiply the
+    pool limits by the number of workers to get the connections a deployment
+    can open against the database.
+
+    Returns:
+        dict: Pool configuration and metrics of the sync and async engines
+    """
+    return {
+        "settings": {
+            "pool_size": database_settings.pool_size,
+            "max_overflow": database_settings.max_overflow,
+            "pool_timeout": database_settings.pool_timeout,
+            "pgbouncer": database_settings.pgbouncer,
+        },
+        "engines": get_pool_metrics(),
+    }
@@ -2,17 +2,39 @@
 Order-related API endpoints and operations.
 
 This module provides API routes for creating and managing customer orders.
-It handles order creation, validation, and storage in the database.
+It handles order creation, validation, and storage in the database. Orders
+are priced on the server from current book prices and discounts, and the
+stock of stock-tracked books is reserved in the same transaction.
 """
 
 from datetime import datetime
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Iterable, Optional
 
-from app.core.db_config import get_db
+from app.core.db_config import get_async_db, get_read_db
+from app.core.idempotency import Idempotency, idempotency_guard
+from app.core.pagination import (
+    SortKey,
+    decode_cursor,
+    encode_cursor,
+    keyset_condition,
+    order_by_keys,
+)
+from app.core.stock import InsufficientStockError, reserve_stock
+from app.db.book import Book
+from app.db.discount import Discount
 from app.db.order import Order
 from app.db.order_item import OrderItem
-from app.schemas.order import OrderListResponse, OrderRequest, OrderResponse
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from app.schemas.order import (
+    OrderBatchRequest,
+    OrderItemRead,
+    OrderListResponse,
+    OrderRequest,
+    OrderResponse,
+)
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import Select, func, insert, null, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 router = APIRouter(
     prefix="/order",
@@ -20,6 +42,151 @@ router = APIRouter(
 )
 
 
+# Upper bound on the number of orders accepted by one batch request
+MAX_BATCH_ORDERS = 500
+
+CENT = Decimal("0.01")
+
+# Order history is paginated newest first on (order_date, id)
+ORDER_HISTORY_KEYS: list[SortKey] = [(Order.order_date, True), (Order.id, True)]
+
+
+async def _current_prices(db: AsyncSession, book_ids: set[int]) -> dict[int, Decimal]:
+    """
+    Resolve the current unit price of many books with one query.
+
+    The price is the lowest active discount price, or the book price when
+    the book has no active discount.
+
+    Args:
+        db: Async database session
+        book_ids: IDs of the books to price
+
+    Returns:
+        dict[int, Decimal]: Unit price per existing book ID
+    """
+    result = await db.execute(
+        select(
+            Book.id,
+            func.min(func.coalesce(Discount.discount_price, Book.book_price)),
+        )
+        .outerjoin(
+            Discount,
+            (Book.id == Discount.book_id)
+            & (Discount.discount_start_date <= func.current_date())
+            & (Discount.discount_end_date >= func.current_date()),
+        )
+        .filter(Book.id.in_(book_ids))
+        .group_by(Book.id),
+    )
+    return {
+        book_id: Decimal(str(price)).quantize(CENT, rounding=ROUND_HALF_UP)
+        for book_id, price in result
+    }
+
+
+async def _create_orders(
+    db: AsyncSession,
+    orders: list[OrderRequest],
+) -> list[OrderResponse]:
+    """
+    Price, reserve and insert orders with a constant number of statements.
+
+    Prices for every book of every order are resolved in one query, the
+    stock of all line items is reserved together (see app.core.stock), the
+    orders are inserted with one multi-row INSERT and their items with
+    another, regardless of how many orders and items there are. Totals are
+    computed with Decimal. The caller commits.
+
+    Args:
+        db: Async database session
+        orders: Orders to create
+
+    Returns:
+        list[OrderResponse]: Created orders with their items, in request order
+
+    Raises:
+        HTTPException: If an order has no items (400), a book does not exist
+                      (404) or is out of stock (409)
+    """
+    if any(not order.items for order in orders):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No items in the order",
+        )
+
+    book_ids = {item.book_id for order in orders for item in order.items}
+    prices = await _current_prices(db, book_ids)
+    missing_book_ids = sorted(book_ids - prices.keys())
+    if missing_book_ids:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Books not found: {missing_book_ids}",
+        )
+
+    try:
+        await reserve_stock(
+            db,
+            ((item.book_id, item.quantity) for order in orders for item in order.items),
+        )
+    except InsufficientStockError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e),
+        )
+
+    order_date = datetime.now()
+    order_rows = [
+        {
+            "user_id": order.user_id,
+            "order_date": order_date,
+            "order_total": sum(
+                (prices[item.book_id] * item.quantity for item in order.items),
+                Decimal("0"),
+            ),
+        }
+        for order in orders
+    ]
+    order_ids = (
+        await db.scalars(
+            insert(Order).returning(Order.id, sort_by_parameter_order=True),
+            order_rows,
+        )
+    ).all()
+
+    item_rows = [
+        {
+            "order_id": order_id,
+            "book_id": item.book_id,
+            "quantity": item.quantity,
+            "price": prices[item.book_id],
+        }
+        for order_id, order in zip(order_ids, orders)
+        for item in order.items
+    ]
+    items = (
+        await db.scalars(
+            insert(OrderItem).returning(OrderItem, sort_by_parameter_order=True),
+            item_rows,
+        )
+    ).all()
+
+    items_by_order: dict[int, list[OrderItem]] = {}
+    for item in items:
+        items_by_order.setdefault(item.order_id, []).append(item)
+
+    return [
+        OrderResponse(
+            id=order_id,
+            user_id=row["user_id"],
+            order_date=row["order_date"],
+            order_total=row["order_total"],
+            items=items_by_order.get(order_id, []),
+        )
+        for order_id, row in zip(order_ids, order_rows)
+    ]
+
+
 @router.post(
     "/create",
     status_code=status.HTTP_201_CREATED,
@@ -27,108 +194,247 @@ router = APIRouter(
 )
 async def create_order(
     order: OrderRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
+    idempotency: Idempotency = Depends(idempotency_guard),
 ):
     """
     Create a new customer order with order items.
 
     This endpoint processes a customer order by:
-    1. Validating the order has items
-    2. Calculating the total order amount
-    3. Creating the order record
-    4. Creating individual order item records
-    5. Committing the transaction
+    1. Validating the order has items and every book exists
+    2. Resolving the current price of every book (discount or book price)
+    3. Reserving the stock of every stock-tracked book
+    4. Creating the order record with its Decimal total
+    5. Creating all order item records with one multi-row insert
+    6. Committing the transaction
+
+    Prices sent by the client are ignored. A retry sent with the same
+    Idempotency-Key header returns the first response without creating
+    another order.
 
     Args:
         order (OrderRequest): Order data including user ID and order items
-        db (Session): Database session dependency
+        db (AsyncSession): Async database session dependency
+        idempotency (Idempotency): Replays retries sent with an Idempotency-Key
 
     Returns:
         OrderResponse: Created order with its ID and details
 
     Raises:
-        HTTPException: If order has no items (400) or other errors (500)
+        HTTPException: If order has no items (400), a book does not exist (404),
+                      is out of stock (409), the Idempotency-Key is in use
+                      (409, 422) or other errors (500)
     """
+    if idempotency.replay:
+        return idempotency.replay
+
     try:
-        # Validate order details
-        if not order.items:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="No items in the order",
-            )
+        (created,) = await _create_orders(db, [order])
+        await db.commit()
+        return await idempotency.respond(status.HTTP_201_CREATED, created)
 
-        # Calculate total amount from all items
-        total_amount = sum(
-            float(item.quantity) * float(item.price) for item in order.items
+    except HTTPException:
+        await db.rollback()
+        raise
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"An error occurred: {str(e)}",
         )
 
-        # Create main order record
-        new_order = Order(
-            user_id=order.user_id,
-            order_date=datetime.now(),
-            order_total=total_amount,
-        )
 
-        # Save order to database
-        db.add(new_order)
-        db.flush()  # Get order ID without committing transaction
+@router.post(
+    "/batch",
+    status_code=status.HTTP_201_CREATED,
+    response_model=OrderListResponse,
+)
+async def create_orders_batch(
+    request: OrderBatchRequest,
+    db: AsyncSession = Depends(get_async_db),
+    idempotency: Idempotency = Depends(idempotency_guard),
+):
+    """
+    Create many orders at once, e.g. for B2B customers.
 
-        # Create individual order item records
-        order_items_db = []
-        for item in order.items:
-            order_item = OrderItem(
-                order_id=new_order.id,
-                book_id=item.book_id,
-                quantity=item.quantity,
-                price=item.price,
-            )
-            order_items_db.append(order_item)
-            db.add(order_item)
+    All orders are priced with one query, their stock is reserved together
+    and they are inserted with two multi-row inserts in a single
+    transaction: either every order is created or none. A retry sent with
+    the same Idempotency-Key header returns the first response.
+
+    Args:
+        request (OrderBatchRequest): Orders to create
+        db (AsyncSession): Async database session dependency
+        idempotency (Idempotency): Replays retries sent with an Idempotency-Key
+
+    Returns:
+        OrderListResponse: Created orders in request order
+
+    Raises:
+        HTTPException: If an order has no items (400), a book does not exist
+                      (404) or is out of stock (409), the Idempotency-Key is in
+                      use (409, 422), there are too many orders (413) or other
+                      errors (500)
+    """
+    if len(request.orders) > MAX_BATCH_ORDERS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {MAX_BATCH_ORDERS} orders can be created at once",
+        )
 
-        db.commit()
-        db.refresh(new_order)
+    if idempotency.replay:
+        return idempotency.replay
 
-        return new_order
+    try:
+        created = await _create_orders(db, request.orders)
+        await db.commit()
+        return await idempotency.respond(
+            status.HTTP_201_CREATED,
+            OrderListResponse(orders=created),
+        )
 
+    except HTTPException:
+        await db.rollback()
+        raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"An error occurred: {str(e)}",
         )
 
 
+def _order_history_query(user_id: int, limit: int, cursor: Optional[str]) -> Select:
+    """
+    Return the query of one page of a user's orders, plus one extra row.
+
+    Args:
+        user_id: ID of the user
+        limit: Maximum number of orders to return
+        cursor: Cursor returned as next_cursor by the previous page, or None
+
+    Returns:
+        Select: Query returning the orders, newest first
+
+    Raises:
+        HTTPException: If the cursor is invalid (400)
+    """
+    query = (
+        select(Order)
+        .filter(Order.user_id == user_id)
+        .order_by(*order_by_keys(ORDER_HISTORY_KEYS))
+    )
+    if cursor:
+        cursor_values = decode_cursor(
+            cursor,
+            "order_history",
+            len(ORDER_HISTORY_KEYS),
+        )
+        query = query.filter(keyset_condition(ORDER_HISTORY_KEYS, cursor_values))
+    # Fetch one extra row to find out whether there is a next page
+    return query.limit(limit + 1)
+
+
+def _order_items_query(order_ids: Iterable[int], include_books: bool) -> Select:
+    """
+    Return the query of the items of several orders, grouped by order.
+
+    Args:
+        order_ids: IDs of the orders
+        include_books: Whether to add book titles and covers to the items
+
+    Returns:
+        Select: Query returning (OrderItem, book title, book cover) rows
+    """
+    if include_books:
+        query = select(
+            OrderItem,
+            Book.book_title,
+            Book.book_cover_photo,
+        ).outerjoin(Book, OrderItem.book_id == Book.id)
+    else:
+        query = select(OrderItem, null(), null())
+    return query.filter(
+        OrderItem.order_id.in_(list(order_ids)),
+    ).order_by(OrderItem.order_id, OrderItem.id)
+
+
 @router.get(
     "/get/{id}",
     response_model=OrderListResponse,
 )
 async def get_order_by_id(
     id: int,
-    db: Session = Depends(get_db),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor from next_cursor"),
+    include_books: bool = Query(False, description="Add book titles and covers"),
+    db: AsyncSession = Depends(get_read_db),
 ):
+    """
+    Get a page of a user's order history, newest first.
+
+    Runs two queries whatever the number of orders: one for the page of
+    orders, seeking past the cursor on (order_date, id), and one loading
+    the items of all those orders (with their book titles and covers when
+    include_books is set), grouped by order in one pass.
+
+    Args:
+        id (int): ID of the user
+        limit (int): Maximum number of orders to return
+        cursor (Optional[str]): Cursor returned as next_cursor by the previous page
+        include_books (bool): Whether to add book titles and covers to the items
+        db (AsyncSession): Async database session dependency
+
+    Returns:
+        OrderListResponse: Orders with their items and the next page cursor
+
+    Raises:
+        HTTPException: If the cursor is invalid (400) or other errors (500)
+    """
     try:
-        result = OrderListResponse(orders=[])
-        query = (
-            db.query(
-                Order,
-            )
-            .filter(Order.user_id == id)
-            .order_by(Order.id.desc())
-        )
-        orders = query.all()
-        for order in orders:
-            temp = OrderResponse(
-                id=order.id,
-                user_id=order.user_id,
-                order_date=order.order_date,
-                order_total=order.order_total,
-            )
-            order_items = (
-                db.query(OrderItem).filter(OrderItem.order_id == order.id).all()
+        orders = (await db.scalars(_order_history_query(id, limit, cursor))).all()
+
+        next_cursor = None
+        if len(orders) > limit:
+            orders = orders[:limit]
+            next_cursor = encode_cursor(
+                "order_history",
+                [orders[-1].order_date, orders[-1].id],
             )
-            temp.items = order_items
-            result.orders.append(temp)
-        return result
+
+        items_by_order: dict[int, list[OrderItemRead]] = {
+            order.id: [] for order in orders
+        }
+        if orders:
+            items_query = _order_items_query(items_by_order, include_books)
+            for item, book_title, book_cover_photo in await db.execute(items_query):
+                items_by_order[item.order_id].append(
+                    OrderItemRead(
+                        id=item.id,
+                        order_id=item.order_id,
+                        book_id=item.book_id,
+                        quantity=item.quantity,
+                        price=item.price,
+                        book_title=book_title,
+                        book_cover_photo=book_cover_photo,
+                    ),
+                )
+
+        return OrderListResponse(
+            orders=[
+                OrderResponse(
+                    id=order.id,
+                    user_id=order.user_id,
+                    order_date=order.order_date,
+                    order_total=order.order_total,
+                    items=items_by_order[order.id],
+                )
+                for order in orders
+            ],
+            next_cursor=next_cursor,
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
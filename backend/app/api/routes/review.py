@@ -4,15 +4,31 @@ Book review API endpoints and operations.
 This module provides API routes for managing book reviews including:
 - Retrieving paginated reviews for books
 - Getting review statistics
-- Adding new reviews
+- Adding new reviews, one at a time or in bulk
 
 It also handles updating book statistics when reviews are added.
 """
 
 import math
 
-from app.core.book_stat import refresh_review_stats
-from app.core.db_config import get_db
+from app.core.autocomplete import autocomplete_index
+from app.core.book_stat import increment_review_stats, refresh_review_stats
+from app.core.cache import (
+    cached_json,
+    invalidate_book_stats,
+    invalidate_featured_books,
+    review_stats_cache,
+    run_backend,
+)
+from app.core.db_config import get_async_db, get_read_db
+from app.core.idempotency import Idempotency, idempotency_guard
+from app.core.pagination import (
+    decode_cursor,
+    encode_cursor,
+    keyset_condition,
+    order_by_keys,
+)
+from app.core.stats_worker import stats_worker
 
 # Import DB Models
 from app.db.book import Book  # Needed for checking if book exists
@@ -21,24 +37,65 @@ from app.db.review import Review
 from app.schemas.bookstats import BookStatsResponse
 from app.schemas.review import (
     PaginatedReviewsResponse,
+    ReviewBulkResponse,
     ReviewFilterRequest,
     ReviewPostRequest,
     ReviewPostResponse,
 )
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import asc, desc
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import Select, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 router = APIRouter(
     prefix="/review",
     tags=["review"],
 )
 
+# Upper bound on the number of reviews accepted by one bulk request
+MAX_BULK_REVIEWS = 10000
+
+_bulk_reviews_adapter = TypeAdapter(list[ReviewPostRequest])
+
+
+def _book_reviews_query(filters: ReviewFilterRequest, sort_mode: str) -> Select:
+    """
+    Return the query of one page of a book's reviews.
+
+    Reviews are ordered on (review_date, id), the review id breaking ties for
+    a total order. In cursor mode one extra row is fetched to find out
+    whether there is a next page.
+
+    Args:
+        filters: Filtering and pagination parameters
+        sort_mode: "newest" or "oldest", stored in cursors
+
+    Returns:
+        Select: Query returning the reviews of the page
+
+    Raises:
+        HTTPException: If the cursor is invalid (400)
+    """
+    descending = sort_mode == "newest"
+    sort_keys = [(Review.review_date, descending), (Review.id, descending)]
+
+    query = select(Review).filter(Review.book_id == filters.book_id)
+    if filters.rating is not None:
+        query = query.filter(Review.rating_star == filters.rating)
+    query = query.order_by(*order_by_keys(sort_keys))
+
+    if filters.cursor_mode or filters.cursor is not None:
+        if filters.cursor:
+            cursor_values = decode_cursor(filters.cursor, sort_mode, 2)
+            query = query.filter(keyset_condition(sort_keys, cursor_values))
+        return query.limit(filters.per_page + 1)
+    return query.offset((filters.page - 1) * filters.per_page).limit(filters.per_page)
+
 
 @router.get("/book/{book_id}", response_model=PaginatedReviewsResponse)
 async def get_book_reviews(
     filters: ReviewFilterRequest = Depends(),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     Get paginated reviews for a specific book with filtering and sorting options.
@@ -50,50 +107,55 @@ async def get_book_reviews(
             - sort_order: Sort by review date ('newest' or 'oldest')
             - page: Page number for pagination
             - per_page: Number of items per page (5, 15, 20, or 25)
-        db (Session): Database session dependency
+            - cursor_mode / cursor: Keyset pagination on (review_date, id)
+        db (AsyncSession): Async database session dependency
 
     Returns:
         PaginatedReviewsResponse: Paginated list of reviews with metadata
 
     Raises:
-        HTTPException: If book is not found (404) or other errors (500)
+        HTTPException: If book is not found (404), the cursor is invalid (400)
+                      or other errors (500)
     """
     try:
-        # Check if book exists
-        book = db.query(Book).filter(Book.id == filters.book_id).first()
+        # Check if book exists and load its precomputed review counters
+        result = await db.execute(
+            select(Book.id, BookStats)
+            .outerjoin(BookStats, Book.id == BookStats.id)
+            .filter(Book.id == filters.book_id),
+        )
+        book = result.first()
         if not book:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Book with id {filters.book_id} not found",
             )
 
-        # Base query for reviews of the specific book
-        query = db.query(Review).filter(Review.book_id == filters.book_id)
-
-        # Apply rating filter if specified
+        # Take the total from the counters maintained in book_stats instead
+        # of COUNT(*)
+        book_stats = book.BookStats
         if filters.rating is not None:
-            query = query.filter(Review.rating_star == filters.rating)
-
-        # Apply sorting
-        if filters.sort_order.lower() == "oldest":
-            query = query.order_by(asc(Review.review_date))
-        else:  # Default to newest
-            query = query.order_by(desc(Review.review_date))
+            total_items = (
+                getattr(book_stats, f"star_{filters.rating}") if book_stats else 0
+            )
+        else:
+            total_items = book_stats.review_count if book_stats else 0
 
-        # Count total before pagination
-        total_items = query.count()
         total_pages = (
             (total_items + filters.per_page - 1) // filters.per_page
             if total_items > 0
             else 0
         )
 
-        # Apply pagination
-        reviews = (
-            query.offset((filters.page - 1) * filters.per_page)
-            .limit(filters.per_page)
-            .all()
-        )
+        sort_mode = "oldest" if filters.sort_order.lower() == "oldest" else "newest"
+        reviews = (await db.scalars(_book_reviews_query(filters, sort_mode))).all()
+
+        next_cursor = None
+        cursor_mode = filters.cursor_mode or filters.cursor is not None
+        if cursor_mode and len(reviews) > filters.per_page:
+            reviews = reviews[: filters.per_page]
+            last = reviews[-1]
+            next_cursor = encode_cursor(sort_mode, [last.review_date, last.id])
 
         # Transform to response model
         reviews_data = [
@@ -114,6 +176,7 @@ async def get_book_reviews(
             page=filters.page,
             per_page=filters.per_page,
             pages=total_pages,
+            next_cursor=next_cursor,
         )
 
         return response
@@ -121,7 +184,7 @@ async def get_book_reviews(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error retrieving book reviews: {str(e)}",
@@ -131,75 +194,73 @@ async def get_book_reviews(
 @router.get("/book/{book_id}/stats", response_model=BookStatsResponse)
 async def get_book_stats(
     book_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Get comprehensive review statistics for a specific book.
 
-    Retrieves the following statistics:
+    Retrieves the following statistics from the precomputed book_stats row:
     - Total review count
     - Average rating (rounded to 2 decimal places)
     - Count of reviews for each star rating (1-5)
 
+    Responses are served from the review_stats cache namespace, which review
+    writes invalidate per book.
+
     Args:
         book_id (int): The ID of the book to get statistics for
-        db (Session): Database session dependency
+        request (Request): Incoming request, for conditional (ETag) requests
+        db (AsyncSession): Async database session dependency
+
+    Returns:
+        BookStatsResponse: Book review statistics
+
+    Raises:
+        HTTPException: If book is not found (404) or other errors (500)
+    """
+    body = await review_stats_cache.get_or_load(
+        str(book_id),
+        lambda: _book_stats(db, book_id),
+    )
+    return cached_json(body, request)
+
+
+async def _book_stats(db: AsyncSession, book_id: int) -> BookStatsResponse:
+    """
+    Load the review statistics of a book from its book_stats row.
+
+    Args:
+        db: Async database session
+        book_id: The ID of the book to get statistics for
 
     Returns:
         BookStatsResponse: Book review statistics
 
     Raises:
-        HTTPException: If book or statistics are not found (404) or other errors (500)
+        HTTPException: If book is not found (404) or other errors (500)
     """
     try:
-        # Check if book exists
-        book = db.query(Book).filter(Book.id == book_id).first()
-        if not book:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Book with id {book_id} not found",
-            )
-
-        # Get book stats (review_count and avg_rating)
-        book_stats = db.query(BookStats).filter(BookStats.id == book_id).first()
+        # Every book has a book_stats row, so one primary-key lookup both
+        # checks the book exists and loads all counters
+        book_stats = await db.get(BookStats, book_id)
 
         if not book_stats:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Statistics for book with id {book_id} not found",
-            )
-
-        # Count reviews for each star rating (1-5)
-        star_counts = {
-            "star_1": 0,
-            "star_2": 0,
-            "star_3": 0,
-            "star_4": 0,
-            "star_5": 0,
-        }
-
-        # Query to count reviews by rating
-        for rating in range(1, 6):
-            count = (
-                db.query(Review)
-                .filter(
-                    Review.book_id == book_id,
-                    Review.rating_star == rating,
-                )
-                .count()
+                detail=f"Book with id {book_id} not found",
             )
-            star_counts[f"star_{rating}"] = count
 
         # Round down avg_rating to two decimal places
         avg_rating = math.floor(book_stats.avg_rating * 100) / 100
         stats = {
             "review_count": book_stats.review_count,
             "avg_rating": avg_rating,
-            "star_5": star_counts["star_5"],
-            "star_4": star_counts["star_4"],
-            "star_3": star_counts["star_3"],
-            "star_2": star_counts["star_2"],
-            "star_1": star_counts["star_1"],
+            "star_5": book_stats.star_5,
+            "star_4": book_stats.star_4,
+            "star_3": book_stats.star_3,
+            "star_2": book_stats.star_2,
+            "star_1": book_stats.star_1,
         }
 
         # Wrap in response model
@@ -210,7 +271,7 @@ async def get_book_stats(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error retrieving book statistics: {str(e)}",
@@ -224,29 +285,37 @@ async def get_book_stats(
 )
 async def add_book_review(
     review: ReviewPostRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
+    idempotency: Idempotency = Depends(idempotency_guard),
 ):
     """
     Add a new review for a specific book.
 
     This endpoint creates a new review in the database and updates
-    the book's statistics (average rating, review count).
+    the book's statistics (average rating, review count) in one transaction.
+    A retry sent with the same Idempotency-Key header returns the first
+    response without adding the review or counting it in the statistics again.
 
     Args:
         review (ReviewPostRequest): Review data including book ID, title,
                                    details, and rating
-        db (Session): Database session dependency
+        db (AsyncSession): Async database session dependency
+        idempotency (Idempotency): Replays retries sent with an Idempotency-Key
 
     Returns:
         ReviewPostResponse: Created review with its details
 
     Raises:
-        HTTPException: If book doesn't exist (404) or other errors (500)
+        HTTPException: If book doesn't exist (404), the Idempotency-Key is in
+                      use (409, 422) or other errors (500)
     """
+    if idempotency.replay:
+        return idempotency.replay
+
     try:
         # Check if the book exists using the Book model
-        book = db.query(Book).filter(Book.id == review.book_id).first()
-        if not book:
+        book_exists = await db.scalar(select(Book.id).filter(Book.id == review.book_id))
+        if not book_exists:
             raise HTTPException(status_code=404, detail="Book not found")
 
         # Create a new review instance using the Model
@@ -260,14 +329,195 @@ async def add_book_review(
         )
 
         db.add(new_review)
-        db.commit()
-        db.refresh(new_review)
+        await db.flush()
+
+        # Increment book statistics in the same transaction as the review
+        if not await refresh_review_stats(db, review):
+            # No book_stats row yet; let the stats worker create it
+            stats_worker.mark_dirty([review.book_id])
 
-        # Refresh book statistics using the review data
-        await refresh_review_stats(db, review)
+        await db.commit()
+        await run_backend(invalidate_featured_books)
+        await run_backend(invalidate_book_stats, [review.book_id])
+        autocomplete_index.add_reviews({review.book_id: 1})
 
-        # Return the ORM object, Pydantic handles conversion
-        return new_review
+        return await idempotency.respond(
+            status.HTTP_201_CREATED,
+            ReviewPostResponse.model_validate(new_review, from_attributes=True),
+        )
 
     except HTTPException:
         raise
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error adding book review: {str(e)}",
+        )
+
+
+async def _parse_bulk_reviews(request: Request) -> list[ReviewPostRequest]:
+    """
+    Parse a bulk review body sent as a JSON array or as NDJSON.
+
+    NDJSON (application/x-ndjson) is read as a stream, one review per line,
+    so large partner feeds do not need to be buffered as a single document.
+
+    Args:
+        request (Request): Incoming request
+
+    Returns:
+        list[ReviewPostRequest]: Validated reviews
+
+    Raises:
+        HTTPException: If the body is invalid (422) or too large (413)
+    """
+    content_type = request.headers.get("content-type", "")
+    try:
+        if "ndjson" in content_type:
+            reviews = []
+            buffer = b""
+            async for chunk in request.stream():
+                buffer += chunk
+                *lines, buffer = buffer.split(b"\n")
+                for line in lines:
+                    if line.strip():
+                        reviews.append(ReviewPostRequest.model_validate_json(line))
+                if len(reviews) > MAX_BULK_REVIEWS:
+                    break
+            if buffer.strip():
+                reviews.append(ReviewPostRequest.model_validate_json(buffer))
+        else:
+            reviews = _bulk_reviews_adapter.validate_json(await request.body())
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=e.errors(include_url=False, include_context=False),
+        )
+
+    if len(reviews) > MAX_BULK_REVIEWS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {MAX_BULK_REVIEWS} reviews can be posted at once",
+        )
+    return reviews
+
+
+@router.post(
+    "/book/bulk",
+    status_code=status.HTTP_201_CREATED,
+    response_model=ReviewBulkResponse,
+    openapi_extra={
+        "requestBody": {
+            "content": {
+                "application/json": {
+                    "schema": {
+                        "type": "array",
+                        "items": ReviewPostRequest.model_json_schema(),
+                    },
+                },
+                "application/x-ndjson": {"schema": {"type": "string"}},
+            },
+        },
+    },
+)
+async def add_book_reviews_bulk(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Add many reviews at once, e.g. when importing partner review feeds.
+
+    The body is either a JSON array of ReviewPostRequest objects or an NDJSON
+    stream with one object per line. Book IDs are validated with one query,
+    all reviews are inserted with a single multi-row insert, and book_stats
+    receives one grouped increment per affected book, all in one transaction.
+    Reviews for books that do not exist are skipped and reported.
+
+    Args:
+        request (Request): Request carrying the JSON array or NDJSON body
+        db (AsyncSession): Async database session dependency
+
+    Returns:
+        ReviewBulkResponse: Number of inserted and rejected reviews
+
+    Raises:
+        HTTPException: If the body is invalid (422), too large (413)
+                      or other errors (500)
+    """
+    reviews = await _parse_bulk_reviews(request)
+    if not reviews:
+        return ReviewBulkResponse(inserted=0, rejected=0)
+
+    try:
+        # Validate every referenced book (and find its stats row) in one query
+        book_ids = {review.book_id for review in reviews}
+        result = await db.execute(
+            select(Book.id, BookStats.id)
+            .outerjoin(BookStats, Book.id == BookStats.id)
+            .filter(Book.id.in_(book_ids)),
+        )
+        existing = dict(result.all())
+        missing_book_ids = sorted(book_ids - existing.keys())
+
+        rows = []
+        increments: dict[int, dict] = {}
+        for review in reviews:
+            if review.book_id not in existing:
+                continue
+            rows.append(
+                {
+                    "book_id": review.book_id,
+                    "review_title": review.review_title,
+                    "review_details": review.review_details,
+                    "review_date": review.review_date,
+                    "rating_star": review.rating_star,
+                },
+            )
+            increment = increments.setdefault(
+                review.book_id,
+                {
+                    "book_id": review.book_id,
+                    "review_count": 0,
+                    "total_star": 0,
+                    **{f"star_{rating}": 0 for rating in range(1, 6)},
+                },
+            )
+            increment["review_count"] += 1
+            increment["total_star"] += review.rating_star
+            increment[f"star_{review.rating_star}"] += 1
+
+        if rows:
+            # Executemany: batched into multi-row INSERT statements
+            await db.execute(insert(Review), rows)
+
+        # Books without a book_stats row are created by the stats worker
+        unseeded = [book_id for book_id in increments if existing[book_id] is None]
+        await increment_review_stats(
+            db,
+            [inc for book_id, inc in increments.items() if existing[book_id]],
+        )
+        await db.commit()
+        if rows:
+            await run_backend(invalidate_featured_books)
+            # One version bump instead of a delete per touched book
+            await run_backend(invalidate_book_stats)
+            autocomplete_index.add_reviews(
+                {book_id: inc["review_count"] for book_id, inc in increments.items()},
+            )
+
+        if unseeded:
+            stats_worker.mark_dirty(unseeded)
+
+        return ReviewBulkResponse(
+            inserted=len(rows),
+            rejected=len(reviews) - len(rows),
+            missing_book_ids=missing_book_ids,
+        )
+
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error adding book reviews: {str(e)}",
+        )
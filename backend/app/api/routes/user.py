@@ -21,12 +21,13 @@ from app.core.auth import (
     verify_password,
     verify_token,
 )
-from app.core.db_config import get_db
+from app.core.db_config import get_async_db
 from app.db.user import User as UserModel
 from app.schemas.token import RefreshTokenRequest, Token
 from app.schemas.user import LoginUserRequest, RegisterUserRequest, UserInfoReturn
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
 
 # Set up logger for error tracking
 logger = logging.getLogger(__name__)
@@ -35,7 +36,10 @@ router = APIRouter(prefix="/user", tags=["user"])
 
 
 @router.post("/register", status_code=status.HTTP_201_CREATED)
-async def register_user(request: RegisterUserRequest, db: Session = Depends(get_db)):
+async def register_user(
+    request: RegisterUserRequest,
+    db: AsyncSession = Depends(get_async_db),
+):
     """
     Register a new user account with email and password.
 
@@ -44,7 +48,7 @@ async def register_user(request: RegisterUserRequest, db: Session = Depends(get_
 
     Args:
         request (RegisterUserRequest): User registration data including email, password, names
-        db (Session): Database session dependency
+        db (AsyncSession): Async database session dependency
 
     Returns:
         dict: Success message and authentication token
@@ -54,14 +58,18 @@ async def register_user(request: RegisterUserRequest, db: Session = Depends(get_
     """
     try:
         # Check if the user already exists
-        if get_user(db, request.email):
+        if await get_user(db, request.email):
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
                 detail="Email is already registered",
             )
 
         # Hash the password
-        hashed_password = get_password_hash(request.password)
+        # bcrypt is CPU bound; hash in the threadpool to keep the loop free
+        hashed_password = await run_in_threadpool(
+            get_password_hash,
+            request.password,
+        )
 
         # Create a new user
         new_user = UserModel(
@@ -73,8 +81,8 @@ async def register_user(request: RegisterUserRequest, db: Session = Depends(get_
         )
 
         db.add(new_user)
-        db.commit()
-        db.refresh(new_user)
+        await db.commit()
+        await db.refresh(new_user)
 
         # Create a public user model for the token data
         user_data = UserInfoReturn(
@@ -99,7 +107,7 @@ async def register_user(request: RegisterUserRequest, db: Session = Depends(get_
         raise
     except Exception as e:
         logger.error(f"Error during user registration: {str(e)}")
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to register user. Please try again later.",
@@ -107,7 +115,10 @@ async def register_user(request: RegisterUserRequest, db: Session = Depends(get_
 
 
 @router.post("/login", status_code=status.HTTP_200_OK)
-async def login_user(request: LoginUserRequest, db: Session = Depends(get_db)):
+async def login_user(
+    request: LoginUserRequest,
+    db: AsyncSession = Depends(get_async_db),
+):
     """
     Authenticate a user and provide access and refresh tokens.
 
@@ -116,7 +127,7 @@ async def login_user(request: LoginUserRequest, db: Session = Depends(get_db)):
 
     Args:
         request (LoginUserRequest): User login credentials (email, password)
-        db (Session): Database session dependency
+        db (AsyncSession): Async database session dependency
 
     Returns:
         dict: Success message, access token, refresh token, and user information
@@ -127,7 +138,7 @@ async def login_user(request: LoginUserRequest, db: Session = Depends(get_db)):
     """
     try:
         # Fetch user record (get_user returns UserInDB with 'hashed_password' field)
-        user = get_user(db, request.email)
+        user = await get_user(db, request.email)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -135,7 +146,11 @@ async def login_user(request: LoginUserRequest, db: Session = Depends(get_db)):
             )
 
         # Verify the plain password against the 'hashed_password' field from the UserInDB schema
-        if not verify_password(request.password, user.hashed_password):
+        if not await run_in_threadpool(
+            verify_password,
+            request.password,
+            user.hashed_password,
+        ):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect password",
@@ -176,7 +191,7 @@ async def login_user(request: LoginUserRequest, db: Session = Depends(get_db)):
 @router.post("/refresh-token", status_code=status.HTTP_200_OK, response_model=Token)
 async def refresh_access_token(
     request: RefreshTokenRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Generate a new access token using a valid refresh token.
@@ -186,7 +201,7 @@ async def refresh_access_token(
 
     Args:
         request (RefreshTokenRequest): Refresh token data
-        db (Session): Database session dependency
+        db (AsyncSession): Async database session dependency
 
     Returns:
         Token: New access token and token type
@@ -207,7 +222,7 @@ async def refresh_access_token(
             )
 
         # Get the user from the database
-        user = get_user(db, email)
+        user = await get_user(db, email)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -9,16 +9,18 @@ authentication for securing API endpoints.
 import os
 from datetime import datetime, timedelta
 
-from app.core.db_config import get_db
+from app.core.db_config import get_async_db
 from app.db.user import User as UserModel
 from app.schemas.token import TokenData
 from app.schemas.user import UserInDB, UserInfoReturn
 from dotenv import load_dotenv
 from fastapi import Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 # Load environment variables from ../.env
 dotenv_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), ".env")
@@ -68,12 +70,17 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
-def get_user(db: Session, email: str) -> UserInDB | None:
+def _user_query(email: str) -> Select:
+    """Return the query of the user with an email address."""
+    return select(UserModel).filter(UserModel.email == email)
+
+
+async def get_user(db: AsyncSession, email: str) -> UserInDB | None:
     """
     Retrieve a user from the database with sensitive information.
 
     Args:
-        db: Database session
+        db: Async database session
         email: User's email address to look up
 
     Returns:
@@ -83,7 +90,7 @@ def get_user(db: Session, email: str) -> UserInDB | None:
     Notes:
         Maps the database 'password' column to the 'hashed_password' field in the Pydantic model.
     """
-    user = db.query(UserModel).filter(UserModel.email == email).first()
+    user = await db.scalar(_user_query(email))
     if user:
         return UserInDB(
             id=user.id,
@@ -96,19 +103,19 @@ def get_user(db: Session, email: str) -> UserInDB | None:
     return None
 
 
-def get_public_user(db: Session, email: str) -> UserInfoReturn | None:
+async def get_public_user(db: AsyncSession, email: str) -> UserInfoReturn | None:
     """
     Retrieve a user with only public information.
 
     Args:
-        db: Database session
+        db: Async database session
         email: User's email address to look up
 
     Returns:
         UserInfoReturn: User object without sensitive data if found
         None: If no user is found with the given email
     """
-    user_in_db = get_user(db, email)
+    user_in_db = await get_user(db, email)
     if user_in_db:
         return UserInfoReturn(
             id=user_in_db.id,
@@ -120,12 +127,12 @@ def get_public_user(db: Session, email: str) -> UserInfoReturn | None:
     return None
 
 
-def authenticate_user(db: Session, email: str, password: str):
+async def authenticate_user(db: AsyncSession, email: str, password: str):
     """
     Authenticate a user with email and password.
 
     Args:
-        db: Database session
+        db: Async database session
         email: User's email address
         password: User's plain text password
 
@@ -133,10 +140,10 @@ def authenticate_user(db: Session, email: str, password: str):
         UserInDB: Complete user record if authentication succeeds
         False: If authentication fails (user not found or password incorrect)
     """
-    user = get_user(db, email)
+    user = await get_user(db, email)
     if not user:
         return False
-    if not verify_password(password, user.hashed_password):
+    if not await run_in_threadpool(verify_password, password, user.hashed_password):
         return False
     return user
 
@@ -238,14 +245,14 @@ def verify_token(token: str) -> dict:
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     FastAPI dependency that extracts the current user from a JWT token.
 
     Args:
         token: JWT access token (extracted from Authorization header)
-        db: Database session
+        db: Async database session
 
     Returns:
         UserInfoReturn: Current authenticated user without sensitive data
@@ -268,7 +275,7 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
 
-    user = get_public_user(db, token_data.email)
+    user = await get_public_user(db, token_data.email)
     if user is None:
         raise credentials_exception
     return user
@@ -0,0 +1,215 @@
+"""
+In-memory autocomplete over book titles and author names.
+
+Suggestions are answered from a sorted array of keys searched with bisect,
+without any database access. Every word position of a title or name gets a
+key ("the lord of the rings", "lord of the rings", ...), so typing any word
+of a title finds it. Matches are ranked by popularity: the review count of
+a book, and the summed review counts of an author's books.
+
+The index is built at application startup and rebuilt by the stats worker
+on its periodic full refresh; the API has no endpoints writing books or
+authors, so catalog changes (e.g. from dataseed.py) appear after the next
+rebuild. In between, review writes raise popularity. Results of one and two
+character prefixes, which match the largest key ranges, are memoized (one
+character prefixes already on build). New reviews only raise popularity, so
+they update the memoized results in place.
+"""
+
+import heapq
+import logging
+import threading
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.core.db_config import session_factory
+from app.core.search import search_terms
+from app.db.author import Author
+from app.db.book import Book
+from app.db.bookstats import BookStats
+from sqlalchemy import func
+
+logger = logging.getLogger(__name__)
+
+# Prefixes up to this length have their results memoized
+MEMOIZED_PREFIX_LENGTH = 2
+
+# Default number of suggestions returned
+SUGGESTION_LIMIT = 10
+
+# A suggestion is identified by its kind ("book" or "author") and id
+SuggestionRef = Tuple[str, int]
+
+
+@dataclass
+class Entry:
+    """
+    An indexed book or author.
+
+    Attributes:
+        kind: "book" or "author"
+        id: Book or author ID
+        label: Title or name as displayed
+        popularity: Review count used for ranking
+        author_id: Author of a book (None for authors)
+    """
+
+    kind: str
+    id: int
+    label: str
+    popularity: int = 0
+    author_id: Optional[int] = None
+
+
+def _rank(entry: Entry) -> Tuple[int, str, str]:
+    """Sort key of suggestions: most popular first, then alphabetical."""
+    return (-entry.popularity, entry.label, entry.kind)
+
+
+def _keys(label: str) -> List[str]:
+    """Return the keys of a label, one per word position."""
+    words = search_terms(label)
+    return [" ".join(words[i:]) for i in range(len(words))]
+
+
+class AutocompleteIndex:
+    """
+    Sorted-array prefix index returning the most popular matches.
+
+    _keys holds every key in sorted order and _refs the suggestion each key
+    belongs to, at the same position, so a prefix maps to one contiguous
+    slice found with two bisections. All access goes through a lock since
+    the stats worker thread rebuilds the index while requests read it.
+    """
+
+    def __init__(self):
+        self._keys: List[str] = []
+        self._refs: List[SuggestionRef] = []
+        self._entries: Dict[SuggestionRef, Entry] = {}
+        self._memo: Dict[Tuple[str, int], List[Entry]] = {}
+        self._lock = threading.Lock()
+
+    def build(self, entries: Iterable[Entry]) -> None:
+        """
+        Replace the whole index.
+
+        Args:
+            entries: Every book and author to index
+        """
+        entries = {(entry.kind, entry.id): entry for entry in entries}
+        pairs = sorted(
+            (key, ref) for ref, entry in entries.items() for key in _keys(entry.label)
+        )
+        with self._lock:
+            self._entries = entries
+            self._keys = [key for key, _ in pairs]
+            self._refs = [ref for _, ref in pairs]
+            self._memo.clear()
+
+        # Warm the memo for the widest ranges, off the request path
+        for first in sorted({key[0] for key, _ in pairs}):
+            self.suggest(first)
+
+    def _add_popularity(self, ref: SuggestionRef, delta: int) -> None:
+        entry = self._entries.get(ref)
+        if entry is not None:
+            entry.popularity += delta
+
+    def _promote(self, ref: SuggestionRef) -> None:
+        """Re-rank the memoized results matching an entry whose popularity rose."""
+        entry = self._entries.get(ref)
+        if entry is None:
+            return
+        keys = _keys(entry.label)
+        for (prefix, limit), result in self._memo.items():
+            if any(key.startswith(prefix) for key in keys):
+                candidates = [other for other in result if other is not entry]
+                ranked = sorted(candidates + [entry], key=_rank)
+                self._memo[(prefix, limit)] = ranked[:limit]
+
+    def add_reviews(self, counts: Dict[int, int]) -> None:
+        """
+        Raise the popularity of books (and their authors) after new reviews.
+
+        Args:
+            counts: Number of new reviews per book ID
+        """
+        with self._lock:
+            for book_id, count in counts.items():
+                book = self._entries.get(("book", book_id))
+                if book is None:
+                    continue
+                book.popularity += count
+                self._add_popularity(("author", book.author_id), count)
+                self._promote(("book", book_id))
+                self._promote(("author", book.author_id))
+
+    def suggest(self, text: str, limit: int = SUGGESTION_LIMIT) -> List[Entry]:
+        """
+        Return the most popular books and authors matching a typed prefix.
+
+        Args:
+            text: Text typed so far
+            limit: Maximum number of suggestions
+
+        Returns:
+            List[Entry]: Matches by descending popularity, then label
+        """
+        prefix = " ".join(search_terms(text))
+        if not prefix:
+            return []
+
+        with self._lock:
+            memo_key = (prefix, limit)
+            if memo_key in self._memo:
+                return self._memo[memo_key]
+
+            start = bisect_left(self._keys, prefix)
+            # Every key starting with the prefix sorts below prefix + U+FFFF
+            end = bisect_left(self._keys, prefix + "\uffff", lo=start)
+            matches = [self._entries[ref] for ref in set(self._refs[start:end])]
+            result = heapq.nsmallest(limit, matches, key=_rank)
+            if len(prefix) <= MEMOIZED_PREFIX_LENGTH:
+                self._memo[memo_key] = result
+        return result
+
+    def rebuild(self) -> None:
+        """Reload the whole index from the database."""
+        with session_factory() as session:
+            books = session.query(
+                Book.id,
+                Book.book_title,
+                Book.author_id,
+                func.coalesce(BookStats.review_count, 0),
+            ).outerjoin(BookStats, Book.id == BookStats.id)
+            entries = [
+                Entry("book", book_id, title, popularity, author_id)
+                for book_id, title, author_id, popularity in books
+            ]
+            author_popularity: Dict[int, int] = {}
+            for entry in entries:
+                author_popularity[entry.author_id] = (
+                    author_popularity.get(entry.author_id, 0) + entry.popularity
+                )
+            entries += [
+                Entry("author", author_id, name, author_popularity.get(author_id, 0))
+                for author_id, name in session.query(Author.id, Author.author_name)
+            ]
+        self.build(entries)
+
+
+autocomplete_index = AutocompleteIndex()
+
+
+def load_autocomplete() -> None:
+    """
+    Build the autocomplete index, called once at application startup.
+
+    A failure is logged rather than raised so the API can still start while
+    the database is unavailable; the stats worker rebuilds it later.
+    """
+    try:
+        autocomplete_index.rebuild()
+    except Exception as e:
+        logger.error(f"Building the autocomplete index failed: {str(e)}")
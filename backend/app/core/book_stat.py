@@ -6,120 +6,300 @@ including review counts, ratings, and pricing information. These
 statistics are used for book listings, sorting, and filtering.
 """
 
-from typing import List
+from datetime import date, timedelta
+from typing import List, Optional
 
 from app.db import BookStats
 from app.schemas.review import ReviewPostRequest
-from sqlalchemy import text
+from sqlalchemy import Float, bindparam, cast, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+# Set-based recompute of book_stats. The review aggregate and the active
+# discount lookup are each computed once with GROUP BY and applied with a
+# single upsert, so the cost does not grow with one round trip per book.
+# {review_filter} and {book_filter} are replaced with an "= ANY(:book_ids)"
+# restriction when only some books are refreshed. The book filter is always
+# a WHERE clause so that ON CONFLICT is not parsed as part of the last JOIN.
+RECOMPUTE_BOOK_STATS_SQL = """
+    INSERT INTO book_stats (
+        id, review_count, total_star, avg_rating, lowest_price, discount_amount,
+        star_1, star_2, star_3, star_4, star_5
+    )
+    SELECT b.id,
+           COALESCE(r.review_count, 0),
+           COALESCE(r.total_star, 0),
+           COALESCE(r.avg_rating, 0),
+           COALESCE(d.discount_price, b.book_price),
+           GREATEST(b.book_price - COALESCE(d.discount_price, b.book_price), 0),
+           COALESCE(r.star_1, 0),
+           COALESCE(r.star_2, 0),
+           COALESCE(r.star_3, 0),
+           COALESCE(r.star_4, 0),
+           COALESCE(r.star_5, 0)
+    FROM book b
+    LEFT JOIN (
+        SELECT book_id,
+               COUNT(id) AS review_count,
+               SUM(rating_star) AS total_star,
+               AVG(rating_star) AS avg_rating,
+               COUNT(id) FILTER (WHERE rating_star = 1) AS star_1,
+               COUNT(id) FILTER (WHERE rating_star = 2) AS star_2,
+               COUNT(id) FILTER (WHERE rating_star = 3) AS star_3,
+               COUNT(id) FILTER (WHERE rating_star = 4) AS star_4,
+               COUNT(id) FILTER (WHERE rating_star = 5) AS star_5
+        FROM review
+        {review_filter}
+        GROUP BY book_id
+    ) r ON r.book_id = b.id
+    LEFT JOIN (
+        SELECT book_id, MIN(discount_price) AS discount_price
+        FROM discount
+        WHERE CURRENT_DATE BETWEEN discount_start_date AND discount_end_date
+        GROUP BY book_id
+    ) d ON d.book_id = b.id
+    {book_filter}
+    ON CONFLICT (id) DO UPDATE
+    SET review_count = EXCLUDED.review_count,
+        total_star = EXCLUDED.total_star,
+        avg_rating = EXCLUDED.avg_rating,
+        lowest_price = EXCLUDED.lowest_price,
+        discount_amount = EXCLUDED.discount_amount,
+        star_1 = EXCLUDED.star_1,
+        star_2 = EXCLUDED.star_2,
+        star_3 = EXCLUDED.star_3,
+        star_4 = EXCLUDED.star_4,
+        star_5 = EXCLUDED.star_5
+    WHERE (
+        book_stats.review_count,
+        book_stats.total_star,
+        book_stats.avg_rating,
+        book_stats.lowest_price,
+        book_stats.discount_amount,
+        book_stats.star_1,
+        book_stats.star_2,
+        book_stats.star_3,
+        book_stats.star_4,
+        book_stats.star_5
+    ) IS DISTINCT FROM (
+        EXCLUDED.review_count,
+        EXCLUDED.total_star,
+        EXCLUDED.avg_rating,
+        EXCLUDED.lowest_price,
+        EXCLUDED.discount_amount,
+        EXCLUDED.star_1,
+        EXCLUDED.star_2,
+        EXCLUDED.star_3,
+        EXCLUDED.star_4,
+        EXCLUDED.star_5
+    )
+"""
 
-async def update_book_stats(db: Session, book_ids: List[int]):
+
+def recompute_book_stats(db: Session, book_ids: Optional[List[int]] = None) -> int:
     """
-    Update statistics for specified books in the BookStats table.
+    Recompute statistics for a set of books, or for every book, in bulk.
 
-    Calculates and updates the following statistics for each book:
+    Calculates the following statistics with one grouped aggregate over
+    reviews and active discounts, then upserts them into BookStats:
     - review_count: Total number of reviews
     - total_star: Sum of all ratings
     - avg_rating: Average rating (total_star / review_count)
     - lowest_price: Current lowest price (considering discounts)
+    - discount_amount: Book price minus lowest_price
+    - star_1 .. star_5: Number of reviews per star rating
+
+    Missing BookStats rows are created and rows whose values did not
+    change are left untouched. This is a write operation and must not be
+    called from read endpoints; it is run by the background stats worker
+    (see app.core.stats_worker), the recompute_book_stats.py script and
+    dataseed.py.
 
     Args:
         db: Database session
-        book_ids: List of book IDs to update statistics for
+        book_ids: IDs of the books to refresh, or None to refresh all books
+
+    Returns:
+        int: Number of BookStats rows inserted or changed
 
     Raises:
         Exception: If there's an error updating book statistics
     """
-    try:
-        for book_id in book_ids:
-            # Get review statistics
-            review_query = text("""
-                SELECT COUNT(id) as review_count,
-                COALESCE(SUM(rating_star), 0) as total_star,
-                CASE
-                    WHEN COUNT(id) > 0 THEN COALESCE(AVG(rating_star), 0)
-                    ELSE 0
-                END as avg_rating
-                FROM review WHERE book_id = :book_id
-            """)
-            review_stats = db.execute(review_query, {"book_id": book_id}).fetchone()
-
-            # Get current lowest price (either discount price or regular price)
-            price_query = text("""
-                SELECT
-                    CASE
-                        WHEN d.discount_price IS NOT NULL THEN d.discount_price
-                        ELSE b.book_price
-                    END as lowest_price
-                FROM book b
-                LEFT JOIN discount d ON b.id = d.book_id
-                AND CURRENT_DATE BETWEEN d.discount_start_date AND d.discount_end_date
-                WHERE b.id = :book_id
-                ORDER BY lowest_price ASC
-                LIMIT 1
-            """)
-            price_result = db.execute(price_query, {"book_id": book_id}).fetchone()
-
-            # Update book stats
-            update_query = text("""
-                UPDATE book_stats
-                SET review_count = :review_count,
-                    total_star = :total_star,
-                    avg_rating = :avg_rating,
-                    lowest_price = :lowest_price
-                WHERE id = :book_id
-            """)
-
-            db.execute(
-                update_query,
-                {
-                    "book_id": book_id,
-                    "review_count": review_stats.review_count,
-                    "total_star": review_stats.total_star,
-                    "avg_rating": review_stats.avg_rating,
-                    "lowest_price": price_result.lowest_price,
-                },
-            )
+    if book_ids is not None and not book_ids:
+        return 0
+
+    if book_ids is None:
+        query = text(
+            RECOMPUTE_BOOK_STATS_SQL.format(review_filter="", book_filter="WHERE TRUE"),
+        )
+        params = {}
+    else:
+        query = text(
+            RECOMPUTE_BOOK_STATS_SQL.format(
+                review_filter="WHERE book_id = ANY(:book_ids)",
+                book_filter="WHERE b.id = ANY(:book_ids)",
+            ),
+        )
+        params = {"book_ids": list(book_ids)}
 
+    try:
+        result = db.execute(query, params)
         db.commit()
+        return result.rowcount
     except Exception as e:
         db.rollback()
         raise Exception(f"Failed to update book stats: {str(e)}")
 
 
-async def refresh_review_stats(db: Session, review: ReviewPostRequest) -> None:
+# Refresh lowest_price and discount_amount only for books whose discount
+# window opens on :day or closed on the previous day. Sorting by price and
+# by discount stays correct across date boundaries without touching books
+# whose price did not change.
+DISCOUNT_ROLLOVER_SQL = text("""
+    WITH boundary_books AS (
+        SELECT DISTINCT book_id
+        FROM discount
+        WHERE discount_start_date = :day
+           OR discount_end_date = :previous_day
+    ),
+    active_discounts AS (
+        SELECT d.book_id, MIN(d.discount_price) AS discount_price
+        FROM discount d
+        JOIN boundary_books bb ON bb.book_id = d.book_id
+        WHERE :day BETWEEN d.discount_start_date AND d.discount_end_date
+        GROUP BY d.book_id
+    )
+    UPDATE book_stats s
+    SET lowest_price = COALESCE(ad.discount_price, b.book_price),
+        discount_amount = GREATEST(
+            b.book_price - COALESCE(ad.discount_price, b.book_price), 0
+        )
+    FROM boundary_books bb
+    JOIN book b ON b.id = bb.book_id
+    LEFT JOIN active_discounts ad ON ad.book_id = b.id
+    WHERE s.id = bb.book_id
+      AND s.lowest_price IS DISTINCT FROM COALESCE(ad.discount_price, b.book_price)
+""")
+
+
+def refresh_discount_rollover(db: Session, day: Optional[date] = None) -> int:
     """
-    Update book review statistics when a new review is added.
+    Refresh prices for books whose discounts start or expire on a day.
 
-    This function is more optimized than update_book_stats as it
-    incrementally updates the statistics without re-querying all reviews.
+    Intended to run once right after midnight: discounts whose
+    discount_start_date is today become active and discounts whose
+    discount_end_date was yesterday stop applying, so only those books
+    can have a different lowest price than they had the day before.
 
     Args:
         db: Database session
-        review: The new review being added
+        day: The day to roll over to (defaults to today)
 
-    Note:
-        This function commits the database transaction.
+    Returns:
+        int: Number of BookStats rows whose lowest_price changed
+
+    Raises:
+        Exception: If there's an error updating book statistics
+    """
+    day = day or date.today()
+    try:
+        result = db.execute(
+            DISCOUNT_ROLLOVER_SQL,
+            {"day": day, "previous_day": day - timedelta(days=1)},
+        )
+        db.commit()
+        return result.rowcount
+    except Exception as e:
+        db.rollback()
+        raise Exception(f"Failed to roll over discount prices: {str(e)}")
+
+
+def _review_increment_statement():
+    """
+    Build the UPDATE that adds review counts to a book_stats row in place.
+
+    All arithmetic happens in the database (review_count = review_count + n),
+    so concurrent review inserts cannot overwrite each other's increments.
+    The statement uses bind parameters so it can be executed once per book
+    or as an executemany over many books.
     """
-    book_id = review.book_id
-    stats = (
-        db.query(BookStats.review_count, BookStats.total_star)
-        .filter(BookStats.id == book_id)
-        .first()
+    stats = BookStats.__table__.c
+    review_count = bindparam("inc_review_count")
+    total_star = bindparam("inc_total_star")
+    values = {
+        "review_count": stats.review_count + review_count,
+        "total_star": stats.total_star + total_star,
+        "avg_rating": cast(stats.total_star + total_star, Float)
+        / (stats.review_count + review_count),
+    }
+    for rating in range(1, 6):
+        column = stats[f"star_{rating}"]
+        values[f"star_{rating}"] = column + bindparam(f"inc_star_{rating}")
+
+    # Core table update: executemany over plain rows, no ORM synchronization
+    return (
+        update(BookStats.__table__)
+        .where(stats.id == bindparam("stats_book_id"))
+        .values(**values)
     )
-    review_count, total_star = stats if stats else (0, 0)
 
-    review_count += 1
-    total_star += review.rating_star
-    avg_rating = total_star / review_count
 
-    db.query(BookStats).filter(BookStats.id == book_id).update(
+async def increment_review_stats(db: AsyncSession, increments: List[dict]) -> int:
+    """
+    Apply grouped review increments to book_stats without committing.
+
+    Args:
+        db: Async database session (the caller commits together with the reviews)
+        increments: One dict per book with keys book_id, review_count,
+            total_star and star_1 .. star_5
+
+    Returns:
+        int: Number of book_stats rows updated
+    """
+    if not increments:
+        return 0
+
+    params = [
         {
-            BookStats.review_count: review_count,
-            BookStats.total_star: total_star,
-            BookStats.avg_rating: avg_rating,
-        },
-    )
+            "stats_book_id": increment["book_id"],
+            "inc_review_count": increment["review_count"],
+            "inc_total_star": increment["total_star"],
+            **{
+                f"inc_star_{rating}": increment.get(f"star_{rating}", 0)
+                for rating in range(1, 6)
+            },
+        }
+        for increment in increments
+    ]
+    statement = _review_increment_statement()
+    if len(params) == 1:
+        return (await db.execute(statement, params[0])).rowcount
+    await db.execute(statement, params)
+    return len(params)
 
-    db.commit()
+
+async def refresh_review_stats(db: AsyncSession, review: ReviewPostRequest) -> bool:
+    """
+    Update book review statistics when a new review is added.
+
+    This function is cheaper than recompute_book_stats as it increments
+    the statistics with a single atomic UPDATE without re-querying reviews.
+
+    Args:
+        db: Async database session
+        review: The new review being added
+
+    Returns:
+        bool: False if the book has no book_stats row yet
+
+    Note:
+        This function does not commit; the caller commits it in the same
+        transaction as the review insert.
+    """
+    increment = {
+        "book_id": review.book_id,
+        "review_count": 1,
+        "total_star": review.rating_star,
+        f"star_{review.rating_star}": 1,
+    }
+    return await increment_review_stats(db, [increment]) > 0
@@ -0,0 +1,620 @@
+"""
+Shared response cache with pluggable backends.
+
+Catalog reads that are the same for every visitor (featured widgets, author
+and category lists, book details and review statistics) keep their serialized JSON in
+a cache so repeated requests are answered without a database round trip.
+
+Two backends are available, selected with CACHE_URL:
+- local:// (default): an in-process LRU, private to each worker process
+- redis://[:password@]host[:port][/db]: any server speaking the Redis
+  protocol, shared by every worker so the cache is warmed and invalidated once
+
+Keys are grouped in namespaces. Each namespace has a version counter stored
+in the backend and embedded in every key, so invalidating a namespace is a
+single INCR and entries of older versions simply expire. Deleting a single
+key works the same way with a per-key generation counter, so a load that
+was already running when the key was deleted stores its stale value under
+the old generation, where no lookup finds it. Concurrent misses for the
+same key inside a process are collapsed into a single load (single-flight),
+and per-namespace hit/miss counters are kept for the metrics endpoint.
+
+Cached entries carry an ETag computed when they are filled, so responses
+can be revalidated by browsers and proxies with If-None-Match (304 Not
+Modified) without sending the body again.
+"""
+
+import asyncio
+import hashlib
+import inspect
+import logging
+import os
+import queue
+import socket
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, Union
+from urllib.parse import unquote, urlparse
+
+from fastapi import Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response
+
+logger = logging.getLogger(__name__)
+
+# Backend URL: local:// for an in-process LRU or redis://host:port/db
+CACHE_URL = os.getenv("CACHE_URL", "local://")
+# Prefix of every key, so several deployments can share one Redis database
+CACHE_KEY_PREFIX = os.getenv("CACHE_KEY_PREFIX", "app")
+# Maximum number of entries kept by the local backend
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "10000"))
+# Socket timeout for the Redis backend, in seconds
+CACHE_TIMEOUT_SECONDS = float(os.getenv("CACHE_TIMEOUT_SECONDS", "0.5"))
+# Seconds a cached featured widget stays fresh without an invalidation
+FEATURED_CACHE_TTL_SECONDS = float(os.getenv("FEATURED_CACHE_TTL_SECONDS", "60"))
+# Seconds author and category lists stay fresh without an invalidation
+CATALOG_CACHE_TTL_SECONDS = float(os.getenv("CATALOG_CACHE_TTL_SECONDS", "300"))
+# Seconds book details and review statistics stay fresh without an invalidation
+BOOK_CACHE_TTL_SECONDS = float(os.getenv("BOOK_CACHE_TTL_SECONDS", "300"))
+# Seconds browsers and proxies may reuse author and category lists
+CATALOG_HTTP_MAX_AGE = int(os.getenv("CATALOG_HTTP_MAX_AGE", "300"))
+
+Loader = Callable[[], Union[Any, Awaitable[Any]]]
+
+
+class CacheError(Exception):
+    """Raised when a cache backend cannot complete a command."""
+
+
+class CacheBackend(ABC):
+    """
+    Interface of a cache backend storing bytes values with a TTL.
+
+    Backends must be safe to call from the event loop and from background
+    threads (the stats worker invalidates namespaces from its own thread).
+
+    Attributes:
+        blocking: Whether commands wait on the network, in which case callers
+            on the event loop run them in the threadpool (see run_backend())
+    """
+
+    blocking = False
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the value stored at key, or None if missing or expired."""
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        """Store value at key for ttl seconds."""
+
+    @abstractmethod
+    def add(self, key: str, value: bytes, ttl: float) -> bool:
+        """Store value at key for ttl seconds unless key exists; True if stored."""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove key if it exists."""
+
+    @abstractmethod
+    def incr(self, key: str) -> int:
+        """Atomically increment the counter at key and return the new value."""
+
+
+class LocalCacheBackend(CacheBackend):
+    """
+    In-process LRU cache with per-entry expiry.
+
+    Counters (namespace versions and key generations) are kept apart from
+    the LRU so they are never evicted; evicting one would make old entries
+    visible again.
+    """
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, Tuple[float, bytes]] = OrderedDict()
+        self._counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            if key in self._counters:
+                return str(self._counters[key]).encode()
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def add(self, key: str, value: bytes, ttl: float) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                return False
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return True
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+            self._counters.pop(key, None)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Minimal client for servers speaking the Redis protocol (RESP2).
+
+    Only the commands the cache needs are implemented (GET, SET PX [NX],
+    DEL, INCR). Connections are blocking sockets kept in a small pool, so the
+    same client serves the stats worker thread and the routes; calls made
+    from the event loop go through the threadpool (blocking = True), never
+    stalling other requests for a round trip or a timeout. A connection that
+    fails mid-command is discarded instead of being reused.
+    """
+
+    blocking = True
+
+    def __init__(
+        self,
+        url: str,
+        timeout: float = CACHE_TIMEOUT_SECONDS,
+        max_idle_connections: int = 10,
+    ):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = unquote(parsed.password) if parsed.password else None
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.timeout = timeout
+        self._idle: queue.LifoQueue = queue.LifoQueue(maxsize=max_idle_connections)
+
+    def _connect(self) -> Tuple[socket.socket, Any]:
+        sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        connection = (sock, sock.makefile("rb"))
+        if self.password:
+            self._send(connection, "AUTH", self.password)
+        if self.db:
+            self._send(connection, "SELECT", self.db)
+        return connection
+
+    @staticmethod
+    def _encode(*args: Union[str, bytes, int, float]) -> bytes:
+        parts = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            if not isinstance(arg, bytes):
+                arg = str(arg).encode()
+            parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+        return b"".join(parts)
+
+    def _read_reply(self, reader) -> Any:
+        line = reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise ConnectionError("Connection closed by cache server")
+        prefix, payload = line[:1], line[1:-2]
+        if prefix == b"+":
+            return payload.decode()
+        if prefix == b"-":
+            raise CacheError(payload.decode())
+        if prefix == b":":
+            return int(payload)
+        if prefix == b"$":
+            length = int(payload)
+            if length < 0:
+                return None
+            data = reader.read(length + 2)
+            if len(data) != length + 2:
+                raise ConnectionError("Connection closed by cache server")
+            return data[:-2]
+        if prefix == b"*":
+            length = int(payload)
+            if length < 0:
+                return None
+            return [self._read_reply(reader) for _ in range(length)]
+        raise ConnectionError(f"Unexpected reply from cache server: {line!r}")
+
+    def _send(self, connection, *args) -> Any:
+        sock, reader = connection
+        sock.sendall(self._encode(*args))
+        return self._read_reply(reader)
+
+    def _command(self, *args) -> Any:
+        try:
+            connection = self._idle.get_nowait()
+        except queue.Empty:
+            connection = None
+
+        try:
+            if connection is None:
+                connection = self._connect()
+            reply = self._send(connection, *args)
+        except CacheError:
+            # Error reply: the connection itself is still usable
+            if connection is not None:
+                self._release(connection)
+            raise
+        except (OSError, ValueError) as e:
+            if connection is not None:
+                connection[0].close()
+            raise CacheError(f"Cache server unavailable: {str(e)}")
+
+        self._release(connection)
+        return reply
+
+    def _release(self, connection) -> None:
+        try:
+            self._idle.put_nowait(connection)
+        except queue.Full:
+            connection[0].close()
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._command("GET", key)
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        self._command("SET", key, value, "PX", max(int(ttl * 1000), 1))
+
+    def add(self, key: str, value: bytes, ttl: float) -> bool:
+        reply = self._command("SET", key, value, "PX", max(int(ttl * 1000), 1), "NX")
+        return reply is not None
+
+    def delete(self, key: str) -> None:
+        self._command("DEL", key)
+
+    def incr(self, key: str) -> int:
+        return self._command("INCR", key)
+
+
+def create_backend(url: str = CACHE_URL) -> CacheBackend:
+    """
+    Create the cache backend described by a URL.
+
+    Args:
+        url: local:// or redis://[:password@]host[:port][/db]
+
+    Returns:
+        CacheBackend: Configured backend
+
+    Raises:
+        ValueError: If the URL scheme is not supported
+    """
+    scheme = urlparse(url).scheme
+    if scheme in ("", "local"):
+        return LocalCacheBackend()
+    if scheme == "redis":
+        return RedisCacheBackend(url)
+    raise ValueError(f"Unsupported CACHE_URL scheme: {scheme}")
+
+
+class CacheMetrics:
+    """Thread-safe hit, miss and error counters per namespace."""
+
+    def __init__(self):
+        self._counters: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, namespace: str, event: str) -> None:
+        with self._lock:
+            counters = self._counters.setdefault(
+                namespace,
+                {"hits": 0, "misses": 0, "errors": 0},
+            )
+            counters[event] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Return the counters of every namespace with its hit ratio.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Counters keyed by namespace name
+        """
+        with self._lock:
+            snapshot = {}
+            for namespace, counters in self._counters.items():
+                lookups = counters["hits"] + counters["misses"]
+                snapshot[namespace] = {
+                    **counters,
+                    "hit_ratio": round(counters["hits"] / lookups, 4)
+                    if lookups
+                    else 0.0,
+                }
+            return snapshot
+
+
+class _Flight:
+    """A load in progress for one key and the number of requests waiting on it."""
+
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.waiters = 0
+
+
+class CacheNamespace:
+    """
+    A group of cache keys sharing a TTL and a version counter.
+
+    Backend failures never fail a request: a failed lookup counts as an
+    error and falls through to the loader, and a failed invalidation is
+    logged (the TTL bounds how long the stale entry can live).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        ttl: float,
+        backend: Optional[CacheBackend] = None,
+        metrics: Optional[CacheMetrics] = None,
+    ):
+        self.name = name
+        self.ttl = ttl
+        self.backend = backend or cache_backend
+        self.metrics = metrics or cache_metrics
+        self._flights: Dict[str, _Flight] = {}
+
+    @property
+    def _version_key(self) -> str:
+        return f"{CACHE_KEY_PREFIX}:{self.name}:version"
+
+    def version(self) -> int:
+        """
+        Return the current version of the namespace.
+
+        Raises:
+            CacheError: If the backend cannot be reached
+        """
+        version = self.backend.get(self._version_key)
+        return int(version) if version is not None else 0
+
+    def _generation_key(self, key: str) -> str:
+        return f"{CACHE_KEY_PREFIX}:{self.name}:generation:{key}"
+
+    def _key(self, key: str) -> str:
+        """
+        Return the backend key of a key for the current version and generation.
+
+        Raises:
+            CacheError: If the backend cannot be reached
+        """
+        generation = self.backend.get(self._generation_key(key))
+        generation = int(generation) if generation is not None else 0
+        return f"{CACHE_KEY_PREFIX}:{self.name}:v{self.version()}:g{generation}:{key}"
+
+    async def get_or_load(self, key: str, loader: Loader) -> bytes:
+        """
+        Return the cached value for a key, loading it once on a miss.
+
+        Requests that miss while another request of this process is already
+        loading the same key wait for that load instead of querying the
+        database themselves.
+
+        Args:
+            key: Key inside the namespace
+            loader: Function (sync or async) that produces the response model
+                to cache; it is serialized with serialize_response()
+
+        Returns:
+            bytes: Cached or freshly loaded value
+        """
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = self._flights[key] = _Flight()
+        flight.waiters += 1
+        try:
+            async with flight.lock:
+                return await self._lookup_or_load(key, loader)
+        finally:
+            flight.waiters -= 1
+            if not flight.waiters:
+                self._flights.pop(key, None)
+
+    def _lookup(self, key: str) -> Tuple[str, Optional[bytes]]:
+        full_key = self._key(key)
+        return full_key, self.backend.get(full_key)
+
+    async def _lookup_or_load(self, key: str, loader: Loader) -> bytes:
+        full_key = None
+        try:
+            full_key, value = await run_backend(self._lookup, key, backend=self.backend)
+        except CacheError as e:
+            logger.warning(f"Cache lookup failed for {self.name}: {str(e)}")
+            self.metrics.record(self.name, "errors")
+            value = None
+
+        if value is not None:
+            self.metrics.record(self.name, "hits")
+            return value
+        self.metrics.record(self.name, "misses")
+
+        model = loader()
+        if inspect.isawaitable(model):
+            model = await model
+        value = serialize_response(model)
+
+        # Stored under the version and generation read before loading: if the
+        # namespace was invalidated or the key deleted meanwhile, the entry
+        # lands under an obsolete key that no lookup reads
+        if full_key is not None:
+            try:
+                await run_backend(
+                    self.backend.set,
+                    full_key,
+                    value,
+                    self.ttl,
+                    backend=self.backend,
+                )
+            except CacheError as e:
+                logger.warning(f"Cache store failed for {self.name}: {str(e)}")
+                self.metrics.record(self.name, "errors")
+        return value
+
+    def delete(self, key: str) -> None:
+        """
+        Invalidate one key by bumping its generation.
+
+        The generation counter of a deleted key is kept (it is one small
+        counter per key, e.g. per book), since dropping it would make an
+        entry stored under an older generation visible again.
+
+        Args:
+            key: Key inside the namespace
+        """
+        try:
+            self.backend.incr(self._generation_key(key))
+        except CacheError as e:
+            logger.warning(f"Cache delete failed for {self.name}: {str(e)}")
+            self.metrics.record(self.name, "errors")
+
+    def invalidate(self) -> None:
+        """Invalidate every key of the namespace by bumping its version."""
+        try:
+            self.backend.incr(self._version_key)
+        except CacheError as e:
+            logger.warning(f"Cache invalidation failed for {self.name}: {str(e)}")
+            self.metrics.record(self.name, "errors")
+
+
+async def run_backend(
+    function: Callable,
+    *args: Any,
+    backend: Optional[CacheBackend] = None,
+) -> Any:
+    """
+    Call a function using a cache backend from the event loop.
+
+    The call runs in the threadpool when the backend blocks on the network,
+    and inline otherwise (the local backend only takes a lock).
+
+    Args:
+        function: Function issuing backend commands, e.g. invalidate_book_stats
+        *args: Arguments of the function
+        backend: Backend used by the function (default: the shared backend)
+
+    Returns:
+        Any: Return value of the function
+    """
+    if (backend or cache_backend).blocking:
+        return await run_in_threadpool(function, *args)
+    return function(*args)
+
+
+def serialize_response(model: Any) -> bytes:
+    """
+    Serialize a response model once, for caching, together with its ETag.
+
+    The ETag is a digest of the JSON body computed when the cache is filled,
+    so it changes exactly when the content changes and costs nothing to
+    produce on a hit.
+
+    Args:
+        model: Response model (or list of models) returned by a route
+
+    Returns:
+        bytes: Quoted ETag, a newline, then the JSON encoded body
+    """
+    body = JSONResponse(content=jsonable_encoder(model)).body
+    digest = hashlib.blake2b(body, digest_size=12).hexdigest()
+    return f'"{digest}"'.encode() + b"\n" + body
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag."""
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def cached_json(entry: bytes, request: Request, max_age: int = 0) -> Response:
+    """
+    Build the response for a cached entry, honoring If-None-Match.
+
+    Args:
+        entry: Cached value produced by serialize_response()
+        request: Incoming request, for its If-None-Match header
+        max_age: Seconds browsers and proxies may reuse the response without
+            revalidating; 0 makes them revalidate with the ETag every time
+
+    Returns:
+        Response: 304 Not Modified when the client copy is current,
+            otherwise the application/json body
+    """
+    etag, _, body = entry.partition(b"\n")
+    etag = etag.decode()
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={max_age}" if max_age else "no-cache",
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+# Shared backend and metrics used by every namespace of this process
+cache_backend = create_backend()
+cache_metrics = CacheMetrics()
+
+# Homepage widgets (books on sale, recommended and popular books)
+featured_cache = CacheNamespace("featured", FEATURED_CACHE_TTL_SECONDS)
+# Author and category lists used by the shop filter sidebar. Their content
+# is held by app.core.snapshots; only the version counters live here.
+author_cache = CacheNamespace("author", CATALOG_CACHE_TTL_SECONDS)
+category_cache = CacheNamespace("category", CATALOG_CACHE_TTL_SECONDS)
+# Book details and review statistics per book, keyed by book ID
+book_cache = CacheNamespace("book", BOOK_CACHE_TTL_SECONDS)
+review_stats_cache = CacheNamespace("review_stats", BOOK_CACHE_TTL_SECONDS)
+
+
+def invalidate_featured_books() -> None:
+    """
+    Invalidate the cached featured widgets.
+
+    Called after review writes (ratings and review counts change) and after
+    the stats worker reprices discounts or recomputes statistics.
+    """
+    featured_cache.invalidate()
+
+
+def invalidate_book_stats(book_ids: Optional[list] = None) -> None:
+    """
+    Invalidate cached book details and review statistics.
+
+    Both are derived from book_stats, so they are invalidated together
+    after review writes and after the stats worker changes statistics.
+
+    Args:
+        book_ids: Books whose statistics changed, or None for every book
+    """
+    for namespace in (book_cache, review_stats_cache):
+        if book_ids is None:
+            namespace.invalidate()
+            continue
+        for book_id in book_ids:
+            namespace.delete(str(book_id))
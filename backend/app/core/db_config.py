@@ -1,48 +1,299 @@
 """
 Database configuration module for SQLAlchemy connection.
 
-This module configures the SQLAlchemy database engine, connection pool,
-and session factory. It provides a dependency for FastAPI to manage
-database sessions throughout request-response lifecycle.
+This module configures the SQLAlchemy database engines, connection pools,
+and session factories. API routes use the asyncio engine (asyncpg) through
+the get_async_db dependency so a slow query never blocks the event loop.
+The synchronous engine is kept for scripts, migrations and the background
+stats worker, which run outside the event loop.
+
+Pool sizes, timeouts, statement timeout, SQL echo and PgBouncer mode come
+from app.core.settings. Both pools are instrumented so checkout counts and
+wait times can be read from the metrics API when sizing pools per worker.
+
+When read replicas are configured (DATABASE_REPLICA_URLS), read-only routes
+use the get_read_db dependency, which spreads requests over the replicas
+round-robin. A replica that cannot be reached is skipped for
+DB_REPLICA_RETRY_SECONDS and the primary serves the read if none is available.
+After a successful write the client gets the READ_PRIMARY_COOKIE cookie for
+DB_REPLICA_STICKY_SECONDS, and its reads stay on the primary until it
+expires, so a client always sees its own writes despite replication lag.
 """
 
-import os
+import itertools
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Type
+from uuid import uuid4
 
-from dotenv import load_dotenv
-from sqlalchemy import create_engine
+from app.core.settings import DatabaseSettings, database_settings
+from sqlalchemy import create_engine, exc
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, Pool, QueuePool
+from starlette.requests import Request
+from starlette.responses import Response
 
-# Load environment variables from the .env file in the root directory
-load_dotenv(
-    dotenv_path=os.path.join(
-        os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
-        ".env",
-    ),
-)
+logger = logging.getLogger(__name__)
+
+# Cookie that pins a client's reads to the primary after a write
+READ_PRIMARY_COOKIE = "db_read_primary"
+
+
+class PoolMetrics:
+    """
+    Checkout counters and wait times of one connection pool.
+
+    The wait time is the time a request spends getting a connection from the
+    pool, including opening a new one. A growing average or any timeouts mean
+    the pool is too small for the number of concurrent requests per worker.
+    """
+
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, wait: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_total += wait
+            self.wait_max = max(self.wait_max, wait)
+
+    def snapshot(self, pool: Pool) -> Dict[str, Any]:
+        """
+        Return the counters together with the current state of the pool.
+
+        Args:
+            pool: The pool these metrics belong to
+
+        Returns:
+            Dict[str, Any]: Counters, wait times in milliseconds and pool gauges
+        """
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            snapshot = {
+                "pool": type(pool).__name__,
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_avg_ms": round(self.wait_total / attempts * 1000, 3)
+                if attempts
+                else 0.0,
+                "wait_max_ms": round(self.wait_max * 1000, 3),
+            }
+        if isinstance(pool, QueuePool):
+            snapshot.update(
+                size=pool.size(),
+                checked_in=pool.checkedin(),
+                checked_out=pool.checkedout(),
+                overflow=pool.overflow(),
+            )
+        return snapshot
+
+
+def _measured_pool(pool_class: Type[Pool], metrics: PoolMetrics) -> Type[Pool]:
+    """Subclass a pool class so that every checkout is timed into metrics."""
+
+    class MeasuredPool(pool_class):
+        def _do_get(self):
+            started = time.perf_counter()
+            try:
+                connection = super()._do_get()
+            except exc.TimeoutError:
+                metrics.record(time.perf_counter() - started, timed_out=True)
+                raise
+            metrics.record(time.perf_counter() - started)
+            return connection
+
+    MeasuredPool.__name__ = pool_class.__name__
+    return MeasuredPool
+
+
+def _engine_options(
+    settings: DatabaseSettings,
+    pool_class: Type[Pool],
+    metrics: PoolMetrics,
+    connect_args: Dict[str, Any],
+) -> Dict[str, Any]:
+    """Build the create_engine() keyword arguments shared by both engines."""
+    options = {
+        "echo": settings.echo,
+        "pool_pre_ping": settings.pool_pre_ping,
+        "connect_args": connect_args,
+    }
+    if settings.pgbouncer:
+        # PgBouncer owns the pooling; every checkout opens a client connection
+        options["poolclass"] = _measured_pool(NullPool, metrics)
+    else:
+        options.update(
+            poolclass=_measured_pool(pool_class, metrics),
+            pool_size=settings.pool_size,
+            max_overflow=settings.max_overflow,
+            pool_timeout=settings.pool_timeout,
+            pool_recycle=settings.pool_recycle,
+        )
+    return options
 
-# Validate database URL
-DATABASE_URL = os.getenv("DATABASE_URL")
-if not DATABASE_URL:
-    raise ValueError(
-        f"DATABASE_URL not found! Current working directory: {os.getcwd()}",
-    )
 
+def _sync_connect_args(settings: DatabaseSettings) -> Dict[str, Any]:
+    if settings.statement_timeout_ms and not settings.pgbouncer:
+        return {"options": f"-c statement_timeout={settings.statement_timeout_ms}"}
+    return {}
 
-if not DATABASE_URL.startswith("postgresql://"):
-    raise ValueError("Invalid database URL format. Use postgresql://")
 
-# Configure sync engine with connection pool settings for optimal performance
+def _async_connect_args(
+    settings: DatabaseSettings,
+    url: Optional[str] = None,
+) -> Dict[str, Any]:
+    url = url or settings.resolved_async_database_url
+    if not url.startswith("postgresql+asyncpg://"):
+        # Connection parameters below are asyncpg specific (e.g. SQLite stand-ins)
+        return {}
+    if settings.pgbouncer:
+        # Transaction pooling may switch server connections between statements,
+        # so prepared statements must be disabled and never reuse a name
+        return {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        }
+    if settings.statement_timeout_ms:
+        return {
+            "server_settings": {
+                "statement_timeout": str(settings.statement_timeout_ms),
+            },
+        }
+    return {}
+
+
+# Checkout metrics per engine, exposed by the metrics API
+pool_metrics = {"sync": PoolMetrics(), "async": PoolMetrics()}
+
+# Sync engine for scripts, migrations and the background stats worker
 engine = create_engine(
-    DATABASE_URL,
-    echo=True,  # Log SQL queries (set to False in production)
-    pool_size=10,  # Base number of connections to maintain
-    max_overflow=20,  # Maximum number of connections above pool_size
-    pool_pre_ping=True,  # Verify connections before usage to avoid stale connections
+    database_settings.database_url,
+    **_engine_options(
+        database_settings,
+        QueuePool,
+        pool_metrics["sync"],
+        _sync_connect_args(database_settings),
+    ),
 )
 
 # Create session factory with expire_on_commit=False to allow object usage after commit
 session_factory = sessionmaker(bind=engine, class_=Session, expire_on_commit=False)
 
+# The asyncio engine uses the asyncpg driver on the same database
+async_engine = create_async_engine(
+    database_settings.resolved_async_database_url,
+    **_engine_options(
+        database_settings,
+        AsyncAdaptedQueuePool,
+        pool_metrics["async"],
+        _async_connect_args(database_settings),
+    ),
+)
+
+# Async session factory; expire_on_commit=False because attributes cannot be
+# lazily reloaded after commit without an await
+async_session_factory = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+)
+
+
+class ReplicaRouter:
+    """
+    Round-robin selection of read replicas with temporary exclusion.
+
+    Replicas that fail to connect are marked down and skipped until
+    retry_seconds have passed, so one broken replica does not add a
+    connection attempt to every request.
+    """
+
+    def __init__(
+        self,
+        session_factories: List[async_sessionmaker],
+        retry_seconds: float = database_settings.replica_retry_seconds,
+    ):
+        self.session_factories = session_factories
+        self.retry_seconds = retry_seconds
+        self._next = itertools.count()
+        self._down_until = [0.0] * len(session_factories)
+
+    def candidates(self) -> List[int]:
+        """
+        Return the indexes of the replicas to try, in order, for one request.
+
+        Returns:
+            List[int]: Available replicas, starting at the next in rotation
+        """
+        count = len(self.session_factories)
+        if not count:
+            return []
+        start = next(self._next) % count
+        now = time.monotonic()
+        return [
+            index
+            for index in ((start + offset) % count for offset in range(count))
+            if self._down_until[index] <= now
+        ]
+
+    def mark_down(self, index: int) -> None:
+        self._down_until[index] = time.monotonic() + self.retry_seconds
+
+
+def _replica_engine(index: int, url: str):
+    metrics = pool_metrics.setdefault(f"replica_{index}", PoolMetrics())
+    return create_async_engine(
+        url,
+        **_engine_options(
+            database_settings,
+            AsyncAdaptedQueuePool,
+            metrics,
+            _async_connect_args(database_settings, url),
+        ),
+    )
+
+
+# Async engines of the read replicas, empty when none are configured
+replica_engines = [
+    _replica_engine(index, url)
+    for index, url in enumerate(database_settings.replica_urls)
+]
+
+replica_router = ReplicaRouter(
+    [
+        async_sessionmaker(bind=replica, class_=AsyncSession, expire_on_commit=False)
+        for replica in replica_engines
+    ],
+)
+
+
+def get_pool_metrics() -> Dict[str, Dict[str, Any]]:
+    """
+    Return checkout metrics and pool gauges of both engines.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Metrics keyed by engine (sync, async,
+            replica_N)
+    """
+    metrics = {
+        "sync": pool_metrics["sync"].snapshot(engine.pool),
+        "async": pool_metrics["async"].snapshot(async_engine.pool),
+    }
+    for index, replica in enumerate(replica_engines):
+        name = f"replica_{index}"
+        metrics[name] = pool_metrics[name].snapshot(replica.pool)
+    return metrics
+
 
 def get_db():
     """
@@ -56,3 +307,93 @@ def get_db():
     """
     with session_factory() as session:
         yield session
+
+
+async def get_async_db():
+    """
+    FastAPI dependency that provides an asyncio database session.
+
+    Queries are awaited, so while one request waits for the database the
+    event loop keeps serving other requests.
+
+    Yields:
+        AsyncSession: SQLAlchemy asyncio database session
+    """
+    async with async_session_factory() as session:
+        yield session
+
+
+async def _replica_session() -> Optional[AsyncSession]:
+    """Open a session on the next reachable replica, or None if there is none."""
+    for index in replica_router.candidates():
+        session = replica_router.session_factories[index]()
+        try:
+            # Check out a connection now so a dead replica falls back here
+            # rather than failing the request at its first query
+            await session.connection()
+            return session
+        except (exc.DBAPIError, OSError) as e:
+            await session.close()
+            replica_router.mark_down(index)
+            logger.warning(f"Read replica {index} unavailable: {str(e)}")
+    return None
+
+
+async def get_read_db(request: Request):
+    """
+    FastAPI dependency that provides a session for read-only queries.
+
+    The session is bound to a read replica chosen round-robin. The primary
+    is used instead when no replica is configured or reachable, and for
+    clients that wrote recently (see set_read_primary_cookie()), so they
+    read their own writes. Handlers using it must not write.
+
+    Args:
+        request: Incoming request, checked for the read-primary cookie
+
+    Yields:
+        AsyncSession: Session on a replica or on the primary
+    """
+    session = None
+    if not request.cookies.get(READ_PRIMARY_COOKIE):
+        session = await _replica_session()
+    if session is None:
+        session = async_session_factory()
+
+    async with session:
+        yield session
+
+
+def read_only_endpoint(endpoint: Callable) -> Callable:
+    """
+    Mark a POST endpoint that does not write, e.g. a lookup with a JSON body.
+
+    Responses of marked endpoints do not pin the client to the primary.
+
+    Args:
+        endpoint: Route function
+
+    Returns:
+        Callable: The same function, marked read-only
+    """
+    endpoint.read_only = True
+    return endpoint
+
+
+def set_read_primary_cookie(response: Response) -> None:
+    """
+    Pin the client's reads to the primary after a write.
+
+    Does nothing when no replicas are configured.
+
+    Args:
+        response: Response of the write request
+    """
+    if replica_engines and database_settings.replica_sticky_seconds:
+        response.set_cookie(
+            READ_PRIMARY_COOKIE,
+            "1",
+            max_age=database_settings.replica_sticky_seconds,
+            httponly=True,
+            samesite="lax",
+        )
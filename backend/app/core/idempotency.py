@@ -0,0 +1,278 @@
+"""
+Idempotency keys for write endpoints.
+
+Clients that retry a POST after a timeout cannot know whether the first
+attempt was applied. Sending the same Idempotency-Key header with every
+attempt makes the retry safe: the first request runs and its response is
+stored for IDEMPOTENCY_TTL_SECONDS, and later requests from the same caller
+with the same key on the same endpoint get the stored response back (with an
+Idempotent-Replayed header) without touching the database. A request
+arriving while the first one is still running gets 409 Conflict, and reusing
+a key with a different request body gets 422.
+
+Keys are scoped to the caller, so two clients that happen to pick the same
+key never see each other's responses. The caller is the user of the bearer
+token when one is sent, otherwise the user_id of the request body (orders),
+otherwise the client address.
+
+Keys live in the cache backend (app.core.cache). With a Redis CACHE_URL they
+are shared by every worker and claimed atomically with SET NX. With the
+local backend they are kept in a separate in-process LRU bounded to
+IDEMPOTENCY_MAX_KEYS, so retries are only recognized by the worker that
+served the first attempt. Store commands go through run_backend(), so a
+Redis round trip never blocks the event loop. As with the response cache, a
+backend failure never fails a request: the request then runs without
+idempotency.
+
+A request that fails (any exception, including 4xx HTTPExceptions) releases
+its key, so the retry runs again.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from typing import Any, Optional, Tuple
+
+from app.core.auth import verify_token
+from app.core.cache import (
+    CACHE_KEY_PREFIX,
+    CacheBackend,
+    CacheError,
+    LocalCacheBackend,
+    cache_backend,
+    cache_metrics,
+    run_backend,
+)
+from fastapi import Header, HTTPException, Request, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response
+
+logger = logging.getLogger(__name__)
+
+# Seconds a response stays available for retries with the same key
+IDEMPOTENCY_TTL_SECONDS = float(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400"))
+# Seconds a key stays claimed by a request that has not finished, so a key
+# whose worker died is eventually released
+IDEMPOTENCY_LOCK_SECONDS = float(os.getenv("IDEMPOTENCY_LOCK_SECONDS", "60"))
+# Maximum number of keys kept in memory when the cache backend is local
+IDEMPOTENCY_MAX_KEYS = int(os.getenv("IDEMPOTENCY_MAX_KEYS", "100000"))
+
+# Header carrying the key, and the header marking replayed responses
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+# Name of the idempotency counters on the cache metrics endpoint
+METRICS_NAMESPACE = "idempotency"
+
+
+def _create_store() -> CacheBackend:
+    """Use the shared backend, or a dedicated LRU so cache entries never evict keys."""
+    if isinstance(cache_backend, LocalCacheBackend):
+        return LocalCacheBackend(IDEMPOTENCY_MAX_KEYS)
+    return cache_backend
+
+
+idempotency_store = _create_store()
+
+
+class Idempotency:
+    """
+    Idempotency state of one request, provided by the idempotency_guard
+    dependency.
+
+    Attributes:
+        replay: Stored response of an earlier request with the same key, to
+            be returned as is; None when the request must run
+    """
+
+    def __init__(
+        self,
+        key: Optional[str] = None,
+        fingerprint: str = "",
+        replay: Optional[Response] = None,
+        store: CacheBackend = idempotency_store,
+    ):
+        self.key = key
+        self.fingerprint = fingerprint
+        self.replay = replay
+        self.store = store
+        self.completed = False
+
+    async def respond(self, status_code: int, model: Any) -> Response:
+        """
+        Serialize the response of a successful write and store it for retries.
+
+        Args:
+            status_code: HTTP status of the response
+            model: Response model returned by the route
+
+        Returns:
+            Response: JSON response to return from the route
+        """
+        body = JSONResponse(content=jsonable_encoder(model)).body
+        if self.key is not None:
+            record = {
+                "fingerprint": self.fingerprint,
+                "status_code": status_code,
+                "body": body.decode(),
+            }
+            try:
+                await run_backend(
+                    self.store.set,
+                    self.key,
+                    json.dumps(record).encode(),
+                    IDEMPOTENCY_TTL_SECONDS,
+                    backend=self.store,
+                )
+                self.completed = True
+            except CacheError as e:
+                logger.warning(f"Storing idempotent response failed: {str(e)}")
+                cache_metrics.record(METRICS_NAMESPACE, "errors")
+        return Response(
+            content=body,
+            status_code=status_code,
+            media_type="application/json",
+        )
+
+    async def release(self) -> None:
+        """Forget the key of a request that did not complete, so it can be retried."""
+        if self.key is None or self.completed:
+            return
+        try:
+            await run_backend(self.store.delete, self.key, backend=self.store)
+        except CacheError as e:
+            logger.warning(f"Releasing idempotency key failed: {str(e)}")
+            cache_metrics.record(METRICS_NAMESPACE, "errors")
+
+
+def _replay(record: dict, fingerprint: str) -> Response:
+    """Build the response for a stored record, checking it matches the request."""
+    if "status_code" not in record:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A request with this Idempotency-Key is still in progress",
+        )
+    if record["fingerprint"] != fingerprint:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Idempotency-Key was already used with a different request",
+        )
+    return Response(
+        content=record["body"],
+        status_code=record["status_code"],
+        media_type="application/json",
+        headers={REPLAYED_HEADER: "true"},
+    )
+
+
+def _add_or_get(key: str, pending: bytes) -> Tuple[bool, Optional[bytes]]:
+    """Claim key with a pending record; (True, None), or (False, stored value)."""
+    # Two attempts: a record may expire between a failed add() and get()
+    for _ in range(2):
+        if idempotency_store.add(key, pending, IDEMPOTENCY_LOCK_SECONDS):
+            return True, None
+        stored = idempotency_store.get(key)
+        if stored is not None:
+            return False, stored
+    return False, None
+
+
+def _caller(request: Request, body: bytes) -> str:
+    """Identify the client sending a request, hashed for use in keys."""
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    caller = None
+    if scheme.lower() == "bearer" and token:
+        try:
+            caller = f"user:{verify_token(token)['sub']}"
+        except (HTTPException, KeyError):
+            pass
+    if caller is None:
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            payload = None
+        if isinstance(payload, dict):
+            orders = payload.get("orders")
+            records = orders if isinstance(orders, list) else [payload]
+            user_ids = sorted(
+                {
+                    str(record["user_id"])
+                    for record in records
+                    if isinstance(record, dict) and "user_id" in record
+                },
+            )
+            if user_ids:
+                caller = f"user_id:{','.join(user_ids)}"
+    if caller is None:
+        caller = f"client:{request.client.host if request.client else ''}"
+    return hashlib.blake2b(caller.encode(), digest_size=8).hexdigest()
+
+
+async def _claim(request: Request, idempotency_key: str) -> Idempotency:
+    """Claim a key for this request, or return the stored response."""
+    body = await request.body()
+    fingerprint = hashlib.blake2b(body, digest_size=16).hexdigest()
+    key = (
+        f"{CACHE_KEY_PREFIX}:{METRICS_NAMESPACE}:{request.url.path}:"
+        f"{_caller(request, body)}:{idempotency_key}"
+    )
+    pending = json.dumps({"fingerprint": fingerprint}).encode()
+
+    try:
+        claimed, stored = await run_backend(
+            _add_or_get,
+            key,
+            pending,
+            backend=idempotency_store,
+        )
+    except CacheError as e:
+        logger.warning(f"Idempotency key lookup failed: {str(e)}")
+        cache_metrics.record(METRICS_NAMESPACE, "errors")
+        return Idempotency()
+    if claimed:
+        cache_metrics.record(METRICS_NAMESPACE, "misses")
+        return Idempotency(key, fingerprint, store=idempotency_store)
+    if stored is not None:
+        cache_metrics.record(METRICS_NAMESPACE, "hits")
+        return Idempotency(replay=_replay(json.loads(stored), fingerprint))
+    return Idempotency()
+
+
+async def idempotency_guard(
+    request: Request,
+    idempotency_key: Optional[str] = Header(
+        None,
+        alias=IDEMPOTENCY_HEADER,
+        min_length=1,
+        max_length=255,
+        description="Unique key making retries of this request safe",
+    ),
+):
+    """
+    FastAPI dependency enforcing the Idempotency-Key header of a write.
+
+    The route returns idempotency.replay when it is set, and otherwise
+    builds its response with await idempotency.respond() after committing.
+    When the route raises, the key is released.
+
+    Args:
+        request: Incoming request, whose body is part of the key check
+        idempotency_key: Client-chosen key, optional
+
+    Yields:
+        Idempotency: State of this request
+
+    Raises:
+        HTTPException: If a request with the key is still running (409) or
+                      the key was used with a different body (422)
+    """
+    if idempotency_key is None:
+        yield Idempotency()
+        return
+
+    idempotency = await _claim(request, idempotency_key)
+    try:
+        yield idempotency
+    finally:
+        await idempotency.release()
@@ -0,0 +1,165 @@
+"""
+Keyset (cursor) pagination helpers.
+
+This module provides opaque cursor encoding and the SQL seek conditions used
+by endpoints that support cursor pagination. A cursor stores the sort key of
+the last row returned, so the next page is fetched with an index-friendly
+comparison instead of an OFFSET that scans and discards every earlier row.
+"""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, List, Sequence, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import (
+    DateTime,
+    Float,
+    Integer,
+    Numeric,
+    String,
+    TypeDecorator,
+    and_,
+    literal,
+    or_,
+    tuple_,
+)
+from sqlalchemy.sql.elements import ColumnElement
+
+# A sort key is an SQL expression and whether it is sorted descending
+SortKey = Tuple[ColumnElement, bool]
+
+
+def _invalid_cursor() -> HTTPException:
+    """Return the error raised for cursors that cannot be used."""
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Invalid pagination cursor",
+    )
+
+
+def encode_cursor(mode: str, values: Sequence[Any]) -> str:
+    """
+    Encode the sort key of the last row of a page into an opaque cursor.
+
+    Args:
+        mode: Name of the sort mode the cursor belongs to
+        values: Sort key values of the last row, in ORDER BY order
+
+    Returns:
+        str: URL-safe cursor string
+    """
+    payload = json.dumps({"m": mode, "k": list(values)}, default=str)
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, mode: str, size: int) -> List[Any]:
+    """
+    Decode a cursor produced by encode_cursor().
+
+    Args:
+        cursor: Cursor string received from the client
+        mode: Sort mode of the current request
+        size: Expected number of sort key values
+
+    Returns:
+        List[Any]: Sort key values stored in the cursor
+
+    Raises:
+        HTTPException: If the cursor is malformed or belongs to another sort mode (400)
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        values = payload["k"]
+        if payload["m"] != mode or len(values) != size:
+            raise ValueError("cursor does not match the requested sort order")
+        return values
+    except (ValueError, KeyError, TypeError, binascii.Error):
+        raise _invalid_cursor()
+
+
+def _bind(expression: ColumnElement, value: Any) -> ColumnElement:
+    """
+    Bind a cursor value with the SQL type of the expression it is compared to.
+
+    Raises:
+        ValueError, TypeError, ArithmeticError: If the value does not convert
+            to the SQL type
+    """
+    sql_type = expression.type
+    # Types such as SQLModel's AutoString decorate a base type
+    base_type = sql_type.impl if isinstance(sql_type, TypeDecorator) else sql_type
+    if value is not None:
+        if isinstance(base_type, Integer):
+            if isinstance(value, bool) or not isinstance(value, int):
+                raise TypeError(f"expected an integer, got {value!r}")
+        elif isinstance(base_type, String):
+            if not isinstance(value, str):
+                raise TypeError(f"expected a string, got {value!r}")
+        elif isinstance(base_type, Float):
+            value = float(value)
+        elif isinstance(base_type, Numeric):
+            value = Decimal(str(value))
+        elif isinstance(base_type, DateTime):
+            value = datetime.fromisoformat(value)
+    return literal(value, type_=sql_type)
+
+
+def keyset_condition(keys: Sequence[SortKey], values: Sequence[Any]) -> ColumnElement:
+    """
+    Build the WHERE condition that seeks past the row with the given sort key.
+
+    When every key is sorted in the same direction a single row comparison,
+    e.g. (a, b, id) > (:a, :b, :id), is emitted so a matching composite index
+    can be used directly. Mixed directions are expanded into the equivalent
+    OR of prefix equalities.
+
+    Args:
+        keys: Sort keys in ORDER BY order (the last one must be unique)
+        values: Sort key values of the last row of the previous page
+
+    Returns:
+        ColumnElement: Condition selecting the rows after the cursor
+
+    Raises:
+        HTTPException: If a cursor value does not match the type of its sort key (400)
+    """
+    try:
+        bound = [
+            _bind(expression, value) for (expression, _), value in zip(keys, values)
+        ]
+    except (ValueError, TypeError, ArithmeticError):
+        raise _invalid_cursor()
+    directions = {descending for _, descending in keys}
+
+    if len(directions) == 1:
+        left = tuple_(*[expression for expression, _ in keys])
+        right = tuple_(*bound)
+        return left < right if directions.pop() else left > right
+
+    clauses = []
+    for index, (expression, descending) in enumerate(keys):
+        equal_prefix = [keys[i][0] == bound[i] for i in range(index)]
+        step = expression < bound[index] if descending else expression > bound[index]
+        clauses.append(and_(*equal_prefix, step))
+    return or_(*clauses)
+
+
+def order_by_keys(keys: Sequence[SortKey]) -> List[ColumnElement]:
+    """
+    Convert sort keys into ORDER BY clauses.
+
+    Args:
+        keys: Sort keys in ORDER BY order
+
+    Returns:
+        List[ColumnElement]: Clauses to pass to order_by()
+    """
+    return [
+        expression.desc() if descending else expression.asc()
+        for expression, descending in keys
+    ]
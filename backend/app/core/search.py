@@ -0,0 +1,248 @@
+"""
+Full-text search over book titles, summaries and author names.
+
+On PostgreSQL the book table carries a search_vector tsvector column that
+database triggers keep up to date from the title (weight A), the author name
+(weight B) and the summary (weight C), with a GIN index on it. A search turns
+every word of the query into a prefix term, so partially typed words match
+(typeahead), and ranks matches with ts_rank_cd.
+
+Other databases (e.g. SQLite in tests) have no tsvector type. There the same
+search is answered from an in-process trigram index over the same fields,
+which also tolerates small typos. It is built on first use and rebuilt every
+SEARCH_FALLBACK_TTL_SECONDS.
+"""
+
+import asyncio
+import os
+import re
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from app.db.author import Author
+from app.db.book import Book
+from sqlalchemy import Float, case, false, func, literal, literal_column, select
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+
+# Text search configuration used by the triggers and by queries
+SEARCH_CONFIG = "english"
+
+# Seconds before the in-process fallback index is rebuilt
+SEARCH_FALLBACK_TTL_SECONDS = float(os.getenv("SEARCH_FALLBACK_TTL_SECONDS", "300"))
+
+# Minimum trigram similarity for a word to match a query term in the fallback
+TRIGRAM_THRESHOLD = 0.3
+
+# Maintained by database triggers and deliberately not mapped on Book, so that
+# listing queries selecting whole Book rows never load the vector
+book_search_vector = literal_column("book.search_vector", type_=TSVECTOR)
+
+# Field weights of the fallback index, matching the tsvector weights A/B/C
+FIELD_WEIGHTS = {"title": 1.0, "author": 0.4, "summary": 0.2}
+
+
+def search_terms(text: str) -> List[str]:
+    """
+    Split a search string into lower-case word terms.
+
+    Args:
+        text: Search string as typed by the user
+
+    Returns:
+        List[str]: Word terms, punctuation and tsquery operators removed
+    """
+    # Drop apostrophes first so "harry's" stays one term instead of "harry" and "s"
+    return re.findall(r"[^\W_]+", text.lower().replace("'", ""))
+
+
+def prefix_tsquery(terms: Iterable[str]) -> str:
+    """
+    Build a to_tsquery() expression requiring every term as a prefix.
+
+    Args:
+        terms: Terms returned by search_terms()
+
+    Returns:
+        str: Query such as "harri:* & pot:*"
+    """
+    return " & ".join(f"{term}:*" for term in terms)
+
+
+def _trigrams(word: str) -> Set[str]:
+    """Return the trigrams of a word, padded like pg_trgm does."""
+    padded = f"  {word} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    """
+    In-process word index answering prefix and fuzzy (trigram) searches.
+
+    Every distinct word of the indexed fields maps to the books containing
+    it with the weight of the best field it appears in. A query term matches
+    a word it is a prefix of (similarity 1) or a word whose trigram
+    similarity is at least TRIGRAM_THRESHOLD.
+    """
+
+    def __init__(self, documents: Iterable[Tuple[int, Dict[str, Optional[str]]]]):
+        """
+        Build the index.
+
+        Args:
+            documents: (book id, {field name: text}) pairs, with field names
+                from FIELD_WEIGHTS
+        """
+        self._postings: Dict[str, Dict[int, float]] = defaultdict(dict)
+        for book_id, fields in documents:
+            for field, text in fields.items():
+                weight = FIELD_WEIGHTS[field]
+                for word in search_terms(text or ""):
+                    postings = self._postings[word]
+                    postings[book_id] = max(postings.get(book_id, 0.0), weight)
+
+        self._words = sorted(self._postings)
+        self._word_trigrams = {word: _trigrams(word) for word in self._words}
+        self._trigram_words: Dict[str, Set[str]] = defaultdict(set)
+        for word, trigrams in self._word_trigrams.items():
+            for trigram in trigrams:
+                self._trigram_words[trigram].add(word)
+
+    def _matching_words(self, term: str) -> Dict[str, float]:
+        """Return the indexed words matching a term with their similarity."""
+        matches: Dict[str, float] = {}
+        start = bisect_left(self._words, term)
+        for word in self._words[start:]:
+            if not word.startswith(term):
+                break
+            matches[word] = 1.0
+
+        term_trigrams = _trigrams(term)
+        shared: Dict[str, int] = defaultdict(int)
+        for trigram in term_trigrams:
+            for word in self._trigram_words.get(trigram, ()):
+                shared[word] += 1
+        for word, count in shared.items():
+            similarity = count / (
+                len(term_trigrams) + len(self._word_trigrams[word]) - count
+            )
+            if similarity >= TRIGRAM_THRESHOLD and similarity > matches.get(word, 0.0):
+                matches[word] = similarity
+        return matches
+
+    def search(self, text: str) -> Dict[int, float]:
+        """
+        Find the books matching every term of a search string.
+
+        Args:
+            text: Search string
+
+        Returns:
+            Dict[int, float]: Relevance score per matching book id
+        """
+        terms = search_terms(text)
+        if not terms:
+            return {}
+
+        scores: Optional[Dict[int, float]] = None
+        for term in terms:
+            term_scores: Dict[int, float] = {}
+            for word, similarity in self._matching_words(term).items():
+                for book_id, weight in self._postings[word].items():
+                    score = weight * similarity
+                    if score > term_scores.get(book_id, 0.0):
+                        term_scores[book_id] = score
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {
+                    book_id: score + term_scores[book_id]
+                    for book_id, score in scores.items()
+                    if book_id in term_scores
+                }
+            if not scores:
+                return {}
+        return scores
+
+
+class FallbackSearchIndex:
+    """Lazily built, periodically rebuilt TrigramIndex over the book table."""
+
+    def __init__(self, ttl: float = SEARCH_FALLBACK_TTL_SECONDS):
+        self.ttl = ttl
+        self._index: Optional[TrigramIndex] = None
+        self._built_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def _fresh(self) -> bool:
+        return self._index is not None and time.monotonic() - self._built_at < self.ttl
+
+    async def get(self, db: AsyncSession) -> TrigramIndex:
+        """
+        Return the index, building it with the given session if it is stale.
+
+        Args:
+            db: Session used to read the books when the index is rebuilt
+
+        Returns:
+            TrigramIndex: Current index
+        """
+        if self._fresh():
+            return self._index
+        async with self._lock:
+            if not self._fresh():
+                rows = await db.execute(
+                    select(
+                        Book.id,
+                        Book.book_title,
+                        Book.book_summary,
+                        Author.author_name,
+                    ).join(Author, Book.author_id == Author.id),
+                )
+                self._index = TrigramIndex(
+                    (book_id, {"title": title, "author": author, "summary": summary})
+                    for book_id, title, summary, author in rows
+                )
+                self._built_at = time.monotonic()
+        return self._index
+
+
+fallback_index = FallbackSearchIndex()
+
+
+async def book_search_expressions(
+    db: AsyncSession,
+    text: str,
+) -> Tuple[ColumnElement, ColumnElement]:
+    """
+    Build the match condition and rank expression of a book search.
+
+    Args:
+        db: Session the search query will run on
+        text: Search string
+
+    Returns:
+        Tuple[ColumnElement, ColumnElement]: WHERE condition selecting the
+            matching books and a Float relevance expression (higher is better)
+    """
+    terms = search_terms(text)
+    if not terms:
+        return false(), literal(0.0, type_=Float)
+
+    if db.bind.dialect.name == "postgresql":
+        query = func.to_tsquery(SEARCH_CONFIG, prefix_tsquery(terms))
+        return (
+            book_search_vector.op("@@")(query),
+            func.ts_rank_cd(book_search_vector, query, type_=Float),
+        )
+
+    scores = (await fallback_index.get(db)).search(text)
+    if not scores:
+        return false(), literal(0.0, type_=Float)
+    return (
+        Book.id.in_(list(scores)),
+        case(scores, value=Book.id, else_=literal(0.0, type_=Float)),
+    )
@@ -0,0 +1,160 @@
+"""
+Application settings loaded from environment variables.
+
+This module reads the database connection and pool configuration from the
+environment (and the .env file in the backend root), validates it once at
+import time and exposes it as an immutable settings object, so a typo in a
+deployment fails fast at startup instead of at the first request.
+
+Environment variables:
+  DATABASE_URL              postgresql:// URL of the primary database (required)
+  ASYNC_DATABASE_URL        asyncpg URL (default: DATABASE_URL with postgresql+asyncpg)
+  DB_POOL_SIZE              Connections kept open per engine and process (default 10)
+  DB_MAX_OVERFLOW           Extra connections allowed above the pool size (default 20)
+  DB_POOL_TIMEOUT_SECONDS   Seconds to wait for a free connection (default 30)
+  DB_POOL_RECYCLE_SECONDS   Reconnect connections older than this, -1 to disable (default 1800)
+  DB_POOL_PRE_PING          Test connections on checkout (default true)
+  DB_STATEMENT_TIMEOUT_MS   Server-side statement timeout, 0 to disable (default 0)
+  DB_ECHO                   Log every SQL statement (default false)
+  DB_PGBOUNCER              PgBouncer transaction pooling mode (default false)
+  DATABASE_REPLICA_URLS     Comma-separated read replica URLs (default: none)
+  DB_REPLICA_STICKY_SECONDS Seconds a client reads from the primary after a write (default 5)
+  DB_REPLICA_RETRY_SECONDS  Seconds an unreachable replica is skipped (default 30)
+
+In PgBouncer mode the application does no pooling of its own (NullPool) and
+asyncpg prepared statements are disabled, since a transaction pooler may run
+consecutive statements on different server connections. The statement timeout
+is not sent as a connection parameter in that mode (PgBouncer rejects unknown
+startup parameters); set it on the database role instead.
+"""
+
+import os
+from typing import List, Optional
+
+from dotenv import load_dotenv
+from pydantic import BaseModel, Field, ValidationError, field_validator
+
+# Load environment variables from the .env file in the root directory
+load_dotenv(
+    dotenv_path=os.path.join(
+        os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+        ".env",
+    ),
+)
+
+
+class DatabaseSettings(BaseModel, frozen=True):
+    """
+    Validated database connection and pool settings.
+
+    Attributes:
+        database_url: URL of the primary database (psycopg2 driver)
+        async_database_url: URL of the primary database for the asyncpg driver
+        pool_size: Number of connections kept open per engine and process
+        max_overflow: Connections allowed above pool_size under load
+        pool_timeout: Seconds a request waits for a free connection
+        pool_recycle: Maximum connection age in seconds (-1 disables recycling)
+        pool_pre_ping: Whether connections are tested before each checkout
+        statement_timeout_ms: Server-side statement timeout (0 disables it)
+        echo: Whether every SQL statement is logged
+        pgbouncer: Whether connections go through PgBouncer transaction pooling
+        replica_urls: Async URLs of read replicas (postgresql:// URLs are
+            converted to asyncpg; other async URLs, e.g. sqlite+aiosqlite for
+            local stand-ins, are used as given)
+        replica_sticky_seconds: How long a client keeps reading from the
+            primary after a write, so it sees its own changes
+        replica_retry_seconds: How long a replica that failed to connect is
+            skipped before it is tried again
+    """
+
+    database_url: str
+    async_database_url: Optional[str] = None
+    pool_size: int = Field(10, ge=1)
+    max_overflow: int = Field(20, ge=0)
+    pool_timeout: float = Field(30.0, gt=0)
+    pool_recycle: int = Field(1800, ge=-1)
+    pool_pre_ping: bool = True
+    statement_timeout_ms: int = Field(0, ge=0)
+    echo: bool = False
+    pgbouncer: bool = False
+    replica_urls: List[str] = []
+    replica_sticky_seconds: int = Field(5, ge=0)
+    replica_retry_seconds: float = Field(30.0, ge=0)
+
+    @field_validator("database_url")
+    @classmethod
+    def _check_database_url(cls, value: str) -> str:
+        if not value.startswith("postgresql://"):
+            raise ValueError("Invalid database URL format. Use postgresql://")
+        return value
+
+    @field_validator("replica_urls", mode="before")
+    @classmethod
+    def _split_replica_urls(cls, value):
+        if isinstance(value, str):
+            value = [url.strip() for url in value.split(",") if url.strip()]
+        return [
+            url.replace("postgresql://", "postgresql+asyncpg://", 1) for url in value
+        ]
+
+    @property
+    def resolved_async_database_url(self) -> str:
+        """The asyncpg URL, derived from database_url when not set explicitly."""
+        return self.async_database_url or self.database_url.replace(
+            "postgresql://",
+            "postgresql+asyncpg://",
+            1,
+        )
+
+
+# Environment variable for each DatabaseSettings field
+DATABASE_ENV_VARS = {
+    "database_url": "DATABASE_URL",
+    "async_database_url": "ASYNC_DATABASE_URL",
+    "pool_size": "DB_POOL_SIZE",
+    "max_overflow": "DB_MAX_OVERFLOW",
+    "pool_timeout": "DB_POOL_TIMEOUT_SECONDS",
+    "pool_recycle": "DB_POOL_RECYCLE_SECONDS",
+    "pool_pre_ping": "DB_POOL_PRE_PING",
+    "statement_timeout_ms": "DB_STATEMENT_TIMEOUT_MS",
+    "echo": "DB_ECHO",
+    "pgbouncer": "DB_PGBOUNCER",
+    "replica_urls": "DATABASE_REPLICA_URLS",
+    "replica_sticky_seconds": "DB_REPLICA_STICKY_SECONDS",
+    "replica_retry_seconds": "DB_REPLICA_RETRY_SECONDS",
+}
+
+
+def load_database_settings() -> DatabaseSettings:
+    """
+    Read and validate the database settings from the environment.
+
+    Returns:
+        DatabaseSettings: Validated settings
+
+    Raises:
+        ValueError: If DATABASE_URL is missing or any value is invalid
+    """
+    if not os.getenv("DATABASE_URL"):
+        raise ValueError(
+            f"DATABASE_URL not found! Current working directory: {os.getcwd()}",
+        )
+
+    values = {
+        field: os.environ[env_var]
+        for field, env_var in DATABASE_ENV_VARS.items()
+        if os.getenv(env_var) not in (None, "")
+    }
+    try:
+        return DatabaseSettings(**values)
+    except ValidationError as e:
+        problems = "; ".join(
+            f"{DATABASE_ENV_VARS[str(error['loc'][0])]}: {error['msg']}"
+            if error["loc"]
+            else error["msg"]
+            for error in e.errors()
+        )
+        raise ValueError(f"Invalid database settings: {problems}")
+
+
+database_settings = load_database_settings()
@@ -0,0 +1,184 @@
+"""
+Memoized snapshots of small, rarely changing dimension tables.
+
+The author and category lists are requested on every shop page load by the
+filter sidebar but almost never change. Each one is loaded once into an
+immutable snapshot holding its pre-serialized JSON (with ETag), so requests
+are answered without any database access or serialization.
+
+A snapshot is reloaded when the version of its cache namespace is bumped
+(see bump_snapshots()). Versions live in the cache backend, so with a shared
+backend one bump refreshes every worker process. Versions are checked at
+most every SNAPSHOT_VERSION_CHECK_SECONDS. The check and the reload use the
+synchronous session and may talk to Redis, so they run in the threadpool
+and never block the event loop.
+"""
+
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+from app.core.cache import (
+    CacheError,
+    CacheNamespace,
+    author_cache,
+    category_cache,
+    serialize_response,
+)
+from app.core.db_config import session_factory
+from app.db.author import Author
+from app.db.category import Category
+from app.schemas.author import AuthorRead
+from app.schemas.category import CategoryRead
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Seconds between checks of the snapshot versions in the cache backend
+SNAPSHOT_VERSION_CHECK_SECONDS = float(
+    os.getenv("SNAPSHOT_VERSION_CHECK_SECONDS", "5"),
+)
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """
+    Immutable serialized content of a dimension table.
+
+    Attributes:
+        version: Namespace version the snapshot was loaded for
+        entry: ETag and JSON body, as produced by serialize_response()
+    """
+
+    version: int
+    entry: bytes
+
+
+class DimensionSnapshot:
+    """
+    Holder of the current snapshot of one dimension table.
+
+    Readers only dereference the current Snapshot, which is replaced as a
+    whole on reload, so they never see a partially built list. Reloads are
+    serialized by a lock so concurrent requests trigger a single query.
+    """
+
+    def __init__(
+        self,
+        namespace: CacheNamespace,
+        load: Callable[[Session], bytes],
+        check_interval: float = SNAPSHOT_VERSION_CHECK_SECONDS,
+    ):
+        self.namespace = namespace
+        self._load = load
+        self.check_interval = check_interval
+        self._current: Optional[Snapshot] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def _backend_version(self) -> Optional[int]:
+        try:
+            return self.namespace.version()
+        except CacheError as e:
+            logger.warning(f"Snapshot version check failed: {str(e)}")
+            return None
+
+    def refresh(self, version: Optional[int] = None) -> Snapshot:
+        """
+        Reload the snapshot from the database.
+
+        Args:
+            version: Namespace version being loaded (read from the backend
+                when omitted)
+
+        Returns:
+            Snapshot: The new current snapshot
+        """
+        if version is None:
+            version = self._backend_version() or 0
+        with session_factory() as session:
+            entry = self._load(session)
+        self._current = Snapshot(version=version, entry=entry)
+        self._checked_at = time.monotonic()
+        return self._current
+
+    async def get(self) -> bytes:
+        """
+        Return the serialized snapshot, reloading it if its version changed.
+
+        A fresh snapshot is returned directly; a version check or reload
+        runs in the threadpool.
+
+        Returns:
+            bytes: ETag and JSON body of the current snapshot
+        """
+        current = self._current
+        if (
+            current is not None
+            and time.monotonic() - self._checked_at < self.check_interval
+        ):
+            return current.entry
+        return await run_in_threadpool(self._check)
+
+    def _check(self) -> bytes:
+        """Check the backend version and reload if needed, one thread at a time."""
+        with self._lock:
+            current = self._current
+            if (
+                current is not None
+                and time.monotonic() - self._checked_at < self.check_interval
+            ):
+                return current.entry
+
+            version = self._backend_version()
+            if current is not None and version in (None, current.version):
+                # Unchanged, or the backend is down: keep serving what we have
+                self._checked_at = time.monotonic()
+                return current.entry
+            return self.refresh(version).entry
+
+
+def _load_authors(session: Session) -> bytes:
+    authors = session.query(Author).order_by(Author.author_name).all()
+    return serialize_response([AuthorRead.model_validate(a) for a in authors])
+
+
+def _load_categories(session: Session) -> bytes:
+    categories = session.query(Category).order_by(Category.category_name).all()
+    return serialize_response([CategoryRead.model_validate(c) for c in categories])
+
+
+author_snapshot = DimensionSnapshot(author_cache, _load_authors)
+category_snapshot = DimensionSnapshot(category_cache, _load_categories)
+SNAPSHOTS: List[DimensionSnapshot] = [author_snapshot, category_snapshot]
+
+
+def load_snapshots() -> None:
+    """
+    Load every snapshot, called once at application startup.
+
+    A failure is logged rather than raised so the API can still start while
+    the database is unavailable; the snapshot then loads on first use.
+    """
+    for snapshot in SNAPSHOTS:
+        try:
+            snapshot.refresh()
+        except Exception as e:
+            logger.error(
+                f"Loading {snapshot.namespace.name} snapshot failed: {str(e)}",
+            )
+
+
+def bump_snapshots() -> None:
+    """
+    Bump the version of every snapshot so all processes reload them.
+
+    Called by the stats worker on its periodic full refresh, and by any
+    code that changes authors or categories.
+    """
+    for snapshot in SNAPSHOTS:
+        snapshot.namespace.invalidate()
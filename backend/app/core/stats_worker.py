@@ -0,0 +1,161 @@
+"""
+Background maintenance worker for the book_stats table.
+
+This module keeps BookStats up to date outside of the request path. Read
+endpoints never write statistics; instead, write events (such as discount
+changes) mark books as dirty and a background thread recomputes their
+statistics. The same thread rolls lowest_price over at every date boundary
+for books whose discounts start or expire that day, and runs a periodic full
+sweep that catches anything missed. Whenever statistics change, the affected
+cache namespaces are invalidated.
+"""
+
+import logging
+import os
+import threading
+import time
+from datetime import date
+from typing import Iterable
+
+from app.core.autocomplete import autocomplete_index
+from app.core.book_stat import recompute_book_stats, refresh_discount_rollover
+from app.core.cache import invalidate_book_stats, invalidate_featured_books
+from app.core.db_config import session_factory
+from app.core.snapshots import bump_snapshots
+
+logger = logging.getLogger(__name__)
+
+# Seconds between flushes of the dirty book queue
+STATS_FLUSH_INTERVAL_SECONDS = float(os.getenv("STATS_FLUSH_INTERVAL_SECONDS", "5"))
+# Seconds between full recomputations of every book's statistics
+STATS_FULL_REFRESH_SECONDS = float(os.getenv("STATS_FULL_REFRESH_SECONDS", "3600"))
+
+
+class BookStatsWorker:
+    """
+    Daemon thread that recomputes book statistics off the request path.
+
+    Book IDs passed to mark_dirty() are collected in a set and refreshed in
+    a single set-based recompute on the next flush. When the local date
+    changes (and once on startup) the worker refreshes lowest_price for the
+    books whose discounts start or expire that day, so price sorting stays
+    correct without any request touching the book. Every
+    STATS_FULL_REFRESH_SECONDS it also refreshes all books as a safety net.
+    """
+
+    def __init__(
+        self,
+        flush_interval: float = STATS_FLUSH_INTERVAL_SECONDS,
+        full_refresh_interval: float = STATS_FULL_REFRESH_SECONDS,
+    ):
+        self.flush_interval = flush_interval
+        self.full_refresh_interval = full_refresh_interval
+        self._pending: set[int] = set()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def mark_dirty(self, book_ids: Iterable[int]) -> None:
+        """
+        Queue books whose statistics must be recomputed.
+
+        Args:
+            book_ids: IDs of the books affected by a write event
+        """
+        with self._lock:
+            self._pending.update(book_ids)
+        self._wakeup.set()
+
+    def start(self) -> None:
+        """Start the worker thread if it is not already running."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            name="book-stats-worker",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Signal the worker to stop and wait for the current batch to finish."""
+        self._stopping.set()
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def _drain(self) -> list[int]:
+        with self._lock:
+            book_ids = sorted(self._pending)
+            self._pending.clear()
+        return book_ids
+
+    def _refresh(self, book_ids: list[int]) -> None:
+        with session_factory() as session:
+            if recompute_book_stats(session, book_ids):
+                invalidate_featured_books()
+                invalidate_book_stats(book_ids)
+
+    def _refresh_all(self) -> None:
+        with session_factory() as session:
+            if recompute_book_stats(session):
+                invalidate_featured_books()
+                invalidate_book_stats()
+        # Authors and categories have no write path in the API; reloading
+        # their snapshots here bounds how long out-of-band edits go unseen
+        bump_snapshots()
+        # Also corrects popularity drift from reviews posted to other workers
+        autocomplete_index.rebuild()
+
+    def _rollover(self, day: date) -> None:
+        with session_factory() as session:
+            changed = refresh_discount_rollover(session, day)
+        if changed:
+            invalidate_featured_books()
+            invalidate_book_stats()
+        logger.info(f"Discount rollover for {day}: {changed} books repriced")
+
+    def _run(self) -> None:
+        last_full_refresh = time.monotonic()
+        rollover_day = None
+        while not self._stopping.is_set():
+            today = date.today()
+            if rollover_day != today:
+                try:
+                    self._rollover(today)
+                    rollover_day = today
+                except Exception as e:
+                    logger.error(f"Discount rollover failed: {str(e)}")
+
+            self._wakeup.wait(timeout=self.flush_interval)
+            self._wakeup.clear()
+
+            if time.monotonic() - last_full_refresh >= self.full_refresh_interval:
+                last_full_refresh = time.monotonic()
+                book_ids = self._drain()  # Covered by the full refresh
+                try:
+                    self._refresh_all()
+                except Exception as e:
+                    logger.error(f"Full book stats refresh failed: {str(e)}")
+                    # Keep the books queued so the next flush retries them
+                    with self._lock:
+                        self._pending.update(book_ids)
+                continue
+
+            book_ids = self._drain()
+            if not book_ids:
+                continue
+            try:
+                self._refresh(book_ids)
+            except Exception as e:
+                logger.error(f"Book stats refresh failed: {str(e)}")
+                # Keep the books queued so the next flush retries them
+                with self._lock:
+                    self._pending.update(book_ids)
+
+
+# Shared worker instance started and stopped by the application lifespan
+stats_worker = BookStatsWorker()
@@ -0,0 +1,243 @@
+"""
+Stock reservation for order creation.
+
+The stock of a book is kept in book_stock, split over up to STOCK_STRIPES
+rows (stripes) whose quantities add up to the available stock. Books without
+stock rows are not stock-tracked and can always be ordered.
+
+reserve_stock() decrements the stock of every line item of a checkout. On
+PostgreSQL the fast path is a single statement: for each book it locks one
+stripe holding enough copies with FOR UPDATE SKIP LOCKED, starting at a
+random stripe, and decrements it. Concurrent checkouts of the same hot book
+therefore take different stripes instead of queuing behind one row lock.
+Only when a book finds no free stripe with enough copies (all locked, or the
+stock is spread too thin) does the checkout fall back to the slow path,
+which waits for the locks of all stripes of its books, in a fixed order so
+checkouts cannot deadlock, and takes copies from several stripes. Other
+databases (e.g. SQLite in tests) always use the slow path.
+
+Stock is set with set_stock() and untracked with clear_stock(), e.g. through
+the set_stock.py script.
+"""
+
+import os
+import random
+from typing import Dict, Iterable, List, Tuple
+
+from app.db.book_stock import BookStock
+from sqlalchemy import delete, func, insert, select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Number of rows the stock of a book is split over by set_stock()
+STOCK_STRIPES = int(os.getenv("STOCK_STRIPES", "8"))
+
+# Fast path: decrement one free stripe with enough copies per book. Stripes
+# are tried from :start_stripe upwards and then wrapping around, so that
+# concurrent checkouts spread over the stripes. Returns the stock-tracked
+# books that could not be reserved this way.
+RESERVE_STRIPES_SQL = """
+    WITH wanted AS (
+        SELECT book_id, quantity
+        FROM unnest(
+            CAST(:book_ids AS bigint[]),
+            CAST(:quantities AS integer[])
+        ) AS w(book_id, quantity)
+    ),
+    picked AS (
+        SELECT s.book_id, s.stripe, w.quantity
+        FROM wanted w
+        CROSS JOIN LATERAL (
+            SELECT book_id, stripe
+            FROM book_stock
+            WHERE book_id = w.book_id AND quantity >= w.quantity
+            ORDER BY stripe < :start_stripe, stripe
+            LIMIT 1
+            FOR UPDATE SKIP LOCKED
+        ) s
+    ),
+    reserved AS (
+        UPDATE book_stock bs
+        SET quantity = bs.quantity - p.quantity
+        FROM picked p
+        WHERE bs.book_id = p.book_id AND bs.stripe = p.stripe
+        RETURNING bs.book_id
+    )
+    SELECT w.book_id
+    FROM wanted w
+    WHERE w.book_id NOT IN (SELECT book_id FROM reserved)
+      AND EXISTS (SELECT 1 FROM book_stock s WHERE s.book_id = w.book_id)
+"""
+
+
+class InsufficientStockError(Exception):
+    """
+    Raised when a checkout asks for more copies than are in stock.
+
+    Attributes:
+        book_ids: IDs of the books that are short, sorted
+    """
+
+    def __init__(self, book_ids: Iterable[int]):
+        self.book_ids = sorted(book_ids)
+        super().__init__(f"Insufficient stock for books: {self.book_ids}")
+
+
+def _split(quantity: int, stripes: int) -> List[int]:
+    """Split a quantity over stripes as evenly as possible."""
+    share, remainder = divmod(quantity, stripes)
+    return [share + (1 if stripe < remainder else 0) for stripe in range(stripes)]
+
+
+async def _reserve_striped(db: AsyncSession, wanted: Dict[int, int]) -> bool:
+    """
+    Try the single-statement fast path inside a savepoint.
+
+    Books without stock rows are never reported as missed.
+
+    Returns:
+        bool: True if every tracked book was reserved. Otherwise the
+            savepoint is rolled back, releasing the stripes it locked.
+    """
+    book_ids = list(wanted)
+    savepoint = await db.begin_nested()
+    missed = (
+        await db.scalars(
+            text(RESERVE_STRIPES_SQL),
+            {
+                "book_ids": book_ids,
+                "quantities": [wanted[book_id] for book_id in book_ids],
+                "start_stripe": random.randrange(STOCK_STRIPES),
+            },
+        )
+    ).all()
+    if not missed:
+        await savepoint.commit()
+        return True
+    await savepoint.rollback()
+    return False
+
+
+async def _reserve_locked(db: AsyncSession, wanted: Dict[int, int]) -> None:
+    """Reserve stock by locking every stripe of the books, in a fixed order."""
+    stripes = (
+        await db.scalars(
+            select(BookStock)
+            .filter(BookStock.book_id.in_(wanted))
+            .order_by(BookStock.book_id, BookStock.stripe)
+            .with_for_update(),
+        )
+    ).all()
+
+    by_book: Dict[int, List[BookStock]] = {}
+    for stripe in stripes:
+        by_book.setdefault(stripe.book_id, []).append(stripe)
+
+    short = [
+        book_id
+        for book_id, rows in by_book.items()
+        if sum(row.quantity for row in rows) < wanted[book_id]
+    ]
+    if short:
+        raise InsufficientStockError(short)
+
+    changes = []
+    for book_id, rows in by_book.items():
+        remaining = wanted[book_id]
+        # Take from the fullest stripes first to touch as few rows as possible
+        for row in sorted(rows, key=lambda row: row.quantity, reverse=True):
+            if not remaining:
+                break
+            taken = min(row.quantity, remaining)
+            remaining -= taken
+            changes.append(
+                {
+                    "book_id": book_id,
+                    "stripe": row.stripe,
+                    "quantity": row.quantity - taken,
+                },
+            )
+    if changes:
+        await db.execute(update(BookStock), changes)
+
+
+async def reserve_stock(db: AsyncSession, items: Iterable[Tuple[int, int]]) -> None:
+    """
+    Decrement the stock of a checkout's line items, all or nothing.
+
+    The decrement is part of the caller's transaction, so rolling it back
+    returns the copies. Books without stock rows are not limited.
+
+    Args:
+        db: Async database session
+        items: (book_id, quantity) pairs; the same book may appear repeatedly
+
+    Raises:
+        InsufficientStockError: If a tracked book has fewer copies in stock
+            than requested; nothing is reserved then
+    """
+    wanted: Dict[int, int] = {}
+    for book_id, quantity in items:
+        wanted[book_id] = wanted.get(book_id, 0) + quantity
+    if not wanted:
+        return
+
+    if db.bind.dialect.name == "postgresql" and await _reserve_striped(db, wanted):
+        return
+    await _reserve_locked(db, wanted)
+
+
+async def set_stock(
+    db: AsyncSession,
+    book_id: int,
+    quantity: int,
+    stripes: int = STOCK_STRIPES,
+) -> None:
+    """
+    Replace the stock of a book, split evenly over stripes. The caller commits.
+
+    Args:
+        db: Async database session
+        book_id: Book ID
+        quantity: Copies in stock
+        stripes: Number of rows to split the stock over
+    """
+    await db.execute(delete(BookStock).filter(BookStock.book_id == book_id))
+    await db.execute(
+        insert(BookStock),
+        [
+            {"book_id": book_id, "stripe": stripe, "quantity": share}
+            for stripe, share in enumerate(_split(quantity, stripes))
+        ],
+    )
+
+
+async def clear_stock(db: AsyncSession, book_ids: Iterable[int]) -> None:
+    """
+    Delete the stock rows of books, so they are no longer stock-tracked.
+
+    The caller commits.
+
+    Args:
+        db: Async database session
+        book_ids: Book IDs
+    """
+    await db.execute(delete(BookStock).filter(BookStock.book_id.in_(list(book_ids))))
+
+
+async def stock_levels(db: AsyncSession, book_ids: Iterable[int]) -> Dict[int, int]:
+    """
+    Return the available stock of books.
+
+    Args:
+        db: Async database session
+        book_ids: Book IDs
+
+    Returns:
+        Dict[int, int]: Copies in stock by book ID; untracked books are absent
+    """
+    rows = await db.execute(
+        select(BookStock.book_id, func.sum(BookStock.quantity))
+        .filter(BookStock.book_id.in_(list(book_ids)))
+        .group_by(BookStock.book_id),
+    )
+    return {book_id: int(quantity) for book_id, quantity in rows}
@@ -9,6 +9,7 @@ imports in other parts of the application.
 from .author import Author
 from .base import Base
 from .book import Book
+from .book_stock import BookStock
 from .bookstats import BookStats
 from .category import Category
 from .discount import Discount
@@ -29,4 +30,5 @@ __all__ = [
     "Review",
     "User",
     "BookStats",
+    "BookStock",
 ]
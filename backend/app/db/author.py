@@ -5,7 +5,7 @@ This module defines the SQLModel for the Author table, which represents
 book authors with their names and biographical information.
 """
 
-from sqlalchemy import BigInteger
+from sqlalchemy import BigInteger, Index
 from sqlmodel import Field
 
 from .base import Base
@@ -26,6 +26,7 @@ class Author(Base, table=True):
     """
 
     __tablename__ = "author"
+    __table_args__ = (Index("ix_author_author_name", "author_name"),)
 
     id: int = Field(default=None, primary_key=True, sa_type=BigInteger)
     author_name: str = Field(default=None, max_length=255)
@@ -8,7 +8,7 @@ to authors and categories.
 
 from typing import Optional
 
-from sqlalchemy import BigInteger, Numeric
+from sqlalchemy import BigInteger, Index, Numeric
 from sqlmodel import Field
 
 from .base import Base
@@ -32,6 +32,11 @@ class Book(Base, table=True):
     """
 
     __tablename__ = "book"
+    __table_args__ = (
+        Index("ix_book_author_id", "author_id"),
+        Index("ix_book_category_id", "category_id"),
+        Index("ix_book_book_title_id", "book_title", "id"),
+    )
 
     id: int = Field(default=None, primary_key=True, sa_type=BigInteger)
 
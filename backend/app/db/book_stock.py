@@ -0,0 +1,39 @@
+"""
+Book stock database model for storing sellable inventory.
+
+This module defines the SQLModel for the BookStock table. The stock of a
+book is split over several rows (stripes) so concurrent checkouts of the
+same book can each lock a different row instead of queuing on one.
+"""
+
+from sqlalchemy import BigInteger, CheckConstraint, Integer, SmallInteger
+from sqlmodel import Field
+
+from .base import Base
+
+
+class BookStock(Base, table=True):
+    """
+    Database model representing one stripe of a book's stock.
+
+    The available stock of a book is the sum of the quantities of its
+    stripes. Books without any stock row are not stock-tracked and can
+    always be ordered.
+
+    Attributes:
+        book_id: Foreign key to the book
+        stripe: Stripe number, unique per book
+        quantity: Copies available in this stripe (never negative)
+    """
+
+    __tablename__ = "book_stock"
+    __table_args__ = (CheckConstraint("quantity >= 0", name="ck_book_stock_quantity"),)
+
+    book_id: int = Field(
+        default=None,
+        primary_key=True,
+        foreign_key="book.id",
+        sa_type=BigInteger,
+    )
+    stripe: int = Field(default=0, primary_key=True, sa_type=SmallInteger)
+    quantity: int = Field(default=0, sa_type=Integer)
@@ -5,7 +5,7 @@ This module defines the SQLModel for the BookStats table, which stores
 pre-calculated statistics for books including review counts, ratings, and pricing.
 """
 
-from sqlalchemy import BigInteger, Float, Integer
+from sqlalchemy import BigInteger, Float, Index, Integer, text
 from sqlmodel import Field
 
 from .base import Base
@@ -25,12 +25,43 @@ class BookStats(Base, table=True):
         total_star: Sum of all star ratings received
         avg_rating: Average star rating (total_star / review_count)
         lowest_price: Current lowest available price (considering discounts)
+        discount_amount: Book price minus lowest_price (0 when not on sale)
+        star_1 .. star_5: Number of reviews with each star rating
     """
 
     __tablename__ = "book_stats"
+    __table_args__ = (
+        # Recommended books: highest rating first among reviewed books
+        Index(
+            "ix_book_stats_recommended",
+            text("avg_rating DESC"),
+            "lowest_price",
+            postgresql_where=text("review_count > 0"),
+        ),
+        # Popular books: most reviewed first, cheapest first on ties
+        Index(
+            "ix_book_stats_popularity",
+            text("review_count DESC"),
+            "lowest_price",
+            "id",
+        ),
+        # Books on sale: largest discount first, only books with a discount
+        Index(
+            "ix_book_stats_on_sale",
+            text("discount_amount DESC"),
+            text("id DESC"),
+            postgresql_where=text("discount_amount > 0"),
+        ),
+    )
 
     id: int = Field(default=None, primary_key=True, sa_type=BigInteger)
     review_count: int = Field(default=0, sa_type=Integer)
     total_star: int = Field(default=0, sa_type=Integer)
     avg_rating: float = Field(default=0.0, sa_type=Float)
     lowest_price: float = Field(default=0.0, sa_type=Float)
+    discount_amount: float = Field(default=0.0, sa_type=Float)
+    star_1: int = Field(default=0, sa_type=Integer)
+    star_2: int = Field(default=0, sa_type=Integer)
+    star_3: int = Field(default=0, sa_type=Integer)
+    star_4: int = Field(default=0, sa_type=Integer)
+    star_5: int = Field(default=0, sa_type=Integer)
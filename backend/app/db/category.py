@@ -5,7 +5,7 @@ This module defines the SQLModel for the Category table, which represents
 book categories or genres in the bookstore with their names and descriptions.
 """
 
-from sqlalchemy import BigInteger
+from sqlalchemy import BigInteger, Index
 from sqlmodel import Field
 
 from .base import Base
@@ -25,6 +25,7 @@ class Category(Base, table=True):
     """
 
     __tablename__ = "category"
+    __table_args__ = (Index("ix_category_category_name", "category_name"),)
 
     id: int = Field(default=None, primary_key=True, sa_type=BigInteger)
     category_name: str = Field(default=None, max_length=120)
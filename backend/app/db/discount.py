@@ -5,7 +5,7 @@ This module defines the SQLModel for the Discount table, which represents
 temporary price reductions for books with specific start and end dates.
 """
 
-from sqlalchemy import BigInteger, Date, Numeric
+from sqlalchemy import BigInteger, Date, Index, Numeric
 from sqlmodel import Field
 
 from .base import Base
@@ -28,6 +28,23 @@ class Discount(Base, table=True):
     """
 
     __tablename__ = "discount"
+    __table_args__ = (
+        # Active discount lookup for one book (joins in listings and details)
+        Index(
+            "ix_discount_book_id_window",
+            "book_id",
+            "discount_start_date",
+            "discount_end_date",
+            postgresql_include=["discount_price"],
+        ),
+        # Range scan over currently active discounts (on sale listing)
+        Index(
+            "ix_discount_window",
+            "discount_end_date",
+            "discount_start_date",
+            postgresql_include=["book_id", "discount_price"],
+        ),
+    )
 
     id: int = Field(default=None, primary_key=True, sa_type=BigInteger)
     book_id: int = Field(default=None, foreign_key="book.id", sa_type=BigInteger)
@@ -5,7 +5,7 @@ This module defines the SQLModel for the Order table, which represents
 customer purchase orders with total amount and creation date.
 """
 
-from sqlalchemy import TIMESTAMP, BigInteger, Numeric
+from sqlalchemy import TIMESTAMP, BigInteger, Index, Numeric, text
 from sqlmodel import Field
 
 from .base import Base
@@ -27,6 +27,14 @@ class Order(Base, table=True):
     """
 
     __tablename__ = "order"
+    __table_args__ = (
+        Index(
+            "ix_order_user_id_order_date_id",
+            "user_id",
+            text("order_date DESC"),
+            text("id DESC"),
+        ),
+    )
 
     id: int = Field(default=None, primary_key=True, sa_type=BigInteger)
     user_id: int = Field(default=None, foreign_key="user.id", sa_type=BigInteger)
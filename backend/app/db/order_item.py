@@ -5,7 +5,7 @@ This module defines the SQLModel for the OrderItem table, which represents
 individual books within a customer order, including quantity and price.
 """
 
-from sqlalchemy import BigInteger, Numeric, SmallInteger
+from sqlalchemy import BigInteger, Index, Numeric, SmallInteger
 from sqlmodel import Field
 
 from .base import Base
@@ -28,6 +28,7 @@ class OrderItem(Base, table=True):
     """
 
     __tablename__ = "order_item"
+    __table_args__ = (Index("ix_order_item_order_id", "order_id"),)
 
     id: int = Field(default=None, primary_key=True, sa_type=BigInteger)
     order_id: int = Field(default=None, foreign_key="order.id", sa_type=BigInteger)
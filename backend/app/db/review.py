@@ -7,7 +7,7 @@ customer reviews and ratings for books in the bookstore.
 
 from typing import Optional
 
-from sqlalchemy import TIMESTAMP, BigInteger
+from sqlalchemy import TIMESTAMP, BigInteger, Index
 from sqlmodel import Field
 
 from .base import Base
@@ -31,6 +31,16 @@ class Review(Base, table=True):
     """
 
     __tablename__ = "review"
+    __table_args__ = (
+        Index("ix_review_book_id_date", "book_id", "review_date", "id"),
+        Index(
+            "ix_review_book_id_rating_date",
+            "book_id",
+            "rating_star",
+            "review_date",
+            "id",
+        ),
+    )
 
     id: int = Field(default=None, primary_key=True, sa_type=BigInteger)
     book_id: int = Field(default=None, foreign_key="book.id", sa_type=BigInteger)
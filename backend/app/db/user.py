@@ -5,7 +5,7 @@ This module defines the SQLModel for the User table, which represents
 registered users in the bookstore system with their credentials and roles.
 """
 
-from sqlalchemy import BigInteger, Boolean
+from sqlalchemy import BigInteger, Boolean, Index
 from sqlmodel import Field
 
 from .base import Base
@@ -28,6 +28,7 @@ class User(Base, table=True):
     """
 
     __tablename__ = "user"
+    __table_args__ = (Index("ix_user_email", "email"),)
 
     id: int = Field(default=None, primary_key=True, sa_type=BigInteger)
     first_name: str = Field(default=None, max_length=50)
@@ -136,6 +136,32 @@ class BookDetailResponse(BaseModel):
     book: BookDetail
 
 
+# Request for many book details at once
+class BookBatchRequest(BaseModel):
+    """
+    Request schema for looking up many books at once.
+
+    Attributes:
+        ids: IDs of the books to return
+    """
+
+    ids: List[int] = Field(..., min_length=1)
+
+
+# Response for many book details at once
+class BookBatchResponse(ItemsResponse[BookDetail]):
+    """
+    Response schema for the batch book lookup.
+
+    Contains the details of every found book, in the order requested.
+
+    Attributes:
+        missing_ids: Requested IDs for which no book exists
+    """
+
+    missing_ids: List[int] = []
+
+
 # ----- Common base for all book display types -----
 class BookDisplayBase(BaseModel):
     """
@@ -214,9 +240,16 @@ class PaginatedBooksResponse(PaginatedResponse[DiscountedBook]):
     Response schema for paginated book listings.
 
     Provides discounted book information with pagination metadata.
+    In cursor mode the total is only computed when requested, so total
+    and pages may be None.
+
+    Attributes:
+        next_cursor: Opaque cursor for the next page (cursor mode only)
     """
 
-    pass
+    total: Optional[int] = None
+    pages: Optional[int] = None
+    next_cursor: Optional[str] = None
 
 
 # Response for On Sale books
@@ -224,10 +257,13 @@ class BooksOnSaleResponse(ItemsResponse[DiscountedBook]):
     """
     Response schema for books currently on sale.
 
-    Contains a list of discounted books without pagination.
+    Contains a page of discounted books ordered by discount amount.
+
+    Attributes:
+        next_cursor: Opaque cursor for the next page, None on the last page
     """
 
-    pass
+    next_cursor: Optional[str] = None
 
 
 # Response for Recommended books
@@ -252,6 +288,38 @@ class PopularBooksResponse(ItemsResponse[PopularBook]):
     pass
 
 
+# Autocomplete suggestion
+class AutocompleteSuggestion(BaseModel):
+    """
+    Schema for one autocomplete suggestion.
+
+    Attributes:
+        kind: "book" for a book title, "author" for an author name
+        id: ID of the book or author
+        label: Title or name to display
+        popularity: Number of reviews (of all the author's books for authors)
+    """
+
+    kind: str
+    id: int
+    label: str
+    popularity: int
+
+    class Config:
+        from_attributes = True
+
+
+# Response for autocomplete
+class AutocompleteResponse(ItemsResponse[AutocompleteSuggestion]):
+    """
+    Response schema for autocomplete suggestions.
+
+    Contains the most popular matching books and authors.
+    """
+
+    pass
+
+
 # ----- Request Schema for Filtering -----
 class BookFilterRequest(BaseModel):
     """
@@ -269,6 +337,10 @@ class BookFilterRequest(BaseModel):
         author_ids_csv: Comma-separated string of author IDs (alternative format)
         rating_min: Minimum average rating to include (0-5)
         sort_by: Field to sort results by (onsale, popularity, price_asc, price_desc)
+        cursor_mode: Use keyset pagination instead of page numbers
+        cursor: Cursor returned as next_cursor by the previous page
+        include_total: Whether to count all matching books (cursor mode counts
+            only on the first page)
     """
 
     page: int = 1
@@ -288,3 +360,9 @@ class BookFilterRequest(BaseModel):
         None,
         pattern="^(onsale|popularity|price_asc|price_desc)$",
     )  # Allowed sort values
+    cursor_mode: bool = Field(
+        False,
+        description="Use keyset pagination; implied when a cursor is given",
+    )
+    cursor: Optional[str] = Field(None, description="Cursor from next_cursor")
+    include_total: bool = Field(True, description="Count all matching books")
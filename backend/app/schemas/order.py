@@ -8,7 +8,7 @@ order creation, order item management, and order retrieval.
 from datetime import datetime
 from typing import List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 # ----- Order Item Schemas -----
@@ -33,10 +33,17 @@ class OrderItemCreate(OrderItemBase):
     """
     Schema for creating a new order item.
 
-    Currently inherits all fields from OrderItemBase without modifications.
+    The price is resolved on the server from the current book price or
+    active discount; a price sent by the client is accepted for backward
+    compatibility but ignored.
+
+    Attributes:
+        quantity: Number of copies ordered (at least 1)
+        price: Ignored, priced by the server
     """
 
-    pass
+    quantity: int = Field(..., ge=1)
+    price: Optional[float] = None
 
 
 class OrderItemRead(OrderItemBase):
@@ -48,10 +55,14 @@ class OrderItemRead(OrderItemBase):
     Attributes:
         id: Unique identifier for the order item
         order_id: ID of the parent order
+        book_title: Title of the book (order history with include_books only)
+        book_cover_photo: Cover of the book (order history with include_books only)
     """
 
     id: int
     order_id: int
+    book_title: Optional[str] = None
+    book_cover_photo: Optional[str] = None
 
     class Config:
         from_attributes = True
@@ -138,6 +149,17 @@ class OrderResponse(OrderRead):
     pass
 
 
+class OrderBatchRequest(BaseModel):
+    """
+    Schema for creating many orders in one request (B2B customers).
+
+    Attributes:
+        orders: Orders to create, all in one transaction
+    """
+
+    orders: List[OrderRequest] = Field(..., min_length=1)
+
+
 class OrderListResponse(BaseModel):
     """
     Schema for listing multiple orders.
@@ -146,6 +168,9 @@ class OrderListResponse(BaseModel):
 
     Attributes:
         orders: List of orders
+        next_cursor: Opaque cursor for the next page of the order history,
+            None on the last page
     """
 
     orders: List[OrderResponse]
+    next_cursor: Optional[str] = None
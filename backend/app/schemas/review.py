@@ -7,7 +7,7 @@ by various criteria.
 """
 
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 from app.schemas.base import PaginatedResponse
 from pydantic import BaseModel, Field
@@ -64,14 +64,32 @@ class ReviewPostResponse(ReviewBase):
     pass
 
 
+class ReviewBulkResponse(BaseModel):
+    """
+    Response schema for bulk review ingestion.
+
+    Attributes:
+        inserted: Number of reviews stored
+        rejected: Number of reviews skipped because their book does not exist
+        missing_book_ids: Book IDs that were referenced but do not exist
+    """
+
+    inserted: int
+    rejected: int
+    missing_book_ids: List[int] = []
+
+
 class PaginatedReviewsResponse(PaginatedResponse[ReviewBase]):
     """
     Response schema for paginated book reviews.
 
     Provides review information with pagination metadata.
+
+    Attributes:
+        next_cursor: Opaque cursor for the next page (cursor mode only)
     """
 
-    pass
+    next_cursor: Optional[str] = None
 
 
 class ReviewFilterRequest(BaseModel):
@@ -87,6 +105,8 @@ class ReviewFilterRequest(BaseModel):
         per_page: Number of reviews per page (limited to specific values)
         rating: Optional filter to only show reviews with specific rating
         sort_order: How to sort reviews ('newest' or 'oldest')
+        cursor_mode: Use keyset pagination on (review_date, id) instead of pages
+        cursor: Cursor returned as next_cursor by the previous page
     """
 
     book_id: int = Field(..., description="Book ID")
@@ -99,3 +119,8 @@ class ReviewFilterRequest(BaseModel):
         description="Filter by rating star (1-5)",
     )
     sort_order: str = Field("newest", description="Sort order: 'newest' or 'oldest'")
+    cursor_mode: bool = Field(
+        False,
+        description="Use keyset pagination; implied when a cursor is given",
+    )
+    cursor: Optional[str] = Field(None, description="Cursor from next_cursor")
@@ -35,6 +35,16 @@ if config.config_file_name is not None:
 print(SQLModel.metadata.tables.keys())
 target_metadata = SQLModel.metadata
 
+# Database-maintained objects that are deliberately not mapped on the models
+# (book.search_vector is kept up to date by triggers, see app/core/search.py)
+UNMAPPED_OBJECTS = {("column", "search_vector"), ("index", "ix_book_search_vector")}
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    """Keep autogenerate from dropping the unmapped database objects."""
+    return not (reflected and compare_to is None and (type_, name) in UNMAPPED_OBJECTS)
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -59,6 +69,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -79,7 +90,11 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
+        )
 
         with context.begin_transaction():
             context.run_migrations()
@@ -0,0 +1,86 @@
+"""add catalog and review indexes
+
+Revision ID: 4b7e2d91c0a5
+Revises: c82d0fad36b8
+Create Date: 2026-10-17 09:12:44.318207
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "4b7e2d91c0a5"
+down_revision: Union[str, None] = "c82d0fad36b8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Book listing filters and title ordering (keyset on title, id)
+    op.create_index("ix_book_author_id", "book", ["author_id"])
+    op.create_index("ix_book_category_id", "book", ["category_id"])
+    op.create_index("ix_book_book_title_id", "book", ["book_title", "id"])
+
+    # Active discount lookup per book and range scan over active discounts
+    op.create_index(
+        "ix_discount_book_id_window",
+        "discount",
+        ["book_id", "discount_start_date", "discount_end_date"],
+        postgresql_include=["discount_price"],
+    )
+    op.create_index(
+        "ix_discount_window",
+        "discount",
+        ["discount_end_date", "discount_start_date"],
+        postgresql_include=["book_id", "discount_price"],
+    )
+
+    # Review pages (keyset on review_date, id) with and without rating filter
+    op.create_index(
+        "ix_review_book_id_date",
+        "review",
+        ["book_id", "review_date", "id"],
+    )
+    op.create_index(
+        "ix_review_book_id_rating_date",
+        "review",
+        ["book_id", "rating_star", "review_date", "id"],
+    )
+
+    # Recommended books only ever look at reviewed books
+    op.create_index(
+        "ix_book_stats_recommended",
+        "book_stats",
+        [sa.text("avg_rating DESC"), "lowest_price"],
+        postgresql_where=sa.text("review_count > 0"),
+    )
+
+    # Order history and order items
+    op.create_index("ix_order_user_id_id", "order", ["user_id", "id"])
+    op.create_index("ix_order_item_order_id", "order_item", ["order_id"])
+
+    # Login / registration lookups and sorted dimension listings
+    op.create_index("ix_user_email", "user", ["email"])
+    op.create_index("ix_author_author_name", "author", ["author_name"])
+    op.create_index("ix_category_category_name", "category", ["category_name"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_category_category_name", table_name="category")
+    op.drop_index("ix_author_author_name", table_name="author")
+    op.drop_index("ix_user_email", table_name="user")
+    op.drop_index("ix_order_item_order_id", table_name="order_item")
+    op.drop_index("ix_order_user_id_id", table_name="order")
+    op.drop_index("ix_book_stats_recommended", table_name="book_stats")
+    op.drop_index("ix_review_book_id_rating_date", table_name="review")
+    op.drop_index("ix_review_book_id_date", table_name="review")
+    op.drop_index("ix_discount_window", table_name="discount")
+    op.drop_index("ix_discount_book_id_window", table_name="discount")
+    op.drop_index("ix_book_book_title_id", table_name="book")
+    op.drop_index("ix_book_category_id", table_name="book")
+    op.drop_index("ix_book_author_id", table_name="book")
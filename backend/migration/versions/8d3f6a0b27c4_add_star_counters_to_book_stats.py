@@ -0,0 +1,56 @@
+"""add star counters to book stats
+
+Revision ID: 8d3f6a0b27c4
+Revises: 4b7e2d91c0a5
+Create Date: 2026-10-17 10:03:27.551902
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8d3f6a0b27c4"
+down_revision: Union[str, None] = "4b7e2d91c0a5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+STAR_COLUMNS = ["star_1", "star_2", "star_3", "star_4", "star_5"]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for column in STAR_COLUMNS:
+        op.add_column(
+            "book_stats",
+            sa.Column(column, sa.Integer(), nullable=False, server_default="0"),
+        )
+
+    # Backfill the counters from existing reviews in one grouped pass
+    op.execute("""
+        UPDATE book_stats s
+        SET star_1 = r.star_1,
+            star_2 = r.star_2,
+            star_3 = r.star_3,
+            star_4 = r.star_4,
+            star_5 = r.star_5
+        FROM (
+            SELECT book_id,
+                   COUNT(id) FILTER (WHERE rating_star = 1) AS star_1,
+                   COUNT(id) FILTER (WHERE rating_star = 2) AS star_2,
+                   COUNT(id) FILTER (WHERE rating_star = 3) AS star_3,
+                   COUNT(id) FILTER (WHERE rating_star = 4) AS star_4,
+                   COUNT(id) FILTER (WHERE rating_star = 5) AS star_5
+            FROM review
+            GROUP BY book_id
+        ) r
+        WHERE s.id = r.book_id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for column in reversed(STAR_COLUMNS):
+        op.drop_column("book_stats", column)
@@ -0,0 +1,33 @@
+"""add book stats popularity index
+
+Revision ID: a61c94e3f5d8
+Revises: 8d3f6a0b27c4
+Create Date: 2026-10-17 11:20:51.604337
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a61c94e3f5d8"
+down_revision: Union[str, None] = "8d3f6a0b27c4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Top-N popular books are read in index order (review_count DESC)
+    op.create_index(
+        "ix_book_stats_popularity",
+        "book_stats",
+        [sa.text("review_count DESC"), "lowest_price", "id"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_book_stats_popularity", table_name="book_stats")
@@ -0,0 +1,101 @@
+"""add book search vector
+
+Revision ID: b5d1f7c03e96
+Revises: e07b5c2d93a1
+Create Date: 2026-10-17 13:21:44.108532
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "b5d1f7c03e96"
+down_revision: Union[str, None] = "e07b5c2d93a1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must match SEARCH_CONFIG in app/core/search.py
+SEARCH_VECTOR_SQL = """
+    setweight(to_tsvector('english', coalesce({title}, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce({author}, '')), 'B') ||
+    setweight(to_tsvector('english', coalesce({summary}, '')), 'C')
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "book",
+        sa.Column("search_vector", postgresql.TSVECTOR(), nullable=True),
+    )
+
+    # Recompute a book's vector whenever its text or author changes
+    new_vector = SEARCH_VECTOR_SQL.format(
+        title="NEW.book_title",
+        author="(SELECT author_name FROM author WHERE id = NEW.author_id)",
+        summary="NEW.book_summary",
+    )
+    op.execute(f"""
+        CREATE FUNCTION book_search_vector_update() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector := {new_vector};
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER book_search_vector_trigger
+        BEFORE INSERT OR UPDATE OF book_title, book_summary, author_id ON book
+        FOR EACH ROW EXECUTE FUNCTION book_search_vector_update()
+    """)
+
+    # Renaming an author touches its books, which fires the trigger above
+    op.execute("""
+        CREATE FUNCTION author_search_vector_update() RETURNS trigger AS $$
+        BEGIN
+            UPDATE book SET author_id = author_id WHERE author_id = NEW.id;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER author_search_vector_trigger
+        AFTER UPDATE OF author_name ON author
+        FOR EACH ROW
+        WHEN (OLD.author_name IS DISTINCT FROM NEW.author_name)
+        EXECUTE FUNCTION author_search_vector_update()
+    """)
+
+    # Backfill existing books in one pass
+    backfill_vector = SEARCH_VECTOR_SQL.format(
+        title="b.book_title",
+        author="a.author_name",
+        summary="b.book_summary",
+    )
+    op.execute(f"""
+        UPDATE book b
+        SET search_vector = {backfill_vector}
+        FROM author a
+        WHERE a.id = b.author_id
+    """)
+
+    op.create_index(
+        "ix_book_search_vector",
+        "book",
+        ["search_vector"],
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_book_search_vector", table_name="book")
+    op.execute("DROP TRIGGER author_search_vector_trigger ON author")
+    op.execute("DROP FUNCTION author_search_vector_update()")
+    op.execute("DROP TRIGGER book_search_vector_trigger ON book")
+    op.execute("DROP FUNCTION book_search_vector_update()")
+    op.drop_column("book", "search_vector")
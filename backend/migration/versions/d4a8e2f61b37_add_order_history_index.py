@@ -0,0 +1,36 @@
+"""add order history index
+
+Revision ID: d4a8e2f61b37
+Revises: b5d1f7c03e96
+Create Date: 2026-10-17 14:05:12.736019
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d4a8e2f61b37"
+down_revision: Union[str, None] = "b5d1f7c03e96"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Order history pages are read in index order (keyset on order_date, id);
+    # the new index also serves plain user_id lookups, so it replaces the old one
+    op.create_index(
+        "ix_order_user_id_order_date_id",
+        "order",
+        ["user_id", sa.text("order_date DESC"), sa.text("id DESC")],
+    )
+    op.drop_index("ix_order_user_id_id", table_name="order")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index("ix_order_user_id_id", "order", ["user_id", "id"])
+    op.drop_index("ix_order_user_id_order_date_id", table_name="order")
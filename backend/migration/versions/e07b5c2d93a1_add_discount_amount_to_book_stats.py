@@ -0,0 +1,49 @@
+"""add discount amount to book stats
+
+Revision ID: e07b5c2d93a1
+Revises: a61c94e3f5d8
+Create Date: 2026-10-17 11:48:09.217364
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e07b5c2d93a1"
+down_revision: Union[str, None] = "a61c94e3f5d8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "book_stats",
+        sa.Column("discount_amount", sa.Float(), nullable=False, server_default="0"),
+    )
+
+    # lowest_price already reflects the active discounts
+    op.execute("""
+        UPDATE book_stats s
+        SET discount_amount = b.book_price - s.lowest_price
+        FROM book b
+        WHERE s.id = b.id
+          AND s.lowest_price < b.book_price
+    """)
+
+    # Books on sale ranked by discount, only books that have one are indexed
+    op.create_index(
+        "ix_book_stats_on_sale",
+        "book_stats",
+        [sa.text("discount_amount DESC"), sa.text("id DESC")],
+        postgresql_where=sa.text("discount_amount > 0"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_book_stats_on_sale", table_name="book_stats")
+    op.drop_column("book_stats", "discount_amount")
@@ -0,0 +1,37 @@
+"""add book stock
+
+Revision ID: f2c6a9d14e70
+Revises: d4a8e2f61b37
+Create Date: 2026-10-17 15:12:40.291806
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f2c6a9d14e70"
+down_revision: Union[str, None] = "d4a8e2f61b37"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # No rows are created: books without stock rows are not stock-tracked
+    op.create_table(
+        "book_stock",
+        sa.Column("book_id", sa.BigInteger(), nullable=False),
+        sa.Column("stripe", sa.SmallInteger(), nullable=False),
+        sa.Column("quantity", sa.Integer(), nullable=False),
+        sa.CheckConstraint("quantity >= 0", name="ck_book_stock_quantity"),
+        sa.ForeignKeyConstraint(["book_id"], ["book.id"]),
+        sa.PrimaryKeyConstraint("book_id", "stripe"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("book_stock")
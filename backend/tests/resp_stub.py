@@ -0,0 +1,121 @@
+"""
+In-process server speaking the Redis protocol (RESP2), for tests.
+
+Implements the commands used by RedisCacheBackend (AUTH, SELECT, GET,
+SET with PX and NX, DEL, INCR) over a real TCP socket, so the client is
+tested end to end without a Redis server. drop_connections() closes every
+client connection from the server side to exercise reconnects.
+"""
+
+import socket
+import socketserver
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        self.server.connections.append(self.connection)
+        while True:
+            try:
+                args = self._read_command()
+            except (OSError, ValueError):
+                return
+            if args is None:
+                return
+            self.wfile.write(self.server.execute(args))
+
+    def _read_command(self) -> Optional[List[bytes]]:
+        line = self.rfile.readline()
+        if not line:
+            return None
+        args = []
+        for _ in range(int(line[1:-2])):
+            length = int(self.rfile.readline()[1:-2])
+            args.append(self.rfile.read(length + 2)[:-2])
+        return args
+
+
+class RespStub(socketserver.ThreadingTCPServer):
+    """
+    Minimal Redis stand-in listening on a free local port.
+
+    Attributes:
+        commands: Names of the commands received, in order
+        connections: Client sockets accepted so far
+    """
+
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, password: Optional[str] = None):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.password = password
+        self.commands: List[str] = []
+        self.connections: List[socket.socket] = []
+        self._data: Dict[bytes, Tuple[bytes, Optional[float]]] = {}
+        self._lock = threading.Lock()
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    @property
+    def url(self) -> str:
+        auth = f":{self.password}@" if self.password else ""
+        return f"redis://{auth}127.0.0.1:{self.server_address[1]}/0"
+
+    def _live(self, key: bytes) -> Optional[bytes]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        return value
+
+    def execute(self, args: List[bytes]) -> bytes:
+        name = args[0].decode().upper()
+        with self._lock:
+            self.commands.append(name)
+            if name == "AUTH":
+                if args[1].decode() != self.password:
+                    return b"-WRONGPASS invalid password\r\n"
+                return b"+OK\r\n"
+            if name == "SELECT":
+                return b"+OK\r\n"
+            if name == "GET":
+                value = self._live(args[1])
+                if value is None:
+                    return b"$-1\r\n"
+                return b"$%d\r\n%s\r\n" % (len(value), value)
+            if name == "SET":
+                options = [arg.upper() for arg in args[3:]]
+                if b"NX" in options and self._live(args[1]) is not None:
+                    return b"$-1\r\n"
+                expires_at = None
+                if b"PX" in options:
+                    milliseconds = int(options[options.index(b"PX") + 1])
+                    expires_at = time.monotonic() + milliseconds / 1000
+                self._data[args[1]] = (args[2], expires_at)
+                return b"+OK\r\n"
+            if name == "DEL":
+                return b":%d\r\n" % (self._data.pop(args[1], None) is not None)
+            if name == "INCR":
+                value = self._live(args[1])
+                try:
+                    counter = int(value or 0) + 1
+                except ValueError:
+                    return b"-ERR value is not an integer or out of range\r\n"
+                self._data[args[1]] = (str(counter).encode(), None)
+                return b":%d\r\n" % counter
+            return b"-ERR unknown command '%s'\r\n" % name.encode()
+
+    def drop_connections(self) -> None:
+        """Close every client connection from the server side."""
+        for connection in self.connections:
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            connection.close()
+        self.connections.clear()
@@ -0,0 +1,128 @@
+"""Tests for the cache backends and namespaces in app.core.cache."""
+
+import asyncio
+import time
+
+import pytest
+from app.core.cache import (
+    CacheError,
+    CacheMetrics,
+    CacheNamespace,
+    LocalCacheBackend,
+    RedisCacheBackend,
+)
+from tests.resp_stub import RespStub
+
+
+@pytest.fixture
+def stub():
+    server = RespStub()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def redis(stub):
+    return RedisCacheBackend(stub.url)
+
+
+def test_redis_get_missing_key(redis):
+    assert redis.get("missing") is None
+
+
+def test_redis_set_and_get(redis):
+    redis.set("key", b"value", 60)
+    assert redis.get("key") == b"value"
+
+
+def test_redis_set_expires_after_ttl(redis):
+    redis.set("key", b"value", 0.05)
+    assert redis.get("key") == b"value"
+    time.sleep(0.1)
+    assert redis.get("key") is None
+
+
+def test_redis_delete(redis):
+    redis.set("key", b"value", 60)
+    redis.delete("key")
+    assert redis.get("key") is None
+    # Deleting a missing key is not an error
+    redis.delete("key")
+
+
+def test_redis_incr(redis):
+    assert redis.incr("counter") == 1
+    assert redis.incr("counter") == 2
+    assert redis.get("counter") == b"2"
+
+
+def test_redis_error_reply_raises_and_keeps_connection(stub, redis):
+    redis.set("text", b"not a number", 60)
+    with pytest.raises(CacheError):
+        redis.incr("text")
+    assert redis.get("text") == b"not a number"
+    assert len(stub.connections) == 1
+
+
+def test_redis_authenticates_on_connect():
+    server = RespStub(password="secret")
+    try:
+        redis = RedisCacheBackend(server.url)
+        redis.set("key", b"value", 60)
+        assert server.commands[:2] == ["AUTH", "SET"]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_redis_reconnects_after_connection_failure(stub, redis):
+    redis.set("key", b"value", 60)
+    stub.drop_connections()
+
+    # The pooled connection is dead: the command fails and it is discarded
+    with pytest.raises(CacheError):
+        redis.get("key")
+    # The next command opens a new connection
+    assert redis.get("key") == b"value"
+    assert len(stub.connections) == 1
+
+
+def test_redis_unreachable_server_raises_cache_error(stub):
+    redis = RedisCacheBackend(stub.url, timeout=0.2)
+    stub.shutdown()
+    stub.server_close()
+    with pytest.raises(CacheError):
+        redis.get("key")
+
+
+def test_namespace_invalidate_hides_old_entries():
+    namespace = CacheNamespace("test", 60, LocalCacheBackend(), CacheMetrics())
+
+    async def scenario():
+        first = await namespace.get_or_load("1", lambda: {"value": "old"})
+        namespace.invalidate()
+        second = await namespace.get_or_load("1", lambda: {"value": "new"})
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert b'"old"' in first
+    assert b'"new"' in second
+
+
+def test_namespace_delete_during_load_does_not_cache_stale_value():
+    namespace = CacheNamespace("test", 60, LocalCacheBackend(), CacheMetrics())
+
+    async def scenario():
+        async def slow_load():
+            await asyncio.sleep(0.05)
+            return {"value": "old"}
+
+        # The key is deleted (a write committed) while the load is running
+        load = asyncio.create_task(namespace.get_or_load("1", slow_load))
+        await asyncio.sleep(0.01)
+        namespace.delete("1")
+        await load
+        return await namespace.get_or_load("1", lambda: {"value": "new"})
+
+    assert b'"new"' in asyncio.run(scenario())
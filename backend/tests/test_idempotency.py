@@ -0,0 +1,130 @@
+"""Tests for the Idempotency-Key handling in app.core.idempotency."""
+
+import asyncio
+
+import app.core.idempotency as idempotency_module
+import httpx
+import pytest
+from app.core.cache import LocalCacheBackend
+from app.core.idempotency import (
+    IDEMPOTENCY_HEADER,
+    REPLAYED_HEADER,
+    Idempotency,
+    idempotency_guard,
+)
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+
+class Orders:
+    """A minimal app whose write endpoint is guarded by idempotency keys."""
+
+    def __init__(self):
+        self.attempts = 0
+        self.created = []
+        # Set by a test to hold requests until released
+        self.started = None
+        self.release = None
+        self.app = FastAPI()
+
+        @self.app.post("/orders", status_code=201)
+        async def create_order(
+            order: dict,
+            idempotency: Idempotency = Depends(idempotency_guard),
+        ):
+            if idempotency.replay:
+                return idempotency.replay
+            self.attempts += 1
+            if order.get("fail"):
+                raise HTTPException(status_code=400, detail="Rejected")
+            if self.release is not None:
+                self.started.set()
+                await self.release.wait()
+            self.created.append(order)
+            return await idempotency.respond(201, {"order": len(self.created)})
+
+
+@pytest.fixture
+def orders(monkeypatch):
+    monkeypatch.setattr(idempotency_module, "idempotency_store", LocalCacheBackend(100))
+    return Orders()
+
+
+@pytest.fixture
+def client(orders):
+    with TestClient(orders.app) as client:
+        yield client
+
+
+def _post(client, order, key="key-1"):
+    return client.post("/orders", json=order, headers={IDEMPOTENCY_HEADER: key})
+
+
+def test_retry_replays_the_first_response(client, orders):
+    first = _post(client, {"user_id": 1})
+    retry = _post(client, {"user_id": 1})
+
+    assert first.status_code == retry.status_code == 201
+    assert retry.json() == first.json() == {"order": 1}
+    assert retry.headers[REPLAYED_HEADER] == "true"
+    assert REPLAYED_HEADER not in first.headers
+    assert len(orders.created) == 1
+
+
+def test_requests_without_key_always_run(client, orders):
+    client.post("/orders", json={"user_id": 1})
+    client.post("/orders", json={"user_id": 1})
+    assert len(orders.created) == 2
+
+
+def test_key_reused_with_another_body_is_rejected(client, orders):
+    _post(client, {"user_id": 1, "book_id": 1})
+    response = _post(client, {"user_id": 1, "book_id": 2})
+
+    assert response.status_code == 422
+    assert len(orders.created) == 1
+
+
+def test_request_in_flight_gets_conflict(orders):
+    async def scenario():
+        orders.started = asyncio.Event()
+        orders.release = asyncio.Event()
+        transport = httpx.ASGITransport(app=orders.app)
+        async with httpx.AsyncClient(
+            transport=transport,
+            base_url="http://test",
+        ) as client:
+            headers = {IDEMPOTENCY_HEADER: "key-1"}
+            first = asyncio.create_task(
+                client.post("/orders", json={"user_id": 1}, headers=headers),
+            )
+            await orders.started.wait()
+            second = await client.post("/orders", json={"user_id": 1}, headers=headers)
+            orders.release.set()
+            return await first, second
+
+    first, second = asyncio.run(scenario())
+    assert first.status_code == 201
+    assert second.status_code == 409
+    assert len(orders.created) == 1
+
+
+def test_failed_request_releases_its_key(client, orders):
+    assert _post(client, {"user_id": 1, "fail": True}).status_code == 400
+    assert _post(client, {"user_id": 1, "fail": True}).status_code == 400
+    assert orders.attempts == 2
+
+    # The key is free again, so it is not tied to the failed request's body
+    response = _post(client, {"user_id": 1})
+    assert response.status_code == 201
+    assert len(orders.created) == 1
+
+
+def test_keys_are_scoped_to_the_caller(client, orders):
+    first = _post(client, {"user_id": 1})
+    second = _post(client, {"user_id": 2})
+
+    assert first.status_code == second.status_code == 201
+    assert REPLAYED_HEADER not in second.headers
+    assert second.json() == {"order": 2}
+    assert len(orders.created) == 2
@@ -0,0 +1,62 @@
+"""Tests for the cursor helpers in app.core.pagination."""
+
+import pytest
+from app.core.pagination import decode_cursor, encode_cursor, keyset_condition
+from app.db.book import Book
+from app.db.bookstats import BookStats
+from app.db.review import Review
+from fastapi import HTTPException
+from sqlalchemy import func
+
+PRICE_KEYS = [
+    (func.coalesce(BookStats.lowest_price, Book.book_price), False),
+    (Book.book_title, False),
+    (Book.id, False),
+]
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor("price_asc", ["12.50", "Title", 7])
+    assert decode_cursor(cursor, "price_asc", 3) == ["12.50", "Title", 7]
+
+
+def test_cursor_of_another_sort_mode_is_rejected():
+    cursor = encode_cursor("price_asc", ["12.50", "Title", 7])
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor, "price_desc", 3)
+    assert error.value.status_code == 400
+
+
+def test_garbled_cursor_is_rejected():
+    with pytest.raises(HTTPException) as error:
+        decode_cursor("not a cursor!", "price_asc", 3)
+    assert error.value.status_code == 400
+
+
+def test_keyset_condition_accepts_encoded_values():
+    values = decode_cursor(
+        encode_cursor("price_asc", ["12.50", "Title", 7]),
+        "price_asc",
+        3,
+    )
+    assert keyset_condition(PRICE_KEYS, values) is not None
+
+
+@pytest.mark.parametrize(
+    "keys, values",
+    [
+        (PRICE_KEYS, ["abc", "Title", 7]),
+        (PRICE_KEYS, ["12.50", "Title", "7"]),
+        (PRICE_KEYS, ["12.50", 3, 7]),
+        ([(Review.review_date, True), (Review.id, True)], ["yesterday", 7]),
+        ([(Review.review_date, True), (Review.id, True)], [12, 7]),
+    ],
+)
+def test_keyset_condition_rejects_malformed_values(keys, values):
+    # The cursor has the right shape, but its values do not fit the sort keys
+    mode = "test"
+    cursor = encode_cursor(mode, values)
+    decoded = decode_cursor(cursor, mode, len(keys))
+    with pytest.raises(HTTPException) as error:
+        keyset_condition(keys, decoded)
+    assert error.value.status_code == 400
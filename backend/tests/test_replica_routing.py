@@ -0,0 +1,183 @@
+"""
+Tests for read replica routing in app.core.db_config.
+
+SQLite files stand in for the primary and the replicas; a replica URL in a
+missing directory stands in for a replica that cannot be reached.
+"""
+
+import asyncio
+import threading
+
+import app.core.db_config as db_config
+import pytest
+from app.api.main import read_your_writes
+from app.core.db_config import (
+    READ_PRIMARY_COOKIE,
+    ReplicaRouter,
+    get_read_db,
+    read_only_endpoint,
+)
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from starlette.requests import Request
+
+
+def _engine(path):
+    return create_async_engine(f"sqlite+aiosqlite:///{path}")
+
+
+def _factory(engine):
+    return async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+
+def _request(cookies=None):
+    headers = []
+    if cookies:
+        cookie = "; ".join(f"{name}={value}" for name, value in cookies.items())
+        headers.append((b"cookie", cookie.encode()))
+    return Request({"type": "http", "method": "GET", "headers": headers})
+
+
+async def _served_by(request):
+    """Return the engine of the session get_read_db provides for a request."""
+    dependency = get_read_db(request)
+    session = await dependency.__anext__()
+    engine = session.bind
+    await dependency.aclose()
+    return engine
+
+
+async def _join_sqlite_threads():
+    """
+    Wait for the aiosqlite worker threads to stop.
+
+    A failed connect stops its thread in the background, and the thread then
+    reports back to the event loop; it must not outlive the loop.
+    """
+    for thread in threading.enumerate():
+        if thread.name.endswith("(_connection_worker_thread)"):
+            await asyncio.to_thread(thread.join, 5)
+
+
+class Databases:
+    """SQLite primary and replicas patched into db_config for one test."""
+
+    def __init__(self, tmp_path, monkeypatch):
+        self.tmp_path = tmp_path
+        self.monkeypatch = monkeypatch
+        self.primary = _engine(tmp_path / "primary.db")
+        self.engines = [self.primary]
+        monkeypatch.setattr(db_config, "async_session_factory", _factory(self.primary))
+
+    def use_replicas(self, *names):
+        """Configure replicas by file name; names containing "/" do not exist."""
+        replicas = [_engine(self.tmp_path / name) for name in names]
+        self.engines.extend(replicas)
+        self.monkeypatch.setattr(
+            db_config,
+            "replica_router",
+            ReplicaRouter([_factory(replica) for replica in replicas]),
+        )
+        return replicas
+
+    def served_by(self, *requests):
+        """Return the engine serving each request, in one event loop."""
+
+        async def scenario():
+            try:
+                return [await _served_by(request) for request in requests]
+            finally:
+                for engine in self.engines:
+                    await engine.dispose()
+                await _join_sqlite_threads()
+
+        return asyncio.run(scenario())
+
+
+@pytest.fixture
+def databases(tmp_path, monkeypatch):
+    return Databases(tmp_path, monkeypatch)
+
+
+def test_reads_rotate_over_replicas(databases):
+    first, second = databases.use_replicas("r0.db", "r1.db")
+
+    served = databases.served_by(*[_request() for _ in range(4)])
+    assert served == [first, second, first, second]
+
+
+def test_unreachable_replica_is_skipped(databases):
+    dead, alive = databases.use_replicas("missing/r0.db", "r1.db")
+
+    assert databases.served_by(_request(), _request(), _request()) == [alive] * 3
+    # Marked down: it is not retried on every request
+    assert db_config.replica_router.candidates() == [1]
+
+
+def test_primary_serves_reads_when_no_replica_is_reachable(databases):
+    databases.use_replicas("missing/r0.db")
+
+    assert databases.served_by(_request()) == [databases.primary]
+
+
+def test_primary_serves_reads_without_replicas(databases):
+    databases.use_replicas()
+
+    assert databases.served_by(_request()) == [databases.primary]
+
+
+def test_read_primary_cookie_pins_reads_to_primary(databases):
+    databases.use_replicas("r0.db")
+
+    pinned = _request({READ_PRIMARY_COOKIE: "1"})
+    assert databases.served_by(pinned, _request()) == [
+        databases.primary,
+        databases.engines[1],
+    ]
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """A minimal app with the read-your-writes middleware and replicas enabled."""
+    monkeypatch.setattr(db_config, "replica_engines", [object()])
+    app = FastAPI()
+    app.middleware("http")(read_your_writes)
+
+    @app.post("/write")
+    async def write():
+        return {}
+
+    @app.post("/lookup")
+    @read_only_endpoint
+    async def lookup():
+        return {}
+
+    @app.post("/fail")
+    async def fail():
+        return JSONResponse({}, status_code=400)
+
+    @app.get("/read")
+    async def read():
+        return {}
+
+    with TestClient(app) as client:
+        yield client
+
+
+def test_successful_write_sets_read_primary_cookie(client):
+    response = client.post("/write")
+    assert response.cookies.get(READ_PRIMARY_COOKIE) == "1"
+    cookie = response.headers["set-cookie"].lower()
+    assert "httponly" in cookie
+    assert f"max-age={db_config.database_settings.replica_sticky_seconds}" in cookie
+
+
+@pytest.mark.parametrize(
+    ("method", "path"),
+    [("post", "/lookup"), ("post", "/fail"), ("get", "/read")],
+)
+def test_reads_and_failed_writes_do_not_pin(client, method, path):
+    response = getattr(client, method)(path)
+    assert READ_PRIMARY_COOKIE not in response.cookies
@@ -0,0 +1,64 @@
+"""Tests for the fallback search index in app.core.search."""
+
+import pytest
+from app.core.search import FIELD_WEIGHTS, TrigramIndex, prefix_tsquery, search_terms
+
+
+@pytest.fixture
+def index():
+    return TrigramIndex(
+        [
+            (1, {"title": "Harry Potter", "author": "J. K. Rowling", "summary": None}),
+            (2, {"title": "Gardening", "author": "Harry Brown", "summary": "Roses"}),
+            (3, {"title": "Cooking", "author": "Ann Lee", "summary": "Harry cooks"}),
+            (4, {"title": "The Hobbit", "author": "J. R. R. Tolkien", "summary": ""}),
+        ],
+    )
+
+
+def test_search_terms_drops_punctuation_and_operators():
+    assert search_terms("Harry's  POTTER & (stone)!") == ["harrys", "potter", "stone"]
+
+
+def test_prefix_tsquery_requires_every_term():
+    assert prefix_tsquery(["harri", "pot"]) == "harri:* & pot:*"
+
+
+def test_title_ranks_above_author_above_summary(index):
+    scores = index.search("harry")
+
+    assert sorted(scores, key=scores.get, reverse=True) == [1, 2, 3]
+    assert scores == {
+        1: FIELD_WEIGHTS["title"],
+        2: FIELD_WEIGHTS["author"],
+        3: FIELD_WEIGHTS["summary"],
+    }
+
+
+def test_prefix_matches_with_full_similarity(index):
+    assert index.search("hob") == {4: FIELD_WEIGHTS["title"]}
+    assert index.search("harry pot") == {1: 2 * FIELD_WEIGHTS["title"]}
+
+
+def test_typo_matches_with_lower_score(index):
+    exact = index.search("harry potter")[1]
+    typo = index.search("hary poter")
+
+    assert list(typo) == [1]
+    assert 0 < typo[1] < exact
+
+
+def test_dissimilar_word_does_not_match(index):
+    assert index.search("hurdy") == {}
+
+
+def test_every_term_must_match(index):
+    assert index.search("harry hobbit") == {}
+    assert index.search("harry roses") == {
+        2: FIELD_WEIGHTS["author"] + FIELD_WEIGHTS["summary"],
+    }
+
+
+def test_empty_search_matches_nothing(index):
+    assert index.search("") == {}
+    assert index.search("&!") == {}
@@ -0,0 +1,111 @@
+"""Tests for the stock reservation in app.core.stock."""
+
+import asyncio
+
+import pytest
+from app.core.stock import (
+    InsufficientStockError,
+    clear_stock,
+    reserve_stock,
+    set_stock,
+    stock_levels,
+)
+from app.db.book_stock import BookStock
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+
+@pytest.fixture
+def run(tmp_path):
+    """Run a coroutine function with a session on a fresh SQLite database."""
+
+    def run(scenario):
+        async def main():
+            engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'stock.db'}")
+            try:
+                async with engine.begin() as conn:
+                    await conn.run_sync(BookStock.__table__.create)
+                async with AsyncSession(engine) as session:
+                    return await scenario(session)
+            finally:
+                await engine.dispose()
+
+        return asyncio.run(main())
+
+    return run
+
+
+async def _stripes(session: AsyncSession, book_id: int) -> list:
+    rows = await session.scalars(
+        select(BookStock.quantity)
+        .filter(BookStock.book_id == book_id)
+        .order_by(BookStock.stripe),
+    )
+    return list(rows)
+
+
+def test_set_stock_splits_evenly(run):
+    async def scenario(session):
+        await set_stock(session, 1, 10, stripes=4)
+        first = await _stripes(session, 1)
+        await set_stock(session, 1, 3, stripes=2)
+        return first, await _stripes(session, 1)
+
+    first, replaced = run(scenario)
+    assert first == [3, 3, 2, 2]
+    assert replaced == [2, 1]
+
+
+def test_reserve_takes_from_fullest_stripe(run):
+    async def scenario(session):
+        await set_stock(session, 1, 10, stripes=4)
+        await reserve_stock(session, [(1, 2)])
+        return await _stripes(session, 1)
+
+    assert run(scenario) == [1, 3, 2, 2]
+
+
+def test_reserve_spans_several_stripes(run):
+    # SQLite always takes the locked fallback path, which can combine stripes
+    async def scenario(session):
+        await set_stock(session, 1, 8, stripes=4)
+        await reserve_stock(session, [(1, 3), (1, 2)])
+        return await _stripes(session, 1), await stock_levels(session, [1])
+
+    stripes, levels = run(scenario)
+    assert stripes == [0, 0, 1, 2]
+    assert levels == {1: 3}
+
+
+def test_whole_stock_can_be_sold(run):
+    async def scenario(session):
+        await set_stock(session, 1, 5, stripes=3)
+        await reserve_stock(session, [(1, 5)])
+        return await stock_levels(session, [1])
+
+    assert run(scenario) == {1: 0}
+
+
+def test_insufficient_stock_reserves_nothing(run):
+    async def scenario(session):
+        await set_stock(session, 1, 5, stripes=2)
+        await set_stock(session, 2, 1, stripes=2)
+        await set_stock(session, 3, 9, stripes=2)
+        with pytest.raises(InsufficientStockError) as error:
+            await reserve_stock(session, [(3, 1), (2, 2), (1, 6)])
+        return error.value, await stock_levels(session, [1, 2, 3])
+
+    error, levels = run(scenario)
+    assert error.book_ids == [1, 2]
+    assert levels == {1: 5, 2: 1, 3: 9}
+
+
+def test_untracked_books_are_not_limited(run):
+    async def scenario(session):
+        await set_stock(session, 1, 2, stripes=2)
+        await reserve_stock(session, [(1, 1), (2, 1000)])
+        await clear_stock(session, [1])
+        await reserve_stock(session, [(1, 1000)])
+        return await stock_levels(session, [1, 2])
+
+    assert run(scenario) == {}
@@ -9,7 +9,7 @@ import { useAuth } from "../hooks/useAuth";
 import { getUserDetails } from "../api/auth";
 import { useNavigate } from "react-router-dom";
 import { dispatchCartUpdateEvent } from "../hooks/useCartEvents";
-import { getBookDetails, BookDetailResponse } from "../api/book";
+import { getBookDetailsBatch } from "../api/book";
 import { openLoginDialog } from '@/components/Navbar/Navbar';
 import { useTranslation } from 'react-i18next';
 
@@ -34,7 +34,16 @@ interface ApiErrorResponse {
 
 /* Main Cart Page Component */
 export default function CartPage() {
-    const { cartItemsWithDetails, orderTotal, loading, error, updateItemQuantity, refreshCart } = useCartDetails();
+    const {
+        cartItemsWithDetails,
+        orderTotal,
+        loading,
+        error,
+        removedItemCount,
+        dismissRemovedItems,
+        updateItemQuantity,
+        refreshCart
+    } = useCartDetails();
     const { t } = useTranslation();
     const [isPlacingOrder, setIsPlacingOrder] = useState(false);
     const [orderError, setOrderError] = useState<string | null>(null);
@@ -69,31 +78,31 @@ export default function CartPage() {
         try {
             const invalidItems: InvalidBookData[] = [];
 
+            /* Get the latest data of every book in the cart in batch requests */
+            const response = await getBookDetailsBatch(cartItemsWithDetails.map(item => item.id));
+            const booksById = new Map(response.items.map(book => [book.id, book]));
+
             /* Check each book in the cart */
             for (const item of cartItemsWithDetails) {
-                try {
-                    /* Get the latest book data from the API */
-                    const response: BookDetailResponse = await getBookDetails(item.id);
-                    const currentBookData = response.book;
-
-                    /* Check if the discount price matches what we have in cart */
-                    if (item.discount_price !== null && item.discount_price !== currentBookData.discount_price) {
-                        invalidItems.push({
-                            id: item.id,
-                            name: item.book_title || 'Unknown Book',
-                            reason: 'Discount price has changed'
-                        });
-                        continue;
-                    }
+                const currentBookData = booksById.get(item.id);
 
-                } catch (error: Error | unknown) {
-                    console.error(`Error validating book ${item.id}:`, error);
-                    /* If we get here, the book likely doesn't exist anymore */
+                /* Books missing from the response no longer exist */
+                if (!currentBookData) {
                     invalidItems.push({
                         id: item.id,
                         name: item.book_title || 'Unknown Book',
                         reason: 'Book is no longer available'
                     });
+                    continue;
+                }
+
+                /* Check if the discount price matches what we have in cart */
+                if (item.discount_price !== null && item.discount_price !== currentBookData.discount_price) {
+                    invalidItems.push({
+                        id: item.id,
+                        name: item.book_title || 'Unknown Book',
+                        reason: 'Discount price has changed'
+                    });
                 }
             }
 
@@ -279,6 +288,20 @@ export default function CartPage() {
                 </div>
             )}
 
+            {/* Notice about cart items dropped because their books no longer exist */}
+            {removedItemCount > 0 && (
+                <div className="flex items-center justify-between bg-yellow-100 border border-yellow-400 text-yellow-800 p-4 rounded-lg mt-4">
+                    <p>{t('cart_items_removed', { count: removedItemCount })}</p>
+                    <button
+                        onClick={dismissRemovedItems}
+                        className="ml-4 font-bold hover:text-yellow-900"
+                        aria-label="Dismiss"
+                    >
+                        ×
+                    </button>
+                </div>
+            )}
+
             {/* Cart header showing number of items */}
             <CartHeader text={cartItemsWithDetails.length.toString()} />
             <div className="flex flex-col md:flex-row gap-4 py-4">
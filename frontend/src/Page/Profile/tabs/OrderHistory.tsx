@@ -6,12 +6,14 @@ import { useTranslation } from 'react-i18next';
 
 const OrderHistory = () => {
     const [orders, setOrders] = useState<OrderListResponse | null>(null);
+    const [userId, setUserId] = useState<number | null>(null);
     const { t } = useTranslation();
 
     const fetchOrders = useCallback(async () => {
         try {
             const userDetails = await getUserDetails();
             if (userDetails.id) {
+                setUserId(userDetails.id);
                 const orders = await getOrdersById(userDetails.id);
                 setOrders(orders);
             }
@@ -20,6 +22,20 @@ const OrderHistory = () => {
         }
     }, []);
 
+    // Append the next page of orders
+    const loadMore = useCallback(async () => {
+        if (!userId || !orders?.next_cursor) return;
+        try {
+            const page = await getOrdersById(userId, orders.next_cursor);
+            setOrders({
+                orders: [...orders.orders, ...page.orders],
+                next_cursor: page.next_cursor,
+            });
+        } catch (error) {
+            console.error("Error fetching orders:", error);
+        }
+    }, [userId, orders]);
+
     useEffect(() => {
         fetchOrders();
     }, [fetchOrders]);
@@ -32,6 +48,14 @@ const OrderHistory = () => {
                 {orders?.orders.map((order) => (
                     <Order_Item_Accordion key={order.id} order={order} />
                 ))}
+                {orders?.next_cursor && (
+                    <button
+                        className="mt-2 self-center rounded-md border border-gray-300 px-4 py-2 hover:bg-gray-50"
+                        onClick={loadMore}
+                    >
+                        {t('profile_order_history_load_more')}
+                    </button>
+                )}
             </div>
         </div>
     );
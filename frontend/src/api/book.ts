@@ -25,6 +25,12 @@ export interface BookDetailResponse {
   book: BookDetail;
 }
 
+// Response of the batch lookup; missing_ids lists books that no longer exist
+export interface BookBatchResponse {
+  items: BookDetail[];
+  missing_ids: number[];
+}
+
 // Extended interface for On Sale items
 export interface OnSaleItem extends BaseBook {
   discount_amount: number | null;
@@ -96,6 +102,44 @@ export function getBookDetails(bookId: number) {
     });
 }
 
+// Books per batch request, the backend's MAX_BATCH_BOOKS
+const MAX_BATCH_BOOKS = 100;
+
+// Fetch the details of many books (e.g. the cart), MAX_BATCH_BOOKS per request
+export function getBookDetailsBatch(bookIds: number[]): Promise<BookBatchResponse> {
+  const chunks: number[][] = [];
+  for (let i = 0; i < bookIds.length; i += MAX_BATCH_BOOKS) {
+    chunks.push(bookIds.slice(i, i + MAX_BATCH_BOOKS));
+  }
+  return Promise.all(chunks.map(getBookDetailsChunk)).then(responses => ({
+    items: responses.flatMap(response => response.items),
+    missing_ids: responses.flatMap(response => response.missing_ids),
+  }));
+}
+
+// Fetch the details of at most MAX_BATCH_BOOKS books in one request
+function getBookDetailsChunk(bookIds: number[]) {
+  return api.get<BookBatchResponse>("/api/book/batch", {
+    params: { ids: bookIds.join(",") },
+  })
+    .then(res => {
+      if (!res.data || !Array.isArray(res.data.items)) {
+        console.error("Unexpected response structure for book batch:", res.data);
+        throw new Error('No data received from server');
+      }
+
+      // Ensure book_cover_photo is never null
+      res.data.items.forEach(book => {
+        book.book_cover_photo = book.book_cover_photo || "/book.png";
+      });
+      return res.data;
+    })
+    .catch(error => {
+      console.error('Error fetching book details batch:', error);
+      throw error;
+    });
+}
+
 // From onsale.ts
 export function getOnSale() {
   return api.get<OnSaleResponse>("/api/book/on_sale")
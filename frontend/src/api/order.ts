@@ -11,6 +11,9 @@ export interface OrderItem {
     book_id: number
     quantity: number
     price: number
+    // Only in the order history when book details are included
+    book_title?: string | null
+    book_cover_photo?: string | null
 }
 
 export interface OrderResponse {
@@ -23,6 +26,7 @@ export interface OrderResponse {
 
 export interface OrderListResponse {
     orders: OrderResponse[]
+    next_cursor: string | null
 }
 
 export const createOrder = async (order: Order) => {
@@ -30,7 +34,10 @@ export const createOrder = async (order: Order) => {
     return response.data
 }
 
-export const getOrdersById = async (id: number) => {
-    const response = await api.get(`/api/order/get/${id}`)
+// Fetch one page of a user's order history (newest first) with book titles
+export const getOrdersById = async (id: number, cursor?: string | null): Promise<OrderListResponse> => {
+    const response = await api.get(`/api/order/get/${id}`, {
+        params: { include_books: true, ...(cursor ? { cursor } : {}) },
+    })
     return response.data
 }
@@ -1,8 +1,6 @@
 import { Accordion, AccordionContent, AccordionItem, AccordionTrigger } from "../ui/accordion";
 import { OrderResponse } from "@/api/order";
 import { useTranslation } from "react-i18next";
-import { getBookDetails, BookDetail } from "@/api/book";
-import { useState, useEffect } from "react";
 
 const Order_Item = (text: string) => {
     return (
@@ -13,37 +11,6 @@ const Order_Item = (text: string) => {
 }
 const Order_Item_Accordion = ({ order}: { order: OrderResponse}) => {
     const { t } = useTranslation();
-    const [books, setBooks] = useState<Record<number, BookDetail>>({});
-    const [loading, setLoading] = useState(true);
-
-    useEffect(() => {
-        // Create an object to store book details by ID
-        const bookDetailsMap: Record<number, BookDetail> = {};
-        let pendingRequests = order.items.length;
-
-        // Set loading state
-        setLoading(true);
-
-        // Fetch details for each book in the order
-        order.items.forEach(item => {
-            getBookDetails(item.book_id)
-                .then(response => {
-                    if (response && response.book) {
-                        bookDetailsMap[item.book_id] = response.book;
-                    }
-                })
-                .catch(error => {
-                    console.error(`Failed to fetch details for book ${item.book_id}:`, error);
-                })
-                .finally(() => {
-                    pendingRequests--;
-                    if (pendingRequests === 0) {
-                        setBooks(bookDetailsMap);
-                        setLoading(false);
-                    }
-                });
-        });
-    }, [order]);
 
     // Format the date to the requested format: hh:mm:ss dd-mm-yy
     const formatDate = (dateString: string) => {
@@ -84,19 +51,16 @@ const Order_Item_Accordion = ({ order}: { order: OrderResponse}) => {
                         <div className="text-right">{t("profile_order_history_quantity")}</div>
                         <div className="text-right">{t("profile_order_history_price")}</div>
                     </div>
-                    {loading ? (
-                        <div className="text-center py-4">Loading book details...</div>
-                    ) : (
-                        order.items.map((item) => (
-                            <div key={item.book_id} className="border-t border-gray-300">
-                                <a href={`/book/${item.book_id}`} className="grid grid-cols-3 px-4 py-2 hover:bg-gray-50">
-                                    <div className="text-left">{books[item.book_id]?.book_title || "Unknown Book"}</div>
-                                    <div className="text-right">{item.quantity}</div>
-                                    <div className="text-right">{item.price}</div>
-                                </a>
-                            </div>
-                        ))
-                    )}
+                    {/* Book titles come with the order history, no extra requests */}
+                    {order.items.map((item) => (
+                        <div key={item.book_id} className="border-t border-gray-300">
+                            <a href={`/book/${item.book_id}`} className="grid grid-cols-3 px-4 py-2 hover:bg-gray-50">
+                                <div className="text-left">{item.book_title || "Unknown Book"}</div>
+                                <div className="text-right">{item.quantity}</div>
+                                <div className="text-right">{item.price}</div>
+                            </a>
+                        </div>
+                    ))}
                 </AccordionContent>
             </AccordionItem>
         </Accordion>
@@ -1,6 +1,6 @@
 /* Cart Details Hook - Manages shopping cart data with detailed product information */
 import { useState, useEffect, useCallback } from 'react';
-import { getBookDetails, BookDetail } from '../api/book';
+import { getBookDetailsBatch, BookDetail } from '../api/book';
 import { dispatchCartUpdateEvent } from './useCartEvents'; // Updated import path
 
 /* Type Definitions */
@@ -35,6 +35,8 @@ export const useCartDetails = () => {
   const [loading, setLoading] = useState<boolean>(true);
   const [error, setError] = useState<string | null>(null);
   const [orderTotal, setOrderTotal] = useState<number>(0);
+  // Number of cart items dropped because their books no longer exist
+  const [removedItemCount, setRemovedItemCount] = useState<number>(0);
 
   /* Updates Cart in State and localStorage */
   const updateCartState = useCallback((updatedDetailedItems: CartItemWithDetails[]) => {
@@ -76,31 +78,37 @@ export const useCartDetails = () => {
         return;
       }
 
-      // Fetch detailed information for each cart item
-      const detailPromises = cart.map(item =>
-        getBookDetails(item.id).then(response => {
+      // Fetch detailed information for all cart items in batch requests
+      const response = await getBookDetailsBatch(cart.map(item => item.id));
+      const booksById = new Map(response.items.map(book => [book.id, book]));
+
+      // Books that no longer exist are dropped from the cart, and the user is told
+      const removedCount = cart.filter(item => !booksById.has(item.id)).length;
+      if (removedCount > 0) {
+        setRemovedItemCount(removedCount);
+      }
+      const detailedItems = cart
+        .filter(item => booksById.has(item.id))
+        .map(item => {
+          const book = booksById.get(item.id)!;
           // Get the effective price for calculation
-          const effectivePrice = response.book.discount_price ?? response.book.book_price;
+          const effectivePrice = book.discount_price ?? book.book_price;
 
           // Create the cart item with details including type assertion for safety
-          const bookWithDetails = {
-            ...response.book,
+          return {
+            ...book,
             quantity: item.quantity,
             order_item_total: effectivePrice * item.quantity,
             // Add legacy fields
-            price: response.book.book_price,
-            name: response.book.book_title,
-            cover_photo: response.book.book_cover_photo,
-            average_rating: response.book.avg_rating,
-            summary: response.book.book_summary
+            price: book.book_price,
+            name: book.book_title,
+            cover_photo: book.book_cover_photo,
+            average_rating: book.avg_rating,
+            summary: book.book_summary
           } as unknown as CartItemWithDetails;
+        });
 
-          return bookWithDetails;
-        })
-      );
-
-      const detailedItems = await Promise.all(detailPromises);
-      updateCartState(detailedItems as CartItemWithDetails[]); // Use the update function
+      updateCartState(detailedItems); // Use the update function
 
     } catch (err) {
       console.error('Failed to fetch cart details:', err);
@@ -182,6 +190,11 @@ export const useCartDetails = () => {
     }
   }, [cartItemsWithDetails, updateCartState]);
 
+  /* Dismiss the Removed Items Notice */
+  const dismissRemovedItems = useCallback(() => {
+    setRemovedItemCount(0);
+  }, []);
+
   /* Refresh Cart Data Manually */
   const refreshCart = useCallback(() => {
     fetchCartDetails();
@@ -193,6 +206,8 @@ export const useCartDetails = () => {
     loading,
     error,
     orderTotal,
+    removedItemCount,   // Items dropped since the last dismissal
+    dismissRemovedItems,
     updateItemQuantity, // Expose update function
     removeItem,         // Expose remove function
     refreshCart         // Expose refresh function